@@ -0,0 +1,4 @@
+"""
+Προσομοίωση διάδοσης πληροφορίας. Τα scripts τρέχουν μέσα από αυτόν τον φάκελο
+(python main.py, python sweep.py, ...)· το engine εισάγεται και ως Simulation.engine.
+"""
@@ -0,0 +1,164 @@
+"""
+Γεννήτριες δικτύων κατευθείαν σε NumPy / CSR, χωρίς networkx.
+
+Όλες παίρνουν ρητό np.random.Generator και επιστρέφουν (A, opinion): έναν
+συμμετρικό scipy csr_array με int32 δείκτες και τις γνώμες 0/1 ως int8,
+έτοιμα για το DiffusionEngine. Δίκτυο 10M ακμών φτιάχνεται σε δευτερόλεπτα.
+"""
+import numpy as np
+import scipy.sparse as sp
+
+
+def _rng(rng):
+    return rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+
+
+def to_csr(n, u, v):
+    """Συμμετρικός CSR από μη κατευθυνόμενες ακμές (u[i], v[i])· αφαιρεί loops και διπλές."""
+    u = np.asarray(u, dtype=np.int64)
+    v = np.asarray(v, dtype=np.int64)
+    keep = u != v
+    lo, hi = np.minimum(u[keep], v[keep]), np.maximum(u[keep], v[keep])
+    key = np.sort(lo * n + hi)
+    key = key[np.concatenate([[True], key[1:] != key[:-1]])]
+    lo, hi = key // n, key % n
+    # rows as (hi, lo) first, then (lo, hi): with keys sorted by (lo, hi)
+    # every row comes out with ascending column indices, no extra sort
+    rows = np.concatenate([hi, lo])
+    cols = np.concatenate([lo, hi])
+    A = sp.coo_array((np.ones(rows.shape[0], dtype=np.int32), (rows, cols)), shape=(n, n)).tocsr()
+    if rows.shape[0] < 2**31:
+        A.indices = A.indices.astype(np.int32)
+        A.indptr = A.indptr.astype(np.int32)
+    A.has_sorted_indices = True
+    return A
+
+
+def random_opinions(n, rng=None):
+    return _rng(rng).integers(0, 2, n, dtype=np.int8)
+
+
+def watts_strogatz(n, k, p, rng=None):
+    """
+    Small-world δίκτυο όπως το nx.watts_strogatz_graph: δακτύλιος όπου κάθε
+    κόμβος συνδέεται με τους k/2 επόμενους, και κάθε ακμή (u, u+j) αλλάζει
+    με πιθανότητα p σε (u, w) με τυχαίο w. Οι αλλαγές που θα έδιναν loop ή
+    διπλή ακμή ξανακληρώνονται, όλες μαζί, μέχρι να μη μείνει καμία· όταν το
+    u είναι ήδη γείτονας όλων, η ακμή μένει όπως ήταν.
+    """
+    if k >= n:
+        raise ValueError("k must be smaller than n")
+    if k % 2 != 0:
+        raise ValueError("k must be an even number")
+    rng = _rng(rng)
+    half = k // 2
+    u = np.repeat(np.arange(n, dtype=np.int64), half)
+    v = (u + np.tile(np.arange(1, half + 1, dtype=np.int64), n)) % n
+
+    todo = np.flatnonzero(rng.random(u.shape[0]) < p)
+    if todo.size and n > k + 1:
+        fixed = np.ones(u.shape[0], dtype=bool)
+        fixed[todo] = False
+        lattice = np.sort(np.minimum(u[fixed], v[fixed]) * n + np.maximum(u[fixed], v[fixed]))
+        added = np.zeros(0, dtype=np.int64)
+
+        def seen(sorted_keys, cand):
+            if sorted_keys.size == 0:
+                return np.zeros(cand.shape, dtype=bool)
+            pos = np.minimum(np.searchsorted(sorted_keys, cand), sorted_keys.size - 1)
+            return sorted_keys[pos] == cand
+
+        while todo.size:
+            # κόμβος ήδη συνδεδεμένος με όλους δεν έχει ελεύθερο w: η ακμή του μένει
+            # ως έχει (όπως στο nx, που παραλείπει το rewire όταν deg(u) >= n - 1)
+            ends = np.concatenate([lattice, added])
+            deg = np.bincount(ends // n, minlength=n) + np.bincount(ends % n, minlength=n)
+            todo = todo[deg[u[todo]] < n - 1]
+            if not todo.size:
+                break
+            w = rng.integers(0, n, todo.size)
+            cand = np.minimum(u[todo], w) * n + np.maximum(u[todo], w)
+            clash = (w == u[todo]) | seen(lattice, cand) | seen(added, cand)
+            # the same new edge drawn twice in this round: keep the first
+            _, first = np.unique(cand, return_index=True)
+            dup = np.ones(todo.size, dtype=bool)
+            dup[first] = False
+            ok = ~clash & ~dup
+            v[todo[ok]] = w[ok]
+            added = np.sort(np.concatenate([added, cand[ok]]))
+            todo = todo[~ok]
+    return to_csr(n, u, v), random_opinions(n, rng)
+
+
+def barabasi_albert(n, m, rng=None):
+    """
+    Preferential attachment (Batagelj & Brandes, 2005): η ακμή e ξεκινά από
+    τον κόμβο e // m, και το άλλο της άκρο αντιγράφει ένα ομοιόμορφο στοιχείο
+    r της λίστας όλων των προηγούμενων άκρων, άρα επιλέγεται με πιθανότητα
+    ανάλογη του βαθμού. Όταν το r δείχνει σε άλλο αντιγραμμένο άκρο, η
+    αλυσίδα ακολουθείται διανυσματικά (μήκος O(log) κατά μέσο όρο).
+    Loops και διπλές ακμές αφαιρούνται.
+    """
+    if not 1 <= m < n:
+        raise ValueError("m must be in [1, n)")
+    rng = _rng(rng)
+    e = np.arange(n * m, dtype=np.int64)
+    src = e // m
+    # slot 2e holds src[e], slot 2e + 1 holds a copy of slot r[e], r[e] uniform in [0, 2e]
+    r = (rng.random(e.size) * (2 * e + 1)).astype(np.int64)
+    cur = r.copy()
+    odd = np.flatnonzero(cur % 2 == 1)
+    while odd.size:
+        cur[odd] = r[cur[odd] // 2]
+        odd = odd[cur[odd] % 2 == 1]
+    return to_csr(n, src, src[cur // 2]), random_opinions(n, rng)
+
+
+def _triangle_pair(idx):
+    """Το ζεύγος (i, j), i < j, με αύξοντα αριθμό idx = j(j-1)/2 + i."""
+    idx = np.asarray(idx, dtype=np.int64)
+    j = ((1 + np.sqrt(1 + 8 * idx.astype(np.float64))) // 2).astype(np.int64)
+    # διόρθωση στρογγυλοποίησης για πολύ μεγάλα idx
+    j -= j * (j - 1) // 2 > idx
+    j += (j + 1) * j // 2 <= idx
+    return idx - j * (j - 1) // 2, j
+
+
+def sbm_opinion_blocks(sizes, p_in, p_out, homophily=0.8, rng=None):
+    """
+    Stochastic block model με γνώμες συσχετισμένες με τα blocks: ο κόμβος
+    του block b έχει γνώμη b % 2 με πιθανότητα `homophily`, αλλιώς την
+    αντίθετη. Για κάθε ζεύγος blocks κληρώνεται πρώτα το πλήθος των ακμών
+    (διωνυμική) και μετά τόσα διαφορετικά ζεύγη κόμβων, οπότε η κατανομή
+    είναι ακριβώς του nx.stochastic_block_model και το κόστος ανάλογο των ακμών.
+    Επιστρέφει (A, opinion, block).
+    """
+    rng = _rng(rng)
+    sizes = np.asarray(sizes, dtype=np.int64)
+    starts = np.concatenate([[0], np.cumsum(sizes)])
+    n = int(starts[-1])
+    block = np.repeat(np.arange(len(sizes)), sizes)
+
+    us, vs = [], []
+    for a in range(len(sizes)):
+        for b in range(a, len(sizes)):
+            p = p_in if a == b else p_out
+            pairs = sizes[a] * (sizes[a] - 1) // 2 if a == b else sizes[a] * sizes[b]
+            if p <= 0 or pairs == 0:
+                continue
+            # διακριτά ζεύγη χωρίς επανάθεση, άρα ακριβώς cnt ακμές χωρίς loops
+            cnt = int(rng.binomial(pairs, p))
+            idx = rng.choice(int(pairs), cnt, replace=False)
+            if a == b:
+                i, j = _triangle_pair(idx)
+            else:
+                i, j = idx // sizes[b], idx % sizes[b]
+            us.append(starts[a] + i)
+            vs.append(starts[b] + j)
+    u = np.concatenate(us) if us else np.zeros(0, dtype=np.int64)
+    v = np.concatenate(vs) if vs else np.zeros(0, dtype=np.int64)
+
+    opinion = (block % 2).astype(np.int8)
+    flip = rng.random(n) >= homophily
+    opinion[flip] = 1 - opinion[flip]
+    return to_csr(n, u, v), opinion, block
@@ -0,0 +1,343 @@
+"""
+Influence maximization για τον κανόνα διάδοσης του agent_decision_to_adopt.
+
+    python influence.py --graph ws --n-agents 2000 --k 6 --p 0.1 --seeds 5
+    python influence.py --graph sbm --n-agents 20000 --blocks 4 --homophily 0.9 --seeds 5
+    python influence.py --graph facebook --seeds 5 --candidates 300 --workers 0
+
+Η εξάπλωση σ(S) = αναμενόμενος αριθμός ενημερωμένων μετά από `steps` βήματα
+με αρχικούς agents S, εκτιμάται με Monte Carlo. Τα runs τρέχουν όλα μαζί
+ως στήλες ενός πίνακα κατάστασης (n x runs), με sparse mat-vec ανά βήμα.
+Όλα τα σύνολα που αξιολογούνται χρησιμοποιούν τους ίδιους τυχαίους αριθμούς
+(common random numbers), οπότε οι διαφορές σ(S + u) - σ(S) δεν έχουν
+θόρυβο από διαφορετικά δείγματα και η εκτίμηση είναι ντετερμινιστική.
+"""
+import argparse
+import heapq
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+
+import generators
+
+
+# BATCHED MONTE CARLO
+def simulate_batch(A, opinion, seed_sets, steps, p_base, rng, runs):
+    """
+    Τρέχει `runs` σύγχρονες διαδόσεις για κάθε σύνολο του seed_sets ταυτόχρονα.
+    Σε κάθε βήμα όλα τα σύνολα μοιράζονται τον ίδιο πίνακα τυχαίων (n x runs).
+    Οι μετρήσεις γειτόνων γίνονται μόνο στις γραμμές δίπλα σε ενημερωμένους
+    (σε κάποιο run), οπότε οι μικροί καταρράκτες κοστίζουν λίγο.
+    Επιστρέφει πίνακα (len(seed_sets), runs) με τον αριθμό ενημερωμένων.
+    """
+    n = A.shape[0]
+    s = len(seed_sets)
+    X = np.zeros((n, s, runs), dtype=bool)
+    for j, seeds in enumerate(seed_sets):
+        X[np.asarray(list(seeds), dtype=np.int64), j, :] = True
+    touched = X.any(axis=(1, 2))
+    ones_row = opinion == 1
+
+    for _ in range(steps):
+        U = rng.random((n, 1, runs), dtype=np.float32)
+        src = np.flatnonzero(touched)
+        rows = np.unique(A[src].indices)
+        rows = rows[~(touched[rows] & X[rows].all(axis=(1, 2)))]
+        if rows.size == 0:
+            break
+        sub = A[rows][:, src]
+        inf = X[src].reshape(len(src), s * runs).astype(np.float32)
+        inf_nb = (sub @ inf).reshape(len(rows), s, runs)
+        ones = (sub @ (inf * ones_row[src, None])).reshape(len(rows), s, runs)
+        cand = ~X[rows] & (inf_nb > 0)
+        if not cand.any():
+            break
+        same = np.where(ones_row[rows, None, None], ones, inf_nb - ones)
+        frac = np.divide(same, inf_nb, out=np.zeros_like(same), where=cand)
+        X[rows] |= cand & (U[rows] < p_base + 0.5 * frac)
+        touched[rows] = True
+    return X.sum(axis=0)
+
+
+# Worker-side arrays for SpreadEstimator, set once per process.
+_WORKER = None
+
+
+def _init_worker(indptr, indices, opinion, steps, p_base):
+    global _WORKER
+    n = len(indptr) - 1
+    A = sp.csr_array((np.ones(len(indices), dtype=np.float32), indices, indptr), shape=(n, n))
+    _WORKER = (A, opinion, steps, p_base)
+
+
+def _worker_block(args):
+    seed_sets, seq, runs = args
+    A, opinion, steps, p_base = _WORKER
+    return simulate_batch(A, opinion, seed_sets, steps, p_base, np.random.default_rng(seq), runs).sum(axis=1)
+
+
+class SpreadEstimator:
+    """
+    σ(S) με `runs` Monte Carlo runs, σε blocks των `block` runs. Κάθε block
+    έχει σταθερό δικό του seed, άρα το αποτέλεσμα δεν εξαρτάται από το πλήθος
+    των workers ή από το ποια σύνολα αξιολογούνται μαζί.
+    """
+
+    def __init__(self, A, opinion, p_base=0.2, steps=10, runs=200, seed=0, workers=1,
+                 block=50, max_cells=2**25):
+        self.A = sp.csr_array(A, dtype=np.float32)
+        self.opinion = np.asarray(opinion, dtype=np.int8)
+        self.p_base = p_base
+        self.steps = steps
+        self.runs = runs
+        # όριο στο μέγεθος του πίνακα κατάστασης (n x σύνολα x runs) ενός batch
+        self.max_cells = max_cells
+        self.evaluations = 0
+        nblocks = -(-runs // block)
+        self.blocks = [
+            (np.random.SeedSequence([seed, j]), min(block, runs - j * block)) for j in range(nblocks)
+        ]
+        workers = workers if workers and workers > 0 else (os.cpu_count() or 1)
+        self.pool = None
+        if workers > 1:
+            self.pool = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self.A.indptr, self.A.indices, self.opinion, steps, p_base),
+            )
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def spread_many(self, seed_sets):
+        """Εκτιμώμενη εξάπλωση για κάθε σύνολο (πίνακας float)."""
+        seed_sets = [list(s) for s in seed_sets]
+        self.evaluations += len(seed_sets)
+        total = np.zeros(len(seed_sets))
+        if not seed_sets:
+            return total
+        per = max(1, self.max_cells // (self.A.shape[0] * max(b for _, b in self.blocks)))
+        chunks = [(i, seed_sets[i:i + per]) for i in range(0, len(seed_sets), per)]
+        tasks = [(sets, seq, runs) for _, sets in chunks for seq, runs in self.blocks]
+
+        if self.pool is None:
+            out = [
+                simulate_batch(self.A, self.opinion, sets, self.steps, self.p_base,
+                               np.random.default_rng(seq), runs).sum(axis=1)
+                for sets, seq, runs in tasks
+            ]
+        else:
+            out = list(self.pool.map(_worker_block, tasks))
+
+        it = iter(out)
+        for i, sets in chunks:
+            for _ in self.blocks:
+                total[i:i + len(sets)] += next(it)
+        return total / self.runs
+
+    def spread(self, seeds):
+        return float(self.spread_many([seeds])[0])
+
+
+# SEED SELECTION
+def celf(est, k, candidates=None):
+    """
+    Lazy greedy (CELF): τα κέρδη των προηγούμενων γύρων είναι άνω φράγματα
+    (για submodular σ), οπότε επαναϋπολογίζεται μόνο η κορυφή της ουράς.
+    Τα αρχικά κέρδη υπολογίζονται όλα μαζί σε batch.
+    Επιστρέφει (seeds, σ μετά από κάθε προσθήκη).
+    """
+    cand = np.arange(est.A.shape[0]) if candidates is None else np.asarray(candidates)
+    gains = est.spread_many([[int(u)] for u in cand])
+    heap = [(-g, int(u), 0) for g, u in zip(gains.tolist(), cand.tolist())]
+    heapq.heapify(heap)
+
+    seeds, curve, sigma = [], [], 0.0
+    while len(seeds) < k and heap:
+        neg, u, flag = heapq.heappop(heap)
+        if flag == len(seeds):
+            seeds.append(u)
+            sigma += -neg
+            curve.append(sigma)
+            continue
+        gain = est.spread(seeds + [u]) - sigma
+        heapq.heappush(heap, (-gain, u, len(seeds)))
+    return seeds, curve
+
+
+def celf_plus(est, k, candidates=None):
+    """
+    CELF++ (Goyal et al., 2011): μαζί με το κέρδος του u κρατά και το κέρδος
+    του u αν προστεθεί πρώτα ο τρέχων καλύτερος κόμβος (prev_best). Αν ο
+    prev_best επιλεγεί όντως, το νέο κέρδος είναι ήδη γνωστό χωρίς νέα
+    εκτίμηση. Τα δύο σύνολα κάθε επαναϋπολογισμού αξιολογούνται σε ένα batch.
+    """
+    cand = np.arange(est.A.shape[0]) if candidates is None else np.asarray(candidates)
+    cand = [int(u) for u in cand]
+    single = est.spread_many([[u] for u in cand])
+
+    # prev_best κατά την αρχικοποίηση: ο καλύτερος από τους προηγούμενους
+    prev = []
+    best, best_val = None, -1.0
+    for u, g in zip(cand, single.tolist()):
+        prev.append(best)
+        if g > best_val:
+            best, best_val = u, g
+    pairs = [(i, [prev[i], u]) for i, u in enumerate(cand) if prev[i] is not None]
+    pair_spread = est.spread_many([s for _, s in pairs])
+    single_of = dict(zip(cand, single.tolist()))
+
+    state = {}
+    for i, u in enumerate(cand):
+        state[u] = [single[i], prev[i], 0.0, 0]
+    for (i, (pb, u)), s in zip(pairs, pair_spread.tolist()):
+        state[u][2] = s - single_of[pb]
+
+    heap = [(-st[0], u) for u, st in state.items()]
+    heapq.heapify(heap)
+    seeds, curve, sigma = [], [], 0.0
+    last_seed, cur_best = None, None
+
+    while len(seeds) < k and heap:
+        _, u = heapq.heappop(heap)
+        st = state[u]
+        if st[3] == len(seeds):
+            seeds.append(u)
+            sigma += st[0]
+            curve.append(sigma)
+            last_seed, cur_best = u, None
+            continue
+        if st[1] is not None and st[1] == last_seed and st[3] == len(seeds) - 1:
+            st[0] = st[2]
+        else:
+            sets = [seeds + [u]]
+            if cur_best is not None:
+                sets.append(seeds + [cur_best, u])
+            vals = est.spread_many(sets)
+            st[0] = vals[0] - sigma
+            st[1] = cur_best
+            st[2] = vals[1] - (sigma + state[cur_best][0]) if cur_best is not None else 0.0
+        st[3] = len(seeds)
+        if cur_best is None or st[0] > state[cur_best][0]:
+            cur_best = u
+        heapq.heappush(heap, (-st[0], u))
+    return seeds, curve
+
+
+def degree_seeds(A, k):
+    deg = np.diff(sp.csr_array(A).indptr)
+    return [int(i) for i in np.argsort(-deg, kind="stable")[:k]]
+
+
+def pagerank_seeds(A, k, alpha=0.85, tol=1.0e-6, max_iter=100):
+    """Οι k κόμβοι με το μεγαλύτερο PageRank (power iteration όπως το nx.pagerank)."""
+    A = sp.csr_array(A, dtype=float)
+    n = A.shape[0]
+    d = np.diff(A.indptr).astype(float)
+    inv_d = np.divide(1.0, d, out=np.zeros(n), where=d > 0)
+    x = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        last = x
+        x = alpha * (A @ (last * inv_d) + last[d == 0].sum() / n) + (1 - alpha) / n
+        if np.abs(x - last).sum() < n * tol:
+            break
+    return [int(i) for i in np.argsort(-x, kind="stable")[:k]]
+
+
+# GRAPHS
+def network_arrays(G):
+    """(A, opinion, nodes) από ένα δίκτυο του create_network."""
+    nodes = list(G.nodes())
+    A = nx.to_scipy_sparse_array(G, nodelist=nodes, weight=None, format="csr")
+    return A, np.array([G.nodes[n]["opinion"] for n in nodes], dtype=np.int8), nodes
+
+
+def graph_store_arrays(data_path=None, seed=0):
+    """
+    (A, opinion, node ids) για τον γράφο του chatbot (GraphStore). Ο γράφος
+    δεν έχει γνώμες, οπότε δίνονται τυχαίες 0/1 από το seed.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if root not in sys.path:
+        sys.path.insert(0, root)
+    from sna_graph_chatbot.graph_store import GraphStore, get_store
+
+    store = GraphStore(data_path=data_path) if data_path else get_store()
+    csr = store.csr()
+    A = sp.csr_array((np.ones(len(csr.indices)), csr.indices, csr.indptr), shape=(csr.n, csr.n))
+    opinion = np.random.default_rng(seed).integers(0, 2, csr.n).astype(np.int8)
+    return A, opinion, [int(x) for x in csr.node_ids]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Influence maximization for the diffusion model")
+    ap.add_argument("--graph", choices=["ws", "ba", "sbm", "facebook"], default="ws")
+    ap.add_argument("--data-path", default=None, help="edge list for --graph facebook")
+    ap.add_argument("--n-agents", type=int, default=1000)
+    ap.add_argument("--k", type=int, default=6)
+    ap.add_argument("--p", type=float, default=0.1)
+    ap.add_argument("--m", type=int, default=3, help="edges per new node for --graph ba")
+    ap.add_argument("--blocks", type=int, default=4, help="equal-size blocks for --graph sbm")
+    ap.add_argument("--p-in", type=float, default=0.01)
+    ap.add_argument("--p-out", type=float, default=0.0005)
+    ap.add_argument("--homophily", type=float, default=0.8, help="opinion / block correlation for --graph sbm")
+    ap.add_argument("--seeds", type=int, default=5, help="number of seed agents to pick")
+    ap.add_argument("--p-base", type=float, default=0.05)
+    ap.add_argument("--steps", type=int, default=5)
+    ap.add_argument("--runs", type=int, default=200)
+    ap.add_argument("--candidates", type=int, default=0, help="only the top-N degree nodes (0 = all)")
+    ap.add_argument("--plus", action="store_true", help="CELF++ instead of CELF")
+    ap.add_argument("--workers", type=int, default=1, help="0 = one per core")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    if args.graph == "ws":
+        A, opinion = generators.watts_strogatz(args.n_agents, args.k, args.p, rng)
+    elif args.graph == "ba":
+        A, opinion = generators.barabasi_albert(args.n_agents, args.m, rng)
+    elif args.graph == "sbm":
+        sizes = [args.n_agents // args.blocks] * args.blocks
+        A, opinion, _ = generators.sbm_opinion_blocks(sizes, args.p_in, args.p_out, args.homophily, rng)
+    if args.graph != "facebook":
+        nodes = list(range(A.shape[0]))
+    else:
+        A, opinion, nodes = graph_store_arrays(args.data_path, seed=args.seed)
+    print(f"graph: {A.shape[0]} nodes, {A.nnz // 2} edges")
+
+    cand = degree_seeds(A, args.candidates) if args.candidates > 0 else None
+    with SpreadEstimator(A, opinion, args.p_base, args.steps, args.runs, args.seed, args.workers) as est:
+        t0 = time.perf_counter()
+        seeds, _ = (celf_plus if args.plus else celf)(est, args.seeds, cand)
+        secs = time.perf_counter() - t0
+        evals = est.evaluations
+
+    # fresh random numbers for the comparison, so CELF is not scored on its own sample
+    with SpreadEstimator(A, opinion, args.p_base, args.steps, args.runs, args.seed + 1, args.workers) as ev:
+        rows = [
+            ("celf++" if args.plus else "celf", seeds),
+            ("degree", degree_seeds(A, args.seeds)),
+            ("pagerank", pagerank_seeds(A, args.seeds)),
+        ]
+        spreads = ev.spread_many([s for _, s in rows])
+
+    print(f"selection: {secs:.2f} s, {evals} spread evaluations")
+    for (name, s), val in zip(rows, spreads):
+        print(f"{name:>9}  spread={val:9.2f}  seeds={[nodes[i] for i in s]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,23 @@
-import networkx as nx
-import random
-
-
-def create_network(n_agents, k, p):
-    """
-    Δημιουργεί small-world κοινωνικό δίκτυο
-    με παραμέτρους που ορίζει ο χρήστης
-    """
-    G = nx.watts_strogatz_graph(
-        n=n_agents,
-        k=k,
-        p=p
-    )
-
-    for node in G.nodes():
-        G.nodes[node]["opinion"] = random.choice([0, 1])
-        G.nodes[node]["informed"] = False
-
-    return G
+import networkx as nx
+import random
+
+
+def create_network(n_agents, k, p, seed=None):
+    """
+    Δημιουργεί small-world κοινωνικό δίκτυο
+    με παραμέτρους που ορίζει ο χρήστης
+    (seed: αναπαραγώγιμο δίκτυο και γνώμες)
+    """
+    G = nx.watts_strogatz_graph(
+        n=n_agents,
+        k=k,
+        p=p,
+        seed=seed
+    )
+
+    rng = random.Random(seed) if seed is not None else random
+    for node in G.nodes():
+        G.nodes[node]["opinion"] = rng.choice([0, 1])
+        G.nodes[node]["informed"] = False
+
+    return G
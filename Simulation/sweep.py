@@ -0,0 +1,184 @@
+"""
+Sweep runner για τη διάδοση, χωρίς input() και χωρίς γραφικά.
+
+    python sweep.py --n-agents 60 --k 4 6 8 --p 0 0.1 0.5 --p-base 0.2 \
+        --replicates 50 --steps 20 --workers 0 --out sweep.csv
+
+Κάθε συνδυασμός (n_agents, k, p, p_base) τρέχει `replicates` φορές σε
+process pool. Το seed κάθε run προκύπτει ντετερμινιστικά από το --seed,
+τις παραμέτρους και τον αριθμό επανάληψης, οπότε τα αποτελέσματα δεν
+εξαρτώνται από το πλήθος των workers ή από το υπόλοιπο grid. Για κάθε
+συνδυασμό γράφεται μόλις ολοκληρωθεί η μέση καμπύλη reach ανά βήμα με
+διάστημα εμπιστοσύνης (CSV, ή Parquet αν το --out τελειώνει σε .parquet
+και υπάρχει το pyarrow).
+"""
+import argparse
+import csv
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import stats
+
+from network import create_network
+from engine import DiffusionEngine
+
+
+FIELDS = [
+    "n_agents", "k", "p", "p_base", "replicates", "step",
+    "mean_reach", "std_reach", "ci_low", "ci_high",
+]
+
+
+def run_seed(base_seed, n_agents, k, p, p_base, replicate):
+    """Ντετερμινιστικό seed ενός run από τις παραμέτρους του."""
+    key = [base_seed, n_agents, k, round(p * 1e9), round(p_base * 1e9), replicate]
+    return np.random.SeedSequence(key)
+
+
+def simulate(n_agents, k, p, p_base, steps, seed):
+    """Ένα run: δίκτυο, τυχαίος αρχικός agent, καμπύλη reach μήκους steps."""
+    net_seed, sim_seed = seed.spawn(2)
+    G = create_network(n_agents=n_agents, k=k, p=p, seed=int(net_seed.generate_state(1)[0]))
+    rng = np.random.default_rng(sim_seed)
+    nodes = list(G.nodes())
+    G.nodes[nodes[rng.integers(len(nodes))]]["informed"] = True
+    engine = DiffusionEngine.from_networkx(G, p_base=p_base, rng=rng)
+    return engine.run(steps)
+
+
+def _run_task(args):
+    return simulate(*args)
+
+
+def summarize(config, curves, confidence=0.95):
+    """Μέση καμπύλη reach και διάστημα εμπιστοσύνης (t-κατανομή) ανά βήμα."""
+    n_agents, k, p, p_base = config
+    curves = np.asarray(curves, dtype=float)
+    r = curves.shape[0]
+    mean = curves.mean(axis=0)
+    std = curves.std(axis=0, ddof=1) if r > 1 else np.zeros_like(mean)
+    half = stats.t.ppf(0.5 + confidence / 2, r - 1) * std / np.sqrt(r) if r > 1 else np.zeros_like(mean)
+    return [
+        {
+            "n_agents": n_agents, "k": k, "p": p, "p_base": p_base, "replicates": r,
+            "step": t + 1, "mean_reach": float(mean[t]), "std_reach": float(std[t]),
+            "ci_low": float(max(0.0, mean[t] - half[t])), "ci_high": float(min(1.0, mean[t] + half[t])),
+        }
+        for t in range(curves.shape[1])
+    ]
+
+
+def iter_sweep(n_agents, k, p, p_base, replicates=20, steps=20, seed=0, workers=0):
+    """
+    Επιστρέφει (generator) τις γραμμές σύνοψης κάθε συνδυασμού μόλις
+    ολοκληρωθούν όλες οι επαναλήψεις του.
+    """
+    configs = list(itertools.product(n_agents, k, p, p_base))
+    for n, kk, _, _ in configs:
+        if kk >= n:
+            raise ValueError(f"k={kk} must be smaller than n_agents={n}")
+        if kk % 2 != 0:
+            raise ValueError(f"k={kk} must be an even number")
+
+    tasks = [
+        (n, kk, pp, pb, steps, run_seed(seed, n, kk, pp, pb, rep))
+        for n, kk, pp, pb in configs
+        for rep in range(replicates)
+    ]
+    workers = workers if workers and workers > 0 else (os.cpu_count() or 1)
+
+    if workers == 1:
+        results = map(_run_task, tasks)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        chunk = max(1, len(tasks) // (workers * 8))
+        results = pool.map(_run_task, tasks, chunksize=chunk)
+
+    try:
+        # map() returns in submission order, so each config completes as a block
+        for config in configs:
+            curves = [next(results) for _ in range(replicates)]
+            yield summarize(config, curves)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+class _CsvSink:
+    def __init__(self, path):
+        self.f = open(path, "w", newline="") if path != "-" else sys.stdout
+        self.w = csv.DictWriter(self.f, fieldnames=FIELDS)
+        self.w.writeheader()
+
+    def write(self, rows):
+        self.w.writerows(rows)
+        self.f.flush()
+
+    def close(self):
+        if self.f is not sys.stdout:
+            self.f.close()
+
+
+class _ParquetSink:
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet output needs pyarrow; use a .csv path instead")
+        self.pa = pa
+        self.w = pq.ParquetWriter(path, pa.schema([
+            (f, pa.int64() if f in ("n_agents", "k", "replicates", "step") else pa.float64())
+            for f in FIELDS
+        ]))
+
+    def write(self, rows):
+        self.w.write_table(self.pa.Table.from_pylist(rows, schema=self.w.schema))
+
+    def close(self):
+        self.w.close()
+
+
+def run_sweep(n_agents, k, p, p_base, replicates=20, steps=20, seed=0, workers=0, out=None):
+    """Τρέχει το sweep, γράφει προαιρετικά στο `out` και επιστρέφει όλες τις γραμμές."""
+    sink = None
+    if out is not None:
+        sink = _ParquetSink(out) if str(out).endswith(".parquet") else _CsvSink(out)
+    rows = []
+    try:
+        for block in iter_sweep(n_agents, k, p, p_base, replicates, steps, seed, workers):
+            rows.extend(block)
+            if sink is not None:
+                sink.write(block)
+    finally:
+        if sink is not None:
+            sink.close()
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Parameter sweep for the diffusion simulation")
+    ap.add_argument("--n-agents", type=int, nargs="+", default=[60])
+    ap.add_argument("--k", type=int, nargs="+", default=[4])
+    ap.add_argument("--p", type=float, nargs="+", default=[0.1])
+    ap.add_argument("--p-base", type=float, nargs="+", default=[0.2])
+    ap.add_argument("--replicates", type=int, default=20)
+    ap.add_argument("--steps", type=int, default=20)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workers", type=int, default=0, help="0 = one per core")
+    ap.add_argument("--out", default="-", help="CSV path, .parquet path, or - for stdout")
+    args = ap.parse_args()
+
+    run_sweep(
+        args.n_agents, args.k, args.p, args.p_base,
+        replicates=args.replicates, steps=args.steps, seed=args.seed,
+        workers=args.workers, out=args.out,
+    )
+
+
+if __name__ == "__main__":
+    main()
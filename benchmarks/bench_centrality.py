@@ -0,0 +1,60 @@
+"""
+Serial vs. process-pool betweenness/closeness on the largest component.
+
+    python -m benchmarks.bench_centrality [--betweenness-k 2000] [--max-workers N]
+
+Prints the serial networkx time, then the process-pool path for 1, 2, 4, ...
+workers with its speedup over the 1-worker pool (the scaling curve), and
+checks that every run matches the serial networkx result.
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import time
+
+from sna_graph_chatbot.graph_index import get_index
+from sna_graph_chatbot import parallel_centrality as pc
+
+
+def _timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return out, time.perf_counter() - t0
+
+
+def _max_abs_diff(a, b) -> float:
+    return max(abs(a[u] - b[u]) for u in a)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--betweenness-k", type=int, default=2000)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--max-workers", type=int, default=pc.resolve_workers(0))
+    args = ap.parse_args()
+
+    H = get_index().lcc_view()
+    k = min(args.betweenness_k, H.number_of_nodes())
+    print(f"LCC: {H.number_of_nodes()} nodes, {H.number_of_edges()} edges, betweenness k={k}")
+
+    btw_ref, t_btw = _timed(pc.betweenness_centrality, H, k=k, seed=args.seed, workers=1)
+    clos_ref, t_clos = _timed(pc.closeness_centrality, H, workers=1)
+    print(f"{'workers':>9} {'betweenness s':>14} {'speedup':>8} {'closeness s':>12} {'speedup':>8} {'max |diff|':>11}")
+    print(f"{'networkx':>9} {t_btw:14.2f} {'':>8} {t_clos:12.2f} {'':>8} {0.0:11.1e}")
+
+    base_b = base_c = None
+    workers = 1
+    while workers <= args.max_workers:
+        btw, tb = _timed(pc.parallel_betweenness, H, k=k, seed=args.seed, workers=workers)
+        clos, tc = _timed(pc.parallel_closeness, H, workers=workers)
+        base_b, base_c = base_b or tb, base_c or tc
+        diff = max(_max_abs_diff(btw, btw_ref), _max_abs_diff(clos, clos_ref))
+        print(f"{workers:9d} {tb:14.2f} {base_b / tb:8.2f} {tc:12.2f} {base_c / tc:8.2f} {diff:11.1e}")
+        if not math.isclose(diff, 0.0, abs_tol=1e-9):
+            raise SystemExit("parallel result differs from the serial path")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Agent start-up time and time-to-first-answer, eager vs. lazy vs. warm-up.
+
+    python -m benchmarks.bench_startup [--tool graph_overview] [--think 2.0] [--repeat 3]
+
+Each scenario runs in a fresh interpreter that does what agent.py does at
+start-up (import the tools, wrap them, optionally start the warm-up), waits
+`--think` seconds for the first question (the user typing plus the LLM
+picking a tool), then answers it through the async tool runner:
+
+    eager    SNA_EAGER_IMPORTS=1, no warm-up (the old behaviour)
+    lazy     heavy imports deferred, no warm-up
+    warmup   heavy imports deferred, graph load and precompute in the background
+
+Reported times are from the first line of the child process (interpreter
+start-up itself is the same for all). The disk result cache is disabled so
+the first answer is really computed.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SCENARIOS = {
+    "eager": {"SNA_EAGER_IMPORTS": "1", "SNA_WARMUP": "0"},
+    "lazy": {"SNA_EAGER_IMPORTS": "0", "SNA_WARMUP": "0"},
+    "warmup": {"SNA_EAGER_IMPORTS": "0", "SNA_WARMUP": "1"},
+}
+
+
+def _child(tool: str, think: float) -> None:
+    t0 = time.perf_counter()
+    import asyncio
+
+    from sna_graph_chatbot import tools_graph as tg
+    from sna_graph_chatbot.tool_runner import async_tool
+    from sna_graph_chatbot.warmup import start_warmup, warmup_status
+
+    fn = async_tool(getattr(tg, tool), timeout=600)
+    start_warmup()
+    ready = time.perf_counter() - t0
+
+    time.sleep(think)
+    t1 = time.perf_counter()
+    out = asyncio.run(fn())
+    answer = time.perf_counter() - t1
+    print(json.dumps({
+        "ready_secs": ready,
+        "answer_secs": answer,
+        "ttfa_secs": time.perf_counter() - t0,
+        "ok": isinstance(out, dict) and "error" not in out and out.get("status") != "computing",
+        "warmup": warmup_status(),
+    }))
+
+
+def _run(scenario: str, tool: str, think: float) -> dict:
+    env = dict(os.environ, SNA_CACHE_DIR="", **SCENARIOS[scenario])
+    cmd = [sys.executable, "-m", "benchmarks.bench_startup", "--child", "--tool", tool, "--think", str(think)]
+    out = subprocess.run(cmd, env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--tool", default="graph_overview", help="tools_graph function answered first (no arguments)")
+    ap.add_argument("--think", type=float, default=2.0, help="seconds until the first question arrives")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--json", help="also write the raw runs to this file")
+    ap.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        _child(args.tool, args.think)
+        return
+
+    print(f"first question: {args.tool}() after {args.think:.1f} s, median of {args.repeat} runs")
+    print(f"{'scenario':>9} {'ready s':>8} {'answer s':>9} {'ttfa s':>8} {'vs eager':>9}")
+    runs = {}
+    base = None
+    for scenario in SCENARIOS:
+        rs = [_run(scenario, args.tool, args.think) for _ in range(args.repeat)]
+        if not all(r["ok"] for r in rs):
+            raise SystemExit(f"{scenario}: the first answer failed")
+        runs[scenario] = rs
+        ready = statistics.median(r["ready_secs"] for r in rs)
+        answer = statistics.median(r["answer_secs"] for r in rs)
+        ttfa = statistics.median(r["ttfa_secs"] for r in rs)
+        base = base or ttfa
+        print(f"{scenario:>9} {ready:8.3f} {answer:9.3f} {ttfa:8.3f} {base / ttfa:8.2f}x")
+
+    timings = runs["warmup"][-1]["warmup"]
+    if timings:
+        print("warm-up steps (s):", ", ".join(f"{k}={v}" for k, v in timings["timings"].items()))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"tool": args.tool, "think": args.think, "runs": runs}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
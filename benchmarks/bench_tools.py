@@ -0,0 +1,337 @@
+"""
+Latency and memory of every chatbot tool and of the diffusion step, across graph sizes.
+
+    python -m benchmarks.bench_tools [--sizes 10000 100000 1000000] [--out results.json]
+                                     [--baseline baseline.json --threshold 0.25]
+
+Runs on the bundled Facebook graph and on Barabasi-Albert graphs with the
+given edge counts (generated locally, no downloads). For each graph and
+tool it records:
+
+    cold_secs   first call after the per-graph indexes/engines are dropped
+    warm_secs   second call (indexes built, result cache cleared)
+                (tools under a second: best of --rounds such calls)
+    peak_mb     peak Python/NumPy allocation of a third, cold call under
+                tracemalloc (timed separately, as tracing slows Python code)
+
+plus the per-step time of the legacy networkx `diffusion_step` and of the
+array DiffusionEngine. Tools too slow for a graph size are skipped (see
+LIMITS, or --no-limits). Scaling exponents are least-squares slopes of
+log(cold time) against log(edges) over the synthetic graphs.
+
+With --baseline, every (graph, tool) present in both files is compared and
+the run fails if one got slower than (1 + threshold) x baseline by more
+than --min-secs.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import os
+import platform
+from pathlib import Path
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+# analyses must really run: no disk tier, and the memory tier is cleared per call
+os.environ["SNA_CACHE_DIR"] = ""
+
+import networkx as nx  # noqa: E402
+import numpy as np  # noqa: E402
+import scipy  # noqa: E402
+
+from sna_graph_chatbot import tools_graph as tg  # noqa: E402
+from sna_graph_chatbot.graph_store import get_registry  # noqa: E402
+from sna_graph_chatbot.result_cache import get_cache  # noqa: E402
+
+_SIM = Path(__file__).resolve().parent.parent / "Simulation"
+if str(_SIM) not in sys.path:
+    sys.path.insert(0, str(_SIM))
+from diffusion import diffusion_step  # noqa: E402
+from engine import DiffusionEngine  # noqa: E402
+from generators import barabasi_albert  # noqa: E402
+
+
+Args = Callable[[np.ndarray], Dict[str, Any]]
+
+# every analysis tool registered in agent.py, with arguments picked per graph
+TOOLS: List[Tuple[str, Args]] = [
+    ("graph_overview", lambda ids: {}),
+    ("ego_network", lambda ids: {"u": int(ids[0])}),
+    ("ego_network_summary", lambda ids: {}),
+    ("get_node_neighbors", lambda ids: {"u": int(ids[0])}),
+    ("recommend_friends", lambda ids: {"u": int(ids[0])}),
+    ("centralities_top_k", lambda ids: {}),
+    ("closeness_top_k", lambda ids: {}),
+    ("clustering_stats", lambda ids: {}),
+    ("k_core_summary", lambda ids: {}),
+    ("core_distribution", lambda ids: {}),
+    ("node_core", lambda ids: {"u": int(ids[0])}),
+    ("louvain_communities", lambda ids: {}),
+    ("node_community", lambda ids: {"u": int(ids[0])}),
+    ("degree_assortativity", lambda ids: {}),
+    ("articulation_points_top_k", lambda ids: {}),
+    ("bridges_top_k", lambda ids: {}),
+    ("bridge_summary", lambda ids: {}),
+    ("top_k_by_degree", lambda ids: {}),
+    ("shortest_path", lambda ids: {"u": int(ids[0]), "v": int(ids[-1])}),
+    ("component_summary", lambda ids: {}),
+    ("diameter_estimate", lambda ids: {}),
+    ("simulate_spread", lambda ids: {"u": int(ids[0])}),
+    ("list_datasets", lambda ids: {}),
+]
+
+# tools that would take minutes to hours on large graphs: (limit on (nodes, edges), description)
+LIMITS: Dict[str, Tuple[Callable[[int, int], bool], str]] = {
+    # sampled betweenness runs up to 2000 Brandes passes over the component
+    "centralities_top_k": (lambda n, m: n * m <= 5e8, "n * m above 5e8"),
+    "louvain_communities": (lambda n, m: m <= 250_000, "more than 250k edges"),
+    "node_community": (lambda n, m: m <= 250_000, "more than 250k edges"),
+    # exact eccentricity bounding degrades towards one BFS per node on low-diameter graphs
+    "diameter_estimate": (lambda n, m: n * m <= 5e8, "n * m above 5e8"),
+    "diffusion_step": (lambda n, m: m <= 1_500_000, "more than 1.5M edges"),
+}
+
+SIM_STEPS = 5
+
+# tools faster than this are timed as the best of --rounds runs
+QUICK_SECS = 1.0
+
+
+def _measure(fn: Callable[[], Any], memory: bool) -> Tuple[float, float | None]:
+    if memory:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    try:
+        fn()
+        secs = time.perf_counter() - t0
+    finally:
+        peak = tracemalloc.get_traced_memory()[1] / 2**20 if memory else None
+        if memory:
+            tracemalloc.stop()
+    return secs, peak
+
+
+def _write_ba(path: Path, edges: int, seed: int) -> None:
+    m = 5
+    A, _ = barabasi_albert(max(edges // m, m + 1), m, np.random.default_rng(seed))
+    rows = np.repeat(np.arange(A.shape[0]), np.diff(A.indptr))
+    upper = rows < A.indices
+    np.savetxt(path, np.column_stack((rows[upper], A.indices[upper])), fmt="%d")
+
+
+def bench_tools(name: str, memory: bool, limits: bool, repeat_secs: float, rounds: int) -> Dict[str, Any]:
+    store = get_registry().use(name)
+    G = store.load()
+    m = G.number_of_edges()
+    ids = np.asarray(store.csr().node_ids)
+    out: Dict[str, Any] = {"nodes": G.number_of_nodes(), "edges": m, "tools": {}}
+
+    for tool, make_args in TOOLS:
+        if limits and tool in LIMITS and not LIMITS[tool][0](G.number_of_nodes(), m):
+            out["tools"][tool] = {"skipped": LIMITS[tool][1]}
+            continue
+        fn = getattr(tg, tool)
+        kwargs = make_args(ids)
+
+        def cold_run() -> float:
+            store.release(keep_graph=True)
+            get_cache().clear()
+            return _measure(lambda: fn(**kwargs), False)[0]
+
+        def warm_run() -> float:
+            get_cache().clear()
+            return _measure(lambda: fn(**kwargs), False)[0]
+
+        cold = cold_run()
+        # slow tools are not repeated: their warm time is their cold time minus a rounding error
+        warm = cold
+        if cold <= repeat_secs:
+            warm = warm_run()
+        # best of `rounds` for quick tools, whose single timings are mostly noise
+        if cold <= QUICK_SECS:
+            cold = min([cold] + [cold_run() for _ in range(rounds - 1)])
+            warm = min([warm] + [warm_run() for _ in range(rounds - 1)])
+        peak = None
+        if memory and cold <= repeat_secs:
+            store.release(keep_graph=True)
+            get_cache().clear()
+            _, peak = _measure(lambda: fn(**kwargs), True)
+        out["tools"][tool] = {"cold_secs": cold, "warm_secs": warm, "peak_mb": peak}
+        print(
+            f"  {tool:<26} cold {cold:9.4f} s   warm {warm:9.4f} s"
+            + (f"   peak {peak:8.1f} MB" if peak is not None else "")
+        )
+
+    out["tools"].update(bench_simulation(G, ids, memory, limits))
+    return out
+
+
+def _per_step(make_run: Callable[[], Callable[[], Any]], memory: bool) -> Dict[str, Any]:
+    # a fresh state for the timed run and for the tracemalloc run
+    secs, _ = _measure(make_run(), False)
+    peak = _measure(make_run(), True)[1] if memory else None
+    return {"cold_secs": secs / SIM_STEPS, "warm_secs": secs / SIM_STEPS, "peak_mb": peak}
+
+
+def bench_simulation(G: nx.Graph, ids: np.ndarray, memory: bool, limits: bool) -> Dict[str, Any]:
+    opinion = np.random.default_rng(0).integers(0, 2, len(ids)).astype(np.int8)
+    out: Dict[str, Any] = {}
+
+    def legacy() -> Callable[[], Any]:
+        H = nx.Graph(G)
+        nx.set_node_attributes(H, dict(zip(ids.tolist(), opinion.tolist())), "opinion")
+        nx.set_node_attributes(H, False, "informed")
+        H.nodes[int(ids[0])]["informed"] = True
+        return lambda: [diffusion_step(H) for _ in range(SIM_STEPS)]
+
+    ok, why = LIMITS["diffusion_step"]
+    if limits and not ok(G.number_of_nodes(), G.number_of_edges()):
+        out["diffusion_step"] = {"skipped": why}
+    else:
+        out["diffusion_step"] = _per_step(legacy, memory)
+
+    A = nx.to_scipy_sparse_array(G, nodelist=ids.tolist(), weight=None, format="csr")
+    informed = np.zeros(len(ids), dtype=bool)
+    informed[0] = True
+    for label, incremental in (("engine_step", False), ("engine_step_frontier", True)):
+        def array_engine(incremental: bool = incremental) -> Callable[[], Any]:
+            engine = DiffusionEngine(A, opinion, informed, rng=np.random.default_rng(0))
+            return lambda: engine.run(SIM_STEPS, incremental=incremental)
+        out[label] = _per_step(array_engine, memory)
+
+    for label, r in out.items():
+        if "skipped" not in r:
+            print(
+                f"  {label:<26} {r['cold_secs']:9.4f} s/step"
+                + (f"   peak {r['peak_mb']:8.1f} MB" if r["peak_mb"] is not None else "")
+            )
+    return out
+
+
+def scaling_exponents(graphs: Dict[str, Any], names: List[str]) -> Dict[str, float]:
+    """Slope of log(cold time) vs log(edges) per tool, over the graphs in `names`."""
+    out: Dict[str, float] = {}
+    tools = {t for name in names for t in graphs[name]["tools"]}
+    for tool in sorted(tools):
+        pts = [
+            (graphs[name]["edges"], graphs[name]["tools"][tool]["cold_secs"])
+            for name in names
+            if "cold_secs" in graphs[name]["tools"].get(tool, {})
+        ]
+        pts = [(e, s) for e, s in pts if s > 0]
+        if len(pts) >= 2:
+            x = np.log([e for e, _ in pts])
+            y = np.log([s for _, s in pts])
+            out[tool] = float(np.polyfit(x, y, 1)[0])
+    return out
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float, min_secs: float) -> List[str]:
+    regressions = []
+    for name, graph in current["graphs"].items():
+        base_graph = baseline.get("graphs", {}).get(name)
+        if base_graph is None:
+            continue
+        for tool, r in graph["tools"].items():
+            b = base_graph["tools"].get(tool, {})
+            if "cold_secs" not in r or "cold_secs" not in b:
+                continue
+            for key in ("cold_secs", "warm_secs"):
+                if r[key] > b[key] * (1 + threshold) and r[key] - b[key] > min_secs:
+                    regressions.append(
+                        f"{name}/{tool} {key}: {b[key]:.4f} -> {r[key]:.4f} s ({r[key] / b[key]:.2f}x)"
+                    )
+    return regressions
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="*", default=[10_000, 100_000, 1_000_000],
+                    help="edge counts of the synthetic graphs")
+    ap.add_argument("--no-facebook", action="store_true")
+    ap.add_argument("--no-memory", action="store_true", help="skip tracemalloc (it slows Python-heavy tools)")
+    ap.add_argument("--no-limits", action="store_true", help="run every tool on every graph")
+    ap.add_argument("--repeat-secs", type=float, default=20.0,
+                    help="only tools faster than this get the warm and tracemalloc runs")
+    ap.add_argument("--rounds", type=int, default=3,
+                    help=f"tools faster than {QUICK_SECS:g} s are timed as the best of this many runs")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workdir", type=Path, help="where synthetic edge lists are kept (default: a temp dir)")
+    ap.add_argument("--out", type=Path, help="write the results as JSON")
+    ap.add_argument("--baseline", type=Path, help="results JSON to compare against")
+    ap.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    ap.add_argument("--min-secs", type=float, default=0.01, help="ignore slowdowns smaller than this")
+    args = ap.parse_args()
+
+    registry = get_registry()
+    workdir = args.workdir or Path(tempfile.mkdtemp(prefix="sna_bench_"))
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    names = [] if args.no_facebook else ["facebook_combined"]
+    synthetic = []
+    for edges in args.sizes:
+        name = f"ba_{edges}"
+        path = workdir / f"{name}.txt"
+        if not path.exists():
+            _write_ba(path, edges, args.seed)
+        registry.register(name, path)
+        names.append(name)
+        synthetic.append(name)
+
+    graphs: Dict[str, Any] = {}
+    for name in names:
+        print(f"{name}:")
+        graphs[name] = bench_tools(
+            name,
+            memory=not args.no_memory,
+            limits=not args.no_limits,
+            repeat_secs=args.repeat_secs,
+            rounds=args.rounds,
+        )
+        print(f"  ({graphs[name]['nodes']} nodes, {graphs[name]['edges']} edges)")
+
+    exponents = scaling_exponents(graphs, synthetic)
+    if exponents:
+        print("scaling exponents (time ~ edges^b):")
+        for tool, b in exponents.items():
+            print(f"  {tool:<26} b = {b:5.2f}")
+
+    results = {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "scipy": scipy.__version__,
+            "networkx": nx.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "seed": args.seed,
+            "rounds": args.rounds,
+        },
+        "graphs": graphs,
+        "scaling_exponents": exponents,
+    }
+    if args.out is not None:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"results written to {args.out}")
+
+    if args.baseline is not None:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_secs)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for line in regressions:
+                print("  " + line)
+            raise SystemExit(1)
+        print(f"no regressions over {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Serve the chatbot (ADK API and web UI), with the graph warm-up started first:
+
+    python -m sna_graph_chatbot [--host 127.0.0.1] [--port 8000] [--no-web]
+
+`adk web` still works; the warm-up then starts with the first chat turn.
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from .warmup import start_warmup
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Serve the SNA chatbot")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--no-web", action="store_true", help="serve the API only, without the web UI")
+    args = ap.parse_args()
+
+    # load the graph and precompute in the background while the server starts and the first question is typed
+    start_warmup()
+
+    import uvicorn
+    from google.adk.cli.fast_api import get_fast_api_app
+
+    app = get_fast_api_app(
+        agents_dir=str(Path(__file__).resolve().parent.parent),
+        web=not args.no_web,
+        host=args.host,
+        port=args.port,
+    )
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,73 +1,111 @@
-import os
-from dotenv import load_dotenv
-from google.adk.agents import Agent
-from google.adk.tools import AgentTool, FunctionTool
-from google.adk.models.lite_llm import LiteLlm
-from .callback import save_session_callback
-from . import tools_graph as tg
-
-
-sna_agent = Agent(
-    name="SNA_Graph_Assistant",
-    model=LiteLlm(model="ollama_chat/llama3.1:8b"),
-    instruction=(
-        "You are a conversational chatbot for Social Network Analysis.\n"
-        "You MUST communicate ONLY in English.\n"
-        "The user will ask questions ONLY in English.\n\n"
-
-        "CRITICAL RULES:\n"
-        "- Do NOT translate anything.\n"
-        "- Do NOT use any language other than English.\n"
-        "- Tool names and parameters are in English and MUST remain unchanged.\n\n"
-
-        "ABSOLUTE RULE (VERY IMPORTANT):\n"
-        "- After ANY tool call, you MUST ALWAYS send a final text response to the user.\n"
-        "- Never stop after a tool call.\n"
-        "- Never return only tool output.\n\n"
-
-        "INTENT HANDLING:\n"
-        "- If the user greets you (e.g. 'hello', 'hi'), reply politely in English something like this 'Hello ! How Can I help you?'  WITHOUT calling any tools.\n"
-        "- If the user asks about graph statistics, call graph_overview().\n"
-        "- If the user asks about shortest path between two nodes, call shortest_path(u=<int>, v=<int>).\n"
-        "- If the user asks for neighbors of a node, call get_node_neighbors(u=<int>).\n" 
-        "- If the user specifically asks for ALL neighbors, set show_all=True in get_node_neighbors.\n"
-        "- If the user asks about communities, largest community, or modularity, call louvain_communities().\n"
-        "- If the user asks for friend recommendations or to suggest friends for a node, "
-        "- call recommend_friends(u=<int>, k=<int>).\n"
-        "- Default k to 5 if the user doesn't specify a number.\n"
-        "- If the user asks about articulation points / cut vertices, call articulation_points_top_k(k=<int>). "
-        "If they do not specify k, use k=10.\n"
-        "- If the user asks about bridges / cut edges, call bridges_top_k(k=<int>). "
-        "If they do not specify k, use k=10.\n"
-        "- If the user asks for a bridge/articulation summary, call bridge_summary().\n\n"
-
-        "TOOL RESULT HANDLING:\n"
-        "- Use ONLY the values returned by the tools.\n"
-        "- NEVER invent numbers.\n"
-        "- Explain the recommendations. Mention that they are based on the Adamic-Adar index, which looks at shared connections.\n"
-        "- NEVER modify tool outputs.\n\n"
-
-        "After receiving tool results, explain them clearly in English."
-    ),
-    tools=[
-        FunctionTool(tg.graph_overview),
-        FunctionTool(tg.ego_network),
-        FunctionTool(tg.get_node_neighbors),
-        FunctionTool(tg.recommend_friends),
-        FunctionTool(tg.centralities_top_k),
-        FunctionTool(tg.clustering_stats),
-        FunctionTool(tg.k_core_summary),
-        FunctionTool(tg.louvain_communities),
-        FunctionTool(tg.degree_assortativity),
-        FunctionTool(tg.articulation_points_top_k),
-        FunctionTool(tg.bridges_top_k),
-        FunctionTool(tg.bridge_summary),
-        FunctionTool(tg.top_k_by_degree),
-        FunctionTool(tg.shortest_path),
-        FunctionTool(tg.component_summary),
-        FunctionTool(tg.diameter_estimate),
-    ],
-    after_agent_callback=save_session_callback,
-)
-
-root_agent = sna_agent
\ No newline at end of file
+import os
+from dotenv import load_dotenv
+from google.adk.agents import Agent
+from google.adk.tools import AgentTool, FunctionTool
+from google.adk.models.lite_llm import LiteLlm
+from .callback import bind_session_dataset, remember_dataset, save_session_callback, warmup_callback
+from .instrumentation import instrumented
+from .tool_runner import async_tool
+from . import tools_graph as tg
+
+
+sna_agent = Agent(
+    name="SNA_Graph_Assistant",
+    model=LiteLlm(model="ollama_chat/llama3.1:8b"),
+    instruction=(
+        "You are a conversational chatbot for Social Network Analysis.\n"
+        "You MUST communicate ONLY in English.\n"
+        "The user will ask questions ONLY in English.\n\n"
+
+        "CRITICAL RULES:\n"
+        "- Do NOT translate anything.\n"
+        "- Do NOT use any language other than English.\n"
+        "- Tool names and parameters are in English and MUST remain unchanged.\n\n"
+
+        "ABSOLUTE RULE (VERY IMPORTANT):\n"
+        "- After ANY tool call, you MUST ALWAYS send a final text response to the user.\n"
+        "- Never stop after a tool call.\n"
+        "- Never return only tool output.\n\n"
+
+        "INTENT HANDLING:\n"
+        "- If the user greets you (e.g. 'hello', 'hi'), reply politely in English something like this 'Hello ! How Can I help you?'  WITHOUT calling any tools.\n"
+        "- If the user asks about graph statistics, call graph_overview().\n"
+        "- If the user asks for the diameter, call diameter_estimate(); if they also ask for the radius, "
+        "center or periphery, call diameter_estimate(center_periphery=True).\n"
+        "- If the user asks about shortest path between two nodes, call shortest_path(u=<int>, v=<int>).\n"
+        "- If the user asks for neighbors of a node, call get_node_neighbors(u=<int>).\n" 
+        "- If the user specifically asks for ALL neighbors, set show_all=True in get_node_neighbors.\n"
+        "- If the user asks about a node's ego network, call ego_network(u=<int>, radius=<int>); radius defaults to 1.\n"
+        "- If the user asks about ego networks of all nodes (typical ego size, density, clustering), "
+        "call ego_network_summary(radius=<int>).\n"
+        "- If the user asks about the k-core (or k-shell) for some k, call k_core_summary(k=<int>).\n"
+        "- If the user asks only for the most central nodes by closeness or harmonic centrality, call "
+        "closeness_top_k(k=<int>, measure='closeness'|'harmonic'). It is exact by default; if the user "
+        "wants a quick estimate, pass samples=<int> or epsilon=<float> and report the lower/upper bounds.\n"
+        "- If the user asks how nodes are spread over core levels, call core_distribution().\n"
+        "- If the user asks for the core number of a node, call node_core(u=<int>).\n"
+        "- If the user asks about communities, largest community, or modularity, call louvain_communities().\n"
+        "- If the user asks which community a node belongs to, call node_community(u=<int>).\n"
+        "- If the user asks for friend recommendations or to suggest friends for a node, "
+        "- call recommend_friends(u=<int>, k=<int>).\n"
+        "- Default k to 5 if the user doesn't specify a number.\n"
+        "- If the user asks about articulation points / cut vertices, call articulation_points_top_k(k=<int>). "
+        "If they do not specify k, use k=10.\n"
+        "- If the user asks about bridges / cut edges, call bridges_top_k(k=<int>). "
+        "If they do not specify k, use k=10.\n"
+        "- If the user asks for a bridge/articulation summary, call bridge_summary().\n"
+        "- If the user asks to simulate information spread / diffusion from a node, "
+        "call simulate_spread(u=<int>, steps=<int>). If they do not specify steps, use steps=20.\n"
+        "- If the user asks which graphs / datasets are available, call list_datasets().\n"
+        "- If the user asks to switch to or analyze another dataset, call use_dataset(name=<str>).\n"
+        "- If a tool returns status 'computing', tell the user the analysis is still running, share any "
+        "'partial' values, and call the same tool again with the same arguments when they ask again.\n"
+        "- If the user asks what is still running, call computation_status(); to stop one, "
+        "call cancel_computation(job_id=<str>); if it returns cancelled=False, tell the user that "
+        "analysis cannot be interrupted and will finish on its own.\n\n"
+
+        "TOOL RESULT HANDLING:\n"
+        "- Use ONLY the values returned by the tools.\n"
+        "- NEVER invent numbers.\n"
+        "- Explain the recommendations. Mention that they are based on the Adamic-Adar index, which looks at shared connections.\n"
+        "- NEVER modify tool outputs.\n"
+        "- The '_perf' field of a tool result is timing data for the developers; do not mention it "
+        "unless the user asks how long an analysis took.\n\n"
+
+        "After receiving tool results, explain them clearly in English."
+    ),
+    tools=[
+        FunctionTool(async_tool(tg.list_datasets)),
+        FunctionTool(async_tool(tg.use_dataset)),
+        FunctionTool(async_tool(tg.graph_overview)),
+        FunctionTool(async_tool(tg.ego_network)),
+        FunctionTool(async_tool(tg.ego_network_summary, timeout=30)),
+        FunctionTool(async_tool(tg.get_node_neighbors)),
+        FunctionTool(async_tool(tg.recommend_friends)),
+        FunctionTool(async_tool(tg.centralities_top_k, timeout=30)),
+        FunctionTool(async_tool(tg.closeness_top_k, timeout=30)),
+        FunctionTool(async_tool(tg.clustering_stats)),
+        FunctionTool(async_tool(tg.k_core_summary)),
+        FunctionTool(async_tool(tg.core_distribution)),
+        FunctionTool(async_tool(tg.node_core)),
+        FunctionTool(async_tool(tg.louvain_communities, timeout=30)),
+        FunctionTool(async_tool(tg.node_community)),
+        FunctionTool(async_tool(tg.degree_assortativity)),
+        FunctionTool(async_tool(tg.articulation_points_top_k)),
+        FunctionTool(async_tool(tg.bridges_top_k)),
+        FunctionTool(async_tool(tg.bridge_summary)),
+        FunctionTool(async_tool(tg.top_k_by_degree)),
+        FunctionTool(async_tool(tg.shortest_path)),
+        FunctionTool(async_tool(tg.component_summary)),
+        FunctionTool(async_tool(tg.diameter_estimate, timeout=30)),
+        FunctionTool(async_tool(tg.simulate_spread)),
+        FunctionTool(instrumented(tg.computation_status)),
+        FunctionTool(instrumented(tg.cancel_computation)),
+    ],
+    before_agent_callback=warmup_callback,
+    after_agent_callback=save_session_callback,
+    before_tool_callback=bind_session_dataset,
+    after_tool_callback=remember_dataset,
+)
+
+root_agent = sna_agent
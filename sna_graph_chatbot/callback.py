@@ -1,19 +1,38 @@
-import os
-import datetime
-from google.adk.agents.callback_context import CallbackContext
-
-
-async def save_session_callback(callback_context: CallbackContext):
-    session = callback_context.session
-    output_dir = "saved_sessions"
-    os.makedirs(output_dir, exist_ok=True)
-
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    file_path = os.path.join(output_dir, f"session_{timestamp}_{session.id}.json")
-
-    session_json = session.model_dump_json(exclude_none=True, indent=2)
-
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(session_json)
-
-    print(f"Session conversation saved to {file_path}")
+from typing import Any, Dict, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+
+from .graph_store import get_registry, set_session_dataset
+from .session_log import get_session_log
+from .warmup import start_warmup
+
+
+# session state key of the dataset a chat session analyzes
+DATASET_KEY = "sna_dataset"
+
+
+async def warmup_callback(callback_context: CallbackContext):
+    # no-op once started; under `adk web` (no `python -m sna_graph_chatbot`) the first turn starts it
+    start_warmup()
+    return None
+
+
+async def save_session_callback(callback_context: CallbackContext):
+    # appends only this turn's new events; the file write happens on a background thread
+    get_session_log().append(callback_context.session)
+
+
+def bind_session_dataset(tool: BaseTool, args: Dict[str, Any], tool_context: ToolContext) -> Optional[Dict]:
+    # every session analyzes its own dataset, so one user's use_dataset does not switch the others
+    set_session_dataset(tool_context.state.get(DATASET_KEY) or get_registry().active)
+    return None
+
+
+def remember_dataset(
+    tool: BaseTool, args: Dict[str, Any], tool_context: ToolContext, tool_response: Any
+) -> Optional[Dict]:
+    if tool.name == "use_dataset" and isinstance(tool_response, dict) and "active" in tool_response:
+        tool_context.state[DATASET_KEY] = tool_response["active"]
+    return None
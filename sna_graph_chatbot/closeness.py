@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import math
+import threading
+from typing import Any, Dict, List, Tuple
+
+from .lazy_imports import lazy_module
+from .distance_oracle import expand
+from .graph_index import get_index
+from .graph_store import GraphStore, get_store, on_release
+from .tool_runner import raise_if_cancelled
+
+np = lazy_module("numpy")
+sp = lazy_module("scipy.sparse")
+
+
+MEASURES = ("closeness", "harmonic")
+# pivots run before an exact top-k refinement; their BFS trees give the bounds
+TOP_K_PIVOTS = 16
+# harmonic bounds take O(levels^2) per pivot; deeper BFS trees (long paths) skip them
+HARMONIC_BOUND_LEVELS = 4096
+# top-k candidates get exact distance-2 counts in chunks of at most
+# TIGHTEN_MAX rows and about TIGHTEN_WORK adjacency entries per sparse product
+TIGHTEN_MAX = 4096
+TIGHTEN_WORK = 4_000_000
+# slack when comparing float harmonic sums with their bounds
+TOL = 1e-9
+
+
+class ClosenessIndex:
+    """
+    Closeness and harmonic centrality on the largest connected component,
+    from BFS runs out of sampled pivots (Eppstein & Wang, "Fast approximation
+    of centrality", 2004).
+
+    With k uniform pivots p_i, the farness F(v) = sum_w d(v, w) is estimated
+    by n/k * sum_i d(p_i, v), and the harmonic centrality H(v) = sum_w 1/d(v, w)
+    by n/k * sum_i 1/d(p_i, v). By Hoeffding and a union bound over the n
+    nodes, k >= ln(2n/delta) / (2 eps^2) pivots put every estimate of the
+    average distance within eps * diameter with probability 1 - delta.
+
+    Every pivot BFS also gives deterministic bounds through the triangle
+    inequality, |d(p,v) - d(p,w)| <= d(v,w) <= d(p,v) + d(p,w), summed over w
+    per BFS level of v. They tighten the statistical interval, and with
+    bounds on how many nodes can sit at distance 1, 2 and 3 they drive the
+    exact top-k (Bergamini et al., "Computing top-k closeness centrality
+    faster in unweighted graphs", 2016): candidates are visited in order of
+    their bound, each by a BFS that stops as soon as it cannot beat the
+    current k-th value, until no unvisited node can.
+
+    Scores follow networkx: closeness (n-1)/F(v), harmonic sum_w 1/d(v,w),
+    both within the component. Pivots and bounds are kept per graph version
+    and grow as more samples are asked for.
+    """
+
+    def __init__(self, store: GraphStore, seed: int = 42):
+        self.store = store
+        self.seed = seed
+        self._lock = threading.RLock()
+        self._version: int | None = None
+
+    # PIVOTS
+    def _reset(self) -> None:
+        csr = self.store.csr()
+        self.indptr, self.indices = np.asarray(csr.indptr), np.asarray(csr.indices)
+        self.ids = np.asarray(csr.node_ids)
+        mask = get_index(self.store).lcc_mask()
+        self.nodes = np.flatnonzero(mask)
+        self.n = int(self.nodes.size)
+        N = csr.n
+        self.deg = deg = np.diff(self.indptr).astype(float)
+
+        self.pivots: List[int] = []
+        self.exact: Dict[int, Tuple[float, float]] = {}  # node -> (farness, harmonic)
+        self.sum_d = np.zeros(N)
+        self.sum_inv = np.zeros(N)
+        # neighbours are at distance 1, at most sum(deg(u) - 1) nodes at
+        # distance 2, everybody else at least 3
+        rows = np.repeat(np.arange(N), np.diff(self.indptr))
+        self.two_hop = np.bincount(rows, weights=deg[self.indices], minlength=N)
+        rest = np.maximum(self.n - 1 - deg, 0)
+        two = np.minimum(self.two_hop - deg, rest)
+        self.far_lo = np.where(mask, deg + 2 * two + 3 * (rest - two), np.inf)
+        self.far_hi = np.full(N, np.inf)
+        self.harm_lo = np.zeros(N)
+        # the bounds above get exact distance-2 counts for top-k candidates only
+        # int32 data: path counts in sub @ adj reach the degree, and an int8 count of 256 wraps to 0
+        self.adj = sp.csr_array((np.ones(len(self.indices), dtype=np.int32), self.indices, self.indptr), shape=(N, N))
+        self._tight = np.zeros(N, dtype=bool)
+        self.harm_hi = np.where(mask, deg + two / 2 + (rest - two) / 3, 0.0)
+        self.diameter_hi = float(max(self.n - 1, 0))
+        self.bfs_runs = self.bfs_cut = 0
+        self._rng = np.random.default_rng(self.seed)
+        self._order = self._rng.permutation(self.nodes)
+        self._version = self.store.version
+
+    def _check(self) -> None:
+        if self._version != self.store.version:
+            self._reset()
+
+    def _bfs(self, s: int, measure: str | None = None, limit: float | None = None) -> Tuple[Any, float, float]:
+        """
+        BFS from s: (dist, farness, harmonic). With a `measure` and `limit`,
+        stops early (dist None) once s provably cannot reach the limit, i.e.
+        its farness must exceed it, or its harmonic centrality stay below it.
+        """
+        self.bfs_runs += 1
+        dist = np.full(len(self.indptr) - 1, -1, dtype=np.int32)
+        dist[s] = 0
+        frontier = np.array([s], dtype=np.int64)
+        far, harm, seen, level = 0.0, 0.0, 1, 0
+        while frontier.size:
+            nb, _ = expand(self.indptr, self.indices, frontier)
+            nb = nb[dist[nb] < 0]
+            if nb.size == 0:
+                break
+            level += 1
+            dist[nb] = level
+            # wide levels: scanning the marks is cheaper than hashing the duplicates
+            frontier = np.flatnonzero(dist == level) if nb.size * 8 > dist.size else np.unique(nb).astype(np.int64)
+            seen += frontier.size
+            far += level * frontier.size
+            harm += frontier.size / level
+            if limit is not None:
+                # the next level has at most sum(deg - 1) of the frontier, the rest lies further
+                rest = self.n - seen
+                nxt = min(rest, self.deg[frontier].sum() - frontier.size)
+                if (measure == "closeness" and far + nxt * (level + 1) + (rest - nxt) * (level + 2) > limit) or (
+                    measure == "harmonic" and harm + nxt / (level + 1) + (rest - nxt) / (level + 2) < limit
+                ):
+                    self.bfs_cut += 1
+                    return None, far, harm
+        return dist, far, harm
+
+    def _add_pivot(self, p: int) -> None:
+        dist, far, harm = self._bfs(p)
+        self.pivots.append(p)
+        self.exact[p] = (far, harm)
+        d = dist[self.nodes].astype(float)
+        self.sum_d[self.nodes] += d
+        with np.errstate(divide="ignore"):
+            self.sum_inv[self.nodes] += np.where(d > 0, 1.0 / d, 0.0)
+
+        # bounds per BFS level l of v, from the level histogram h of this pivot;
+        # v itself sits on its own level, so its term (1, resp. 1/(2l)) is removed
+        level = dist[self.nodes]
+        ecc = int(level.max())
+        self.diameter_hi = min(self.diameter_hi, 2.0 * ecc)
+        h = np.bincount(level, minlength=ecc + 1).astype(float)
+        lv = np.arange(ecc + 1, dtype=float)
+        cnt, mom = np.cumsum(h), np.cumsum(h * lv)
+        below = lv * (cnt - h) - (mom - h * lv)           # sum over j < l of h[j] (l - j)
+        above = (mom[-1] - mom) - lv * (cnt[-1] - cnt)    # sum over j > l of h[j] (j - l)
+        far_lo = below + above + h - 1.0
+        far_hi = (self.n - 2) * lv + far
+        nodes = self.nodes
+        self.far_lo[nodes] = np.maximum(self.far_lo[nodes], far_lo[level])
+        self.far_hi[nodes] = np.minimum(self.far_hi[nodes], far_hi[level])
+        if ecc <= HARMONIC_BOUND_LEVELS:
+            t = np.arange(-ecc, ecc + 1)
+            harm_hi = np.convolve(h, 1.0 / np.maximum(np.abs(t), 1))[ecc:2 * ecc + 1] - 1.0
+            inv = np.zeros(2 * ecc + 1)
+            inv[1:] = 1.0 / np.arange(1, 2 * ecc + 1)
+            harm_lo = np.correlate(inv, h, mode="valid") - np.where(lv > 0, 0.5 / np.maximum(lv, 1), 0.0)
+            self.harm_hi[nodes] = np.minimum(self.harm_hi[nodes], harm_hi[level])
+            self.harm_lo[nodes] = np.maximum(self.harm_lo[nodes], harm_lo[level])
+        self.far_lo[p] = self.far_hi[p] = far
+        self.harm_lo[p] = self.harm_hi[p] = harm
+
+    def sample(self, samples: int) -> int:
+        """Grow the pivot set to `samples` pivots (at most the component size)."""
+        with self._lock:
+            self._check()
+            target = min(int(samples), self.n)
+            while len(self.pivots) < target:
+                raise_if_cancelled()
+                self._add_pivot(int(self._order[len(self.pivots)]))
+            return len(self.pivots)
+
+    # ESTIMATES
+    @staticmethod
+    def samples_for(n: int, epsilon: float, delta: float) -> int:
+        return int(math.ceil(math.log(2 * max(n, 1) / delta) / (2 * epsilon ** 2)))
+
+    def estimate(
+        self, samples: int | None = None, epsilon: float | None = None, delta: float = 0.05
+    ) -> Dict[str, Any]:
+        """
+        Estimated farness and harmonic centrality of every component node,
+        from `samples` pivots or as many as `epsilon` needs (additive error on
+        the average distance, as a fraction of the diameter, with probability
+        1 - delta). Arrays are over the store's CSR indices (nan outside the
+        component); intervals combine the Hoeffding bound with the
+        deterministic pivot bounds.
+        """
+        with self._lock:
+            self._check()
+            if samples is None:
+                samples = self.samples_for(self.n, epsilon if epsilon else 0.1, delta)
+            k = self.sample(max(1, samples))
+            n = self.n
+            eps = math.sqrt(math.log(2 * max(n, 1) / delta) / (2 * k)) if k < n else 0.0
+
+            far = self.sum_d * (n / k)
+            harm = self.sum_inv * (n / k)
+            far_err = eps * self.diameter_hi * n
+            harm_err = eps * n
+            if k == n:  # every node is a pivot: exact
+                far_err = harm_err = 0.0
+            lo = np.maximum(self.far_lo, far - far_err)
+            hi = np.minimum(self.far_hi, far + far_err)
+            h_lo = np.maximum(self.harm_lo, harm - harm_err)
+            h_hi = np.minimum(self.harm_hi, harm + harm_err)
+            out = {
+                "samples": k,
+                "epsilon": eps,
+                "confidence": 1.0 - delta if eps > 0 else 1.0,
+                "farness": np.clip(far, lo, hi),
+                "farness_lo": lo,
+                "farness_hi": hi,
+                "harmonic": np.clip(harm, h_lo, h_hi),
+                "harmonic_lo": h_lo,
+                "harmonic_hi": h_hi,
+            }
+            outside = np.ones(len(far), dtype=bool)
+            outside[self.nodes] = False
+            for key in ("farness", "farness_lo", "farness_hi", "harmonic", "harmonic_lo", "harmonic_hi"):
+                out[key] = np.where(outside, np.nan, out[key])
+            return out
+
+    def closeness(self, farness: np.ndarray) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(farness > 0, (self.n - 1) / farness, 0.0)
+
+    # EXACT TOP-K
+    def _chunk_size(self, order: np.ndarray) -> int:
+        """Leading candidates whose distance-2 walks add up to about TIGHTEN_WORK."""
+        work = np.cumsum(self.two_hop[order[:TIGHTEN_MAX]])
+        return max(1, int(np.searchsorted(work, TIGHTEN_WORK)))
+
+    def _tighten(self, rows: np.ndarray) -> None:
+        """
+        Exact distance-2 counts n2 for `rows`, from one sparse product, and
+        with them the cap n3 <= sum(deg(u) - 1) over the distance-2 nodes u:
+        farness >= deg + 2 n2 + 3 n3 + 4 (rest - n2 - n3).
+        """
+        rows = rows[~self._tight[rows]]
+        if rows.size == 0:
+            return
+        sub = self.adj[rows]
+        reach = sub @ self.adj + sub  # within distance 2, v itself included
+        reach.data[:] = 1
+        deg = self.deg[rows]
+        rest = np.maximum(self.n - 1 - deg, 0)
+        two = np.clip(np.diff(reach.indptr) - 1 - deg, 0, rest)
+        out = reach @ self.deg - deg - self.two_hop[rows]  # degrees summed over the distance-2 nodes
+        three = np.clip(out - two, 0, rest - two)
+        far = deg + 2 * two + 3 * three + 4 * (rest - two - three)
+        harm = deg + two / 2 + three / 3 + (rest - two - three) / 4
+        self.far_lo[rows] = np.maximum(self.far_lo[rows], far)
+        self.harm_hi[rows] = np.minimum(self.harm_hi[rows], harm)
+        self._tight[rows] = True
+
+    def top_k(self, k: int = 10, measure: str = "closeness", pivots: int = TOP_K_PIVOTS) -> Dict[str, Any]:
+        """
+        Exact top-k by closeness or harmonic centrality: [(CSR index, score)]
+        sorted by score, ties by node order, plus how many BFS runs it took.
+        """
+        if measure not in MEASURES:
+            raise ValueError(f"measure must be one of {MEASURES}")
+        with self._lock:
+            self._check()
+            runs0, cut0 = self.bfs_runs, self.bfs_cut
+            self.sample(pivots)
+            k = max(1, min(int(k), self.n))
+            closeness = measure == "closeness"
+            # best first: smallest farness lower bound / largest harmonic upper bound
+            bound = self.far_lo if closeness else -self.harm_hi
+            order = self.nodes[np.argsort(bound[self.nodes], kind="stable")]
+
+            def value(far: float, harm: float) -> float:
+                return far if closeness else -harm
+
+            found: Dict[int, float] = {v: value(*fh) for v, fh in self.exact.items()}
+
+            def update() -> float:
+                vals = sorted(found.values())
+                return vals[k - 1] + TOL * abs(vals[k - 1]) if len(vals) >= k else math.inf
+
+            kth = update()
+            pos = 0
+            while pos < order.size and bound[order[pos]] <= kth:
+                # next chunk in bound order: exact distance-2 counts first, then BFS what survives
+                chunk = order[pos:pos + self._chunk_size(order[pos:])]
+                pos += chunk.size
+                self._tighten(chunk)
+                for v in chunk.tolist():
+                    if v in found or bound[v] > kth:
+                        continue  # no break: tightening reshuffled the chunk
+                    raise_if_cancelled()
+                    limit = None if math.isinf(kth) else (kth if closeness else -kth)
+                    dist, far, harm = self._bfs(v, measure, limit)
+                    if dist is None:
+                        continue
+                    self.exact[v] = (far, harm)
+                    found[v] = value(far, harm)
+                    kth = update()
+
+            best = sorted(found.items(), key=lambda kv: (kv[1], kv[0]))[:k]
+            n = self.n
+            top = [
+                (v, ((n - 1) / val if val > 0 else 0.0) if closeness else -val)
+                for v, val in best
+            ]
+            return {
+                "top": top,
+                "bfs_runs": self.bfs_runs - runs0,
+                "bfs_cut_short": self.bfs_cut - cut0,
+                "pivots": len(self.pivots),
+                "nodes": n,
+            }
+
+
+_INDEXES: Dict[int, ClosenessIndex] = {}
+on_release(lambda store: _INDEXES.pop(id(store), None))
+
+
+def get_closeness_index(store: GraphStore | None = None) -> ClosenessIndex:
+    store = store or get_store()
+    idx = _INDEXES.get(id(store))
+    if idx is None or idx.store is not store:
+        idx = ClosenessIndex(store)
+        _INDEXES[id(store)] = idx
+    return idx
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+import threading
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .lazy_imports import lazy_module
+from .graph_store import CSRGraph, GraphStore, get_store, on_release
+from .parallel_centrality import pool_context, resolve_workers
+
+nx = lazy_module("networkx")
+np = lazy_module("numpy")
+community_louvain = lazy_module("community")
+
+
+Config = Tuple[float, int]
+
+
+def _graph(node_ids: np.ndarray, edges: np.ndarray) -> nx.Graph:
+    # same construction as CSRGraph.to_networkx, so every process sees the same iteration order
+    G = nx.Graph()
+    G.add_nodes_from(node_ids.tolist())
+    G.add_edges_from(node_ids[edges].tolist())
+    return G
+
+
+def _louvain(G: nx.Graph, node_ids: np.ndarray, resolution: float, seed: int, init: np.ndarray | None) -> np.ndarray:
+    start = dict(zip(node_ids.tolist(), init.tolist())) if init is not None else None
+    part = community_louvain.best_partition(G, partition=start, resolution=resolution, random_state=seed)
+    return np.fromiter((part[u] for u in node_ids.tolist()), dtype=np.int64, count=len(node_ids))
+
+
+@dataclass
+class Partition:
+    """
+    One Louvain partition of a graph version. `labels[i]` is the community of
+    CSR node i; members are kept grouped by community, so every lookup is an
+    array slice.
+    """
+    csr: CSRGraph
+    labels: np.ndarray
+    resolution: float
+    seed: int
+    version: int
+    warm_started: bool = False
+    compute_secs: float = 0.0
+    _order: np.ndarray = field(init=False, repr=False)
+    _bounds: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        k = int(self.labels.max()) + 1 if self.labels.size else 0
+        self._order = np.argsort(self.labels, kind="stable")
+        self._bounds = np.searchsorted(self.labels[self._order], np.arange(k + 1))
+
+        e = self.csr.edges
+        cu, cv = self.labels[e[:, 0]], self.labels[e[:, 1]]
+        same = cu == cv
+        self.intra = np.bincount(cu[same], minlength=k)
+        self.inter_total = int((~same).sum())
+        # edges with exactly one end in the community
+        self.boundary = np.bincount(cu[~same], minlength=k) + np.bincount(cv[~same], minlength=k)
+        self.degree_sum = np.bincount(self.labels, weights=self.csr.degrees(), minlength=k)
+
+    @property
+    def count(self) -> int:
+        return int(self._bounds.shape[0] - 1)
+
+    @property
+    def sizes(self) -> np.ndarray:
+        return np.diff(self._bounds)
+
+    @property
+    def modularity(self) -> float:
+        """Modularity at the partition's resolution, as nx.community.modularity(G, parts, resolution)."""
+        m = float(self.csr.m)
+        if m == 0:
+            return 0.0
+        return float((self.intra / m).sum() - self.resolution * ((self.degree_sum / (2 * m)) ** 2).sum())
+
+    def community_of(self, u: Any) -> int | None:
+        i = self.csr.index_of(u)
+        return int(self.labels[i]) if i >= 0 else None
+
+    def members(self, c: int) -> np.ndarray:
+        if not 0 <= c < self.count:
+            return np.zeros(0, dtype=np.int64)
+        return np.asarray(self.csr.node_ids)[self._order[self._bounds[c]:self._bounds[c + 1]]]
+
+    def edges_between(self, a: int, b: int) -> int:
+        if a == b:
+            return int(self.intra[a]) if 0 <= a < self.count else 0
+        e = self.csr.edges
+        cu, cv = self.labels[e[:, 0]], self.labels[e[:, 1]]
+        return int((((cu == a) & (cv == b)) | ((cu == b) & (cv == a))).sum())
+
+    def top(self, k: int) -> List[Tuple[int, int]]:
+        sizes = self.sizes
+        order = np.argsort(-sizes, kind="stable")[:k]
+        return [(int(c), int(sizes[c])) for c in order]
+
+
+# Worker-side graph for parallel runs, set once per process.
+_WORKER: Tuple[nx.Graph, np.ndarray] | None = None
+
+
+def _init_worker(node_ids: np.ndarray, edges: np.ndarray) -> None:
+    global _WORKER
+    _WORKER = (_graph(node_ids, edges), node_ids)
+
+
+def _worker_run(args: Tuple[float, int, np.ndarray | None]) -> Tuple[np.ndarray, float]:
+    resolution, seed, init = args
+    G, node_ids = _WORKER
+    t0 = time.time()
+    labels = _louvain(G, node_ids, resolution, seed, init)
+    return labels, time.time() - t0
+
+
+class CommunityIndex:
+    """
+    Louvain partitions of a GraphStore graph, cached per (resolution, seed)
+    and graph version. After an edit the previous partition of the same
+    configuration seeds the next run (new nodes start as singletons), which
+    needs far fewer passes than a cold start. Several configurations can be
+    computed at once in a process pool.
+    """
+
+    def __init__(self, store: GraphStore):
+        self.store = store
+        self._lock = threading.RLock()
+        self._parts: Dict[Config, Partition] = {}
+
+    def _init_labels(self, key: Config, csr: CSRGraph) -> np.ndarray | None:
+        prev = self._parts.get(key)
+        if prev is None:
+            return None
+        init = np.full(csr.n, -1, dtype=np.int64)
+        pos = csr.indices_of(prev.csr.node_ids)
+        known = pos >= 0
+        init[pos[known]] = prev.labels[known]
+        fresh = init < 0
+        init[fresh] = prev.count + np.arange(int(fresh.sum()))
+        return init
+
+    def partition(self, resolution: float = 1.0, seed: int = 42) -> Partition:
+        return self.partitions([(resolution, seed)])[0]
+
+    def partitions(self, configs: Sequence[Config], workers: int = 1) -> List[Partition]:
+        """Partitions for (resolution, seed) pairs, computing the missing ones in parallel."""
+        with self._lock:
+            csr = self.store.csr()
+            version = self.store.version
+            keys = [(float(r), int(s)) for r, s in configs]
+            todo = list(dict.fromkeys(
+                k for k in keys if k not in self._parts or self._parts[k].version != version
+            ))
+            tasks = [(r, s, self._init_labels((r, s), csr)) for r, s in todo]
+            if not tasks:
+                return [self._parts[k] for k in keys]
+
+            node_ids, edges = np.asarray(csr.node_ids), np.asarray(csr.edges)
+            workers = min(resolve_workers(workers), len(tasks))
+            if workers <= 1:
+                G = _graph(node_ids, edges)
+                results = []
+                for r, s, init in tasks:
+                    t0 = time.time()
+                    results.append((_louvain(G, node_ids, r, s, init), time.time() - t0))
+            else:
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=pool_context(),
+                    initializer=_init_worker,
+                    initargs=(node_ids, edges),
+                ) as ex:
+                    results = list(ex.map(_worker_run, tasks))
+
+            for (r, s, init), (labels, secs) in zip(tasks, results):
+                self._parts[(r, s)] = Partition(
+                    csr, labels, r, s, version, warm_started=init is not None, compute_secs=secs
+                )
+            return [self._parts[k] for k in keys]
+
+
+_INDEXES: Dict[int, CommunityIndex] = {}
+on_release(lambda store: _INDEXES.pop(id(store), None))
+
+
+def get_communities(store: GraphStore | None = None) -> CommunityIndex:
+    store = store or get_store()
+    idx = _INDEXES.get(id(store))
+    if idx is None or idx.store is not store:
+        idx = CommunityIndex(store)
+        _INDEXES[id(store)] = idx
+    return idx
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .lazy_imports import lazy_module
+from .graph_store import CSRGraph, GraphStore, get_store, on_release
+
+np = lazy_module("numpy")
+
+
+def expand(indptr: np.ndarray, indices: np.ndarray, frontier: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """All (neighbour, parent) pairs of a frontier, gathered without a Python loop."""
+    starts = indptr[frontier]
+    lens = indptr[frontier + 1] - starts
+    total = int(lens.sum())
+    if total == 0:
+        return np.zeros(0, dtype=indices.dtype), np.zeros(0, dtype=frontier.dtype)
+    offs = np.repeat(starts - (np.cumsum(lens) - lens), lens)
+    return indices[offs + np.arange(total)], np.repeat(frontier, lens)
+
+
+def bfs(indptr: np.ndarray, indices: np.ndarray, source: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Level-synchronous BFS over CSR arrays: (dist, parent), -1 where unreachable."""
+    n = len(indptr) - 1
+    dist = np.full(n, -1, dtype=np.int32)
+    parent = np.full(n, -1, dtype=np.int64)
+    dist[source] = 0
+    frontier = np.array([source], dtype=np.int64)
+    level = 0
+    while frontier.size:
+        nb, par = expand(indptr, indices, frontier)
+        fresh = dist[nb] < 0
+        nb, first = np.unique(nb[fresh], return_index=True)
+        level += 1
+        dist[nb] = level
+        parent[nb] = par[fresh][first]
+        frontier = nb.astype(np.int64)
+    return dist, parent
+
+
+class DistanceOracle:
+    """
+    Landmark index for distance and path queries on a GraphStore graph.
+
+    BFS distances from `num_landmarks` high-degree nodes are kept as compact
+    int arrays of shape (L, n), together with the BFS parent pointers. For a
+    pair (u, v), the triangle inequality gives
+
+        max_l |d(u,l) - d(v,l)|  <=  d(u,v)  <=  min_l d(u,l) + d(l,v)
+
+    in O(L). Exact queries run a bidirectional BFS that starts from that
+    upper bound and drops frontier nodes whose lower bound cannot beat it; when
+    both bounds already agree the path is read off the landmark trees.
+    """
+
+    def __init__(self, store: GraphStore, num_landmarks: int = 16):
+        self.store = store
+        self.num_landmarks = num_landmarks
+        self._lock = threading.RLock()
+        self._version: int | None = None
+        self.landmarks = np.zeros(0, dtype=np.int64)
+        self.dist = np.zeros((0, 0), dtype=np.int16)
+        self.parent = np.zeros((0, 0), dtype=np.int32)
+
+    def _csr(self) -> CSRGraph:
+        with self._lock:
+            if self._version != self.store.version:
+                self._build()
+            return self.store.csr()
+
+    def _build(self) -> None:
+        csr = self.store.csr()
+        indptr, indices = np.asarray(csr.indptr), np.asarray(csr.indices)
+        deg = np.diff(indptr)
+
+        # highest degree first, skipping direct neighbours of chosen landmarks
+        chosen: List[int] = []
+        blocked = np.zeros(csr.n, dtype=bool)
+        for i in np.argsort(-deg, kind="stable"):
+            if len(chosen) >= self.num_landmarks:
+                break
+            if blocked[i] or deg[i] == 0:
+                continue
+            chosen.append(int(i))
+            blocked[indices[indptr[i]:indptr[i + 1]]] = True
+
+        runs = [bfs(indptr, indices, s) for s in chosen]
+        dist = np.stack([d for d, _ in runs]) if runs else np.zeros((0, csr.n), dtype=np.int32)
+        par = np.stack([p for _, p in runs]) if runs else np.zeros((0, csr.n), dtype=np.int64)
+
+        dist_dtype = np.int16 if dist.size == 0 or dist.max() < np.iinfo(np.int16).max else np.int32
+        par_dtype = np.int32 if csr.n < 2**31 else np.int64
+        self.landmarks = np.asarray(chosen, dtype=np.int64)
+        self.dist = dist.astype(dist_dtype)
+        self.parent = par.astype(par_dtype)
+        self._version = self.store.version
+
+    # BOUNDS
+    def _bounds_idx(self, a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized (lower, upper) bounds for index arrays a, b; upper = -1 if unknown."""
+        if self.dist.shape[0] == 0:
+            return np.zeros(a.shape, dtype=np.int64), np.full(a.shape, -1, dtype=np.int64)
+        da = self.dist[:, a].astype(np.int64)
+        db = self.dist[:, b].astype(np.int64)
+        both = (da >= 0) & (db >= 0)
+        lower = np.where(both, np.abs(da - db), 0).max(axis=0)
+        upper = np.where(both, da + db, np.iinfo(np.int64).max).min(axis=0)
+        # a landmark reaching exactly one endpoint proves different components
+        split = ((da >= 0) != (db >= 0)).any(axis=0)
+        upper = np.where(split | (upper == np.iinfo(np.int64).max), -1, upper)
+        lower = np.where(split, -1, lower)
+        return lower, upper
+
+    def distance_bounds(self, u: Any, v: Any) -> Tuple[int, int] | None:
+        """(lower, upper) for d(u, v); upper is -1 when no landmark reaches the pair,
+        lower is -1 when they are provably disconnected. None for unknown nodes."""
+        csr = self._csr()
+        a, b = csr.index_of(u), csr.index_of(v)
+        if a < 0 or b < 0:
+            return None
+        lo, hi = self._bounds_idx(np.array([a]), np.array([b]))
+        return int(lo[0]), int(hi[0])
+
+    def distances(self, us: Sequence[Any], vs: Sequence[Any], exact: bool = False) -> np.ndarray:
+        """
+        Batch distance queries. With exact=False returns the landmark upper
+        bound (-1 if unknown or disconnected) in O(L) per pair; with
+        exact=True the true distance (-1 if disconnected or unknown node).
+        """
+        csr = self._csr()
+        a = csr.indices_of(list(us))
+        b = csr.indices_of(list(vs))
+        known = (a >= 0) & (b >= 0)
+        out = np.full(a.shape, -1, dtype=np.int64)
+        lo, hi = self._bounds_idx(np.where(known, a, 0), np.where(known, b, 0))
+        # u == v: the landmark bounds are only 0 <= d <= 2 d(u, l) there
+        same = known & (a == b)
+        if not exact:
+            out[known] = hi[known]
+            out[same] = 0
+            return out
+
+        out[same] = 0
+        tight = known & ~same & (hi >= 0) & (lo == hi)
+        out[tight] = hi[tight]
+        for i in np.flatnonzero(known & ~same & ~tight):
+            if lo[i] < 0:
+                continue
+            res = self._bidirectional(csr, int(a[i]), int(b[i]), int(hi[i]), want_path=False)
+            out[i] = -1 if res is None else res[0]
+        return out
+
+    # EXACT PATHS
+    def shortest_path(self, u: Any, v: Any) -> List[int] | None:
+        """A shortest u-v path as original node ids, or None if there is none."""
+        csr = self._csr()
+        a, b = csr.index_of(u), csr.index_of(v)
+        if a < 0 or b < 0:
+            raise KeyError(u if a < 0 else v)
+        if a == b:
+            return [int(csr.node_ids[a])]
+
+        lo, hi = self._bounds_idx(np.array([a]), np.array([b]))
+        lo, hi = int(lo[0]), int(hi[0])
+        if lo < 0:
+            return None
+        if hi >= 0 and lo == hi:
+            path = self._landmark_path(a, b, hi)
+        else:
+            res = self._bidirectional(csr, a, b, hi, want_path=True)
+            if res is None:
+                return None
+            path = res[1]
+        return [int(x) for x in csr.node_ids[np.asarray(path, dtype=np.int64)]]
+
+    def _landmark_path(self, a: int, b: int, length: int) -> List[int]:
+        da = self.dist[:, a].astype(np.int64)
+        db = self.dist[:, b].astype(np.int64)
+        l = int(np.flatnonzero((da >= 0) & (da + db == length))[0])
+        par = self.parent[l]
+
+        def to_landmark(x: int) -> List[int]:
+            out = [x]
+            while par[x] >= 0:
+                x = int(par[x])
+                out.append(x)
+            return out
+
+        left, right = to_landmark(a), to_landmark(b)
+        return left + right[::-1][1:]
+
+    def _bidirectional(
+        self, csr: CSRGraph, s: int, t: int, upper: int, want_path: bool
+    ) -> Tuple[int, List[int] | None] | None:
+        if s == t:
+            return 0, ([s] if want_path else None)
+        indptr, indices = csr.indptr, csr.indices
+        n = csr.n
+        best = upper if upper >= 0 else np.iinfo(np.int64).max
+        meet = -1
+
+        dist = [np.full(n, -1, dtype=np.int32), np.full(n, -1, dtype=np.int32)]
+        parent = [np.full(n, -1, dtype=self.parent.dtype), np.full(n, -1, dtype=self.parent.dtype)]
+        ends = (s, t)
+        dist[0][s] = 0
+        dist[1][t] = 0
+        frontier = [np.array([s], dtype=np.int64), np.array([t], dtype=np.int64)]
+        level = [0, 0]
+        L = self.dist if self.dist.shape[0] else None
+
+        while frontier[0].size and frontier[1].size and level[0] + level[1] + 1 < best:
+            # grow the side with less adjacency to scan
+            work = [int((indptr[f + 1] - indptr[f]).sum()) for f in frontier]
+            side = 0 if work[0] <= work[1] else 1
+            other = 1 - side
+
+            nb, par = expand(indptr, indices, frontier[side])
+            fresh = dist[side][nb] < 0
+            nb, first = np.unique(nb[fresh], return_index=True)
+            nb = nb.astype(np.int64)
+            level[side] += 1
+            dist[side][nb] = level[side]
+            parent[side][nb] = par[fresh][first]
+
+            hit = dist[other][nb] >= 0
+            if hit.any():
+                total = level[side] + dist[other][nb[hit]].astype(np.int64)
+                j = int(np.argmin(total))
+                if total[j] < best:
+                    best, meet = int(total[j]), int(nb[hit][j])
+
+            if L is not None and nb.size:
+                # landmark lower bound on the remaining distance to the far end
+                far = L[:, ends[other]].astype(np.int64)[:, None]
+                near = L[:, nb].astype(np.int64)
+                lb = np.where((near >= 0) & (far >= 0), np.abs(near - far), 0).max(axis=0)
+                nb = nb[level[side] + lb < best]
+            frontier[side] = nb
+
+        if meet < 0:
+            if upper < 0:
+                return None
+            return upper, (self._landmark_path(s, t, upper) if want_path else None)
+        if not want_path:
+            return best, None
+
+        path = [meet]
+        x = meet
+        while x != s:
+            x = int(parent[0][x])
+            path.append(x)
+        path.reverse()
+        x = meet
+        while x != t:
+            x = int(parent[1][x])
+            path.append(x)
+        return best, path
+
+
+_ORACLES: Dict[int, DistanceOracle] = {}
+on_release(lambda store: _ORACLES.pop(id(store), None))
+
+
+def get_oracle(store: GraphStore | None = None) -> DistanceOracle:
+    store = store or get_store()
+    oracle = _ORACLES.get(id(store))
+    if oracle is None or oracle.store is not store:
+        oracle = DistanceOracle(store, num_landmarks=int(os.environ.get("SNA_LANDMARKS", "16")))
+        _ORACLES[id(store)] = oracle
+    return oracle
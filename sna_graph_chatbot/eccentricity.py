@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict
+
+from .lazy_imports import lazy_module
+from .distance_oracle import bfs
+from .graph_index import get_index
+from .graph_store import GraphStore, get_store, on_release
+from .tool_runner import raise_if_cancelled
+
+np = lazy_module("numpy")
+
+
+MODES = ("diameter", "radius", "extrema", "all")
+
+
+class EccentricityIndex:
+    """
+    Exact eccentricities on the largest connected component by bound
+    refinement (Takes & Kosters, "Determining the diameter of small world
+    networks", 2011; the same scheme as nx.extrema_bounding).
+
+    Every BFS from a node v with eccentricity e(v) tightens, for all w,
+
+        max(d(v,w), e(v) - d(v,w))  <=  e(w)  <=  e(v) + d(v,w)
+
+    BFS sources alternate between the unresolved node with the largest upper
+    bound and the one with the smallest lower bound, and the loop stops as
+    soon as no unresolved node can still change the requested quantity, which
+    on small-world graphs takes a handful of BFS runs for the diameter or
+    radius. The bounds
+    are kept per graph version, so asking for the radius after the diameter
+    (or for the full array afterwards) continues from where the last call
+    stopped instead of starting over.
+    """
+
+    def __init__(self, store: GraphStore):
+        self.store = store
+        self._lock = threading.RLock()
+        self._version: int | None = None
+
+    def _reset(self) -> None:
+        csr = self.store.csr()
+        n = csr.n
+        self.lcc = get_index(self.store).lcc_mask()
+        self.deg = np.diff(np.asarray(csr.indptr))
+        self.lower = np.where(self.lcc, 0, -1).astype(np.int64)
+        self.upper = np.where(self.lcc, n, -1).astype(np.int64)
+        self.bfs_runs = 0
+        self._high = False
+        self._version = self.store.version
+
+    # BOUNDS
+    def _candidates(self, mode: str) -> np.ndarray:
+        open_ = self.lcc & (self.lower != self.upper)
+        if not open_.any():
+            return open_
+        lo, up = self.lower[self.lcc], self.upper[self.lcc]
+        maxlower, minupper = lo.max(), up.min()
+        if mode == "diameter":
+            return open_ & (self.upper > maxlower)
+        if mode == "radius":
+            return open_ & (self.lower < minupper)
+        if mode == "extrema":
+            # could still be central or peripheral
+            return open_ & ((self.lower <= minupper) | (self.upper >= maxlower))
+        return open_
+
+    def _pick(self) -> int:
+        # alternate high upper / low lower bound, ties to the higher degree
+        idx = np.flatnonzero(self.lcc & (self.lower != self.upper))
+        key = self.upper[idx] if self._high else -self.lower[idx]
+        self._high = not self._high
+        return int(idx[np.lexsort((self.deg[idx], key))[-1]])
+
+    def refine(self, mode: str = "extrema") -> None:
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        with self._lock:
+            if self._version != self.store.version:
+                self._reset()
+            csr = self.store.csr()
+            indptr, indices = np.asarray(csr.indptr), np.asarray(csr.indices)
+            while True:
+                if not self._candidates(mode).any():
+                    return
+                # the bounds stay valid after every BFS, so a cancelled run resumes from here
+                raise_if_cancelled()
+                v = self._pick()
+                dist, _ = bfs(indptr, indices, v)
+                self.bfs_runs += 1
+                d = dist.astype(np.int64)
+                ecc = int(d.max())
+                m = self.lcc
+                self.lower[m] = np.maximum(self.lower[m], np.maximum(d[m], ecc - d[m]))
+                self.upper[m] = np.minimum(self.upper[m], ecc + d[m])
+                self.lower[v] = self.upper[v] = ecc
+
+    # RESULTS
+    def summary(self, mode: str = "extrema") -> Dict[str, Any]:
+        """Diameter and radius of the LCC, plus center / periphery for 'extrema' and 'all'."""
+        with self._lock:
+            self.refine(mode)
+            ids = np.asarray(self.store.csr().node_ids)
+            lo, up = self.lower[self.lcc], self.upper[self.lcc]
+            out: Dict[str, Any] = {"lcc_nodes": int(self.lcc.sum()), "bfs_runs": self.bfs_runs}
+            if not self.lcc.any():
+                return {**out, "diameter": 0, "radius": 0}
+            if mode in ("diameter", "extrema", "all"):
+                out["diameter"] = int(lo.max())
+            if mode in ("radius", "extrema", "all"):
+                out["radius"] = int(up.min())
+            if mode in ("extrema", "all"):
+                exact = self.lcc & (self.lower == self.upper)
+                out["center"] = sorted(int(x) for x in ids[exact & (self.upper == out["radius"])])
+                out["periphery"] = sorted(int(x) for x in ids[exact & (self.lower == out["diameter"])])
+            return out
+
+    def eccentricities(self) -> np.ndarray:
+        """Exact eccentricity per CSR index (-1 outside the LCC); cached per graph version."""
+        with self._lock:
+            self.refine("all")
+            return self.lower
+
+
+_INDEXES: Dict[int, EccentricityIndex] = {}
+on_release(lambda store: _INDEXES.pop(id(store), None))
+
+
+def get_eccentricity_index(store: GraphStore | None = None) -> EccentricityIndex:
+    store = store or get_store()
+    idx = _INDEXES.get(id(store))
+    if idx is None or idx.store is not store:
+        idx = EccentricityIndex(store)
+        _INDEXES[id(store)] = idx
+    return idx
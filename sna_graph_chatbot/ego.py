@@ -0,0 +1,291 @@
+"""
+Ego-network statistics straight from the CSR arrays, for one node or all.
+
+    python -m sna_graph_chatbot.ego [--radius 1] [--workers 0] [--out ego.csv]
+"""
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import threading
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .lazy_imports import lazy_module
+from .distance_oracle import expand
+from .graph_store import GraphStore, get_store, on_release
+from .parallel_centrality import pool_context, resolve_workers
+from .sparse_engine import get_engine
+from .tool_runner import JobCancelled, raise_if_cancelled
+
+np = lazy_module("numpy")
+sp = lazy_module("scipy.sparse")
+
+
+# radii whose per-node results are kept per graph version
+CACHED_RADII = (1, 2)
+# egos per task handed to a pool worker
+POOL_CHUNK = 256
+# egos up to this many nodes, with at least 1/DENSE_MIN_FILL of the pairs
+# linked, count their triangles with a dense float32 product (exact below 2**24)
+DENSE_MAX = 2048
+DENSE_MIN_FILL = 64
+
+FIELDS = ("size", "edges", "boundary", "clustering")
+
+
+class EgoKernel:
+    """
+    Statistics of the ego network of radius r around a node u, i.e. the
+    subgraph H induced by the nodes within distance r of u, without building
+    H as a graph:
+
+        size        nodes of H
+        edges       edges of H: adjacency entries of H's nodes that land in H, halved
+        boundary    edges with exactly one endpoint in H
+        clustering  average clustering of H (nx.average_clustering(ego_graph(...)))
+
+    Nodes closer than r keep all their neighbours in H, so their clustering
+    is the one of the whole graph (passed in as `clustering`). Only the outer
+    shell, at distance exactly r, needs the triangles inside H: the rows of
+    those nodes in the local adjacency B, ((B_outer @ B) * B_outer).sum / 2,
+    i.e. set intersections of their neighbour lists restricted to H.
+    """
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, clustering: np.ndarray):
+        self.indptr = indptr
+        self.indices = indices
+        self.clustering = clustering
+        n = len(indptr) - 1
+        # scratch space, only the entries of the current ego are touched (and reset)
+        self._in = np.zeros(n, dtype=bool)
+        self._pos = np.zeros(n, dtype=np.int64)
+
+    def ball(self, u: int, radius: int) -> Tuple[np.ndarray, int]:
+        """Nodes within `radius` of u in BFS order, and where the outer shell starts."""
+        seen = self._in
+        seen[u] = True
+        layers = [np.array([u], dtype=np.int64)]
+        frontier = layers[0]
+        for _ in range(radius):
+            nb, _ = expand(self.indptr, self.indices, frontier)
+            frontier = np.unique(nb[~seen[nb]]).astype(np.int64)
+            if frontier.size == 0:
+                break
+            seen[frontier] = True
+            layers.append(frontier)
+        nodes = np.concatenate(layers)
+        # no outer shell if the ball stopped growing before `radius`
+        shell = nodes.size - frontier.size if len(layers) == radius + 1 else nodes.size
+        return nodes, shell
+
+    def stats(self, u: int, radius: int) -> Tuple[int, int, int, float]:
+        nodes, shell = self.ball(u, radius)
+        try:
+            k = nodes.size
+            nb, _ = expand(self.indptr, self.indices, nodes)
+            inside = self._in[nb]
+            e2 = int(inside.sum())
+            boundary = int(nb.size - e2)
+
+            clust = float(self.clustering[nodes[:shell]].sum())
+            if shell < k and e2:
+                self._pos[nodes] = np.arange(k)
+                lens = self.indptr[nodes + 1] - self.indptr[nodes]
+                rows = np.repeat(np.arange(k), lens)[inside]
+                cols = self._pos[nb[inside]]
+                if k <= DENSE_MAX and (k <= 128 or e2 * DENSE_MIN_FILL >= k * k):
+                    # small or dense ego: one BLAS product beats sparse bookkeeping
+                    B = np.zeros((k, k), dtype=np.float32)
+                    B[rows, cols] = 1.0
+                    outer = B[shell:]
+                    deg = outer.sum(axis=1, dtype=float)
+                    tri = ((outer @ B) * outer).sum(axis=1, dtype=float) / 2.0
+                else:
+                    indptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=k))))
+                    B = sp.csr_array((np.ones(e2), cols, indptr), shape=(k, k))
+                    outer = B[shell:]
+                    deg = np.diff(outer.indptr).astype(float)
+                    tri = np.asarray((outer @ B).multiply(outer).sum(axis=1)).ravel() / 2.0
+                pairs = deg * (deg - 1)
+                c = np.zeros_like(deg)
+                np.divide(2.0 * tri, pairs, out=c, where=pairs > 0)
+                clust += float(c.sum())
+            return k, e2 // 2, boundary, (clust / k if k > 1 else 0.0)
+        finally:
+            self._in[nodes] = False
+
+    def batch(self, rows: Sequence[int], radius: int) -> np.ndarray:
+        out = np.zeros((len(rows), len(FIELDS)), dtype=float)
+        for i, u in enumerate(rows):
+            if i % POOL_CHUNK == 0:
+                raise_if_cancelled()
+            out[i] = self.stats(int(u), radius)
+        return out
+
+
+# Worker-side kernel, set once per process by _init_worker.
+_KERNEL: EgoKernel | None = None
+
+
+def _init_worker(indptr: np.ndarray, indices: np.ndarray, clustering: np.ndarray) -> None:
+    global _KERNEL
+    _KERNEL = EgoKernel(indptr, indices, clustering)
+
+
+def _worker_batch(args: Tuple[np.ndarray, int]) -> np.ndarray:
+    rows, radius = args
+    return _KERNEL.batch(rows, radius)
+
+
+class EgoIndex:
+    """
+    Per-node ego statistics of a GraphStore graph. Results for CACHED_RADII
+    are kept as arrays over the CSR node indices, filled on demand and
+    dropped when the graph version changes; other radii are computed per
+    query.
+    """
+
+    def __init__(self, store: GraphStore):
+        self.store = store
+        self._lock = threading.RLock()
+        self._version: int | None = None
+        self._kernel: EgoKernel | None = None
+        self._cache: Dict[int, Dict[str, np.ndarray]] = {}
+        self.compute_secs: Dict[int, float] = {}
+
+    def _check(self) -> None:
+        if self._version != self.store.version:
+            csr = self.store.csr()
+            self._kernel = EgoKernel(
+                np.asarray(csr.indptr), np.asarray(csr.indices), get_engine(self.store).clustering()
+            )
+            self._cache.clear()
+            self.compute_secs.clear()
+            self._version = self.store.version
+
+    def _compute(self, rows: np.ndarray, radius: int, workers: int) -> np.ndarray:
+        workers = resolve_workers(workers)
+        if workers <= 1 or len(rows) <= POOL_CHUNK:
+            return self._kernel.batch(rows, radius)
+        # strided chunks, so the few hub egos are spread over the workers
+        nchunks = max(workers * 4, -(-len(rows) // POOL_CHUNK))
+        chunks = [rows[i::nchunks] for i in range(nchunks)]
+        k = self._kernel
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=pool_context(),
+            initializer=_init_worker,
+            initargs=(k.indptr, k.indices, k.clustering),
+        ) as ex:
+            parts = []
+            try:
+                for part in ex.map(_worker_batch, [(c, radius) for c in chunks]):
+                    parts.append(part)
+                    raise_if_cancelled()
+            except JobCancelled:
+                ex.shutdown(cancel_futures=True)  # chunks not started yet are dropped
+                raise
+        out = np.zeros((len(rows), len(FIELDS)), dtype=float)
+        for i, part in enumerate(parts):
+            out[i::nchunks] = part
+        return out
+
+    def stats(
+        self, nodes: Sequence[int] | None = None, radius: int = 1, workers: int = 1
+    ) -> Dict[str, np.ndarray]:
+        """
+        Ego statistics for `nodes` (original ids; all nodes when None), in
+        that order. Unknown ids are dropped. Keys: node, size, edges,
+        boundary, density, clustering.
+        """
+        radius = max(0, int(radius))
+        with self._lock:
+            self._check()
+            csr = self.store.csr()
+            if nodes is None:
+                rows = np.arange(csr.n, dtype=np.int64)
+            else:
+                rows = csr.indices_of(list(nodes))
+                rows = rows[rows >= 0]
+
+            if radius in CACHED_RADII:
+                cache = self._cache.get(radius)
+                if cache is None:
+                    cache = {f: np.zeros(csr.n) for f in FIELDS}
+                    cache["done"] = np.zeros(csr.n, dtype=bool)
+                    self._cache[radius] = cache
+                todo = np.unique(rows[~cache["done"][rows]])
+                if todo.size:
+                    t0 = time.time()
+                    res = self._compute(todo, radius, workers)
+                    for j, f in enumerate(FIELDS):
+                        cache[f][todo] = res[:, j]
+                    cache["done"][todo] = True
+                    self.compute_secs[radius] = self.compute_secs.get(radius, 0.0) + time.time() - t0
+                cols = {f: cache[f][rows] for f in FIELDS}
+            else:
+                res = self._compute(rows, radius, workers)
+                cols = {f: res[:, j] for j, f in enumerate(FIELDS)}
+
+        size = cols["size"].astype(np.int64)
+        edges = cols["edges"].astype(np.int64)
+        pairs = size * (size - 1)
+        density = np.zeros(len(rows))
+        np.divide(2.0 * edges, pairs, out=density, where=pairs > 0)
+        return {
+            "node": np.asarray(csr.node_ids)[rows],
+            "size": size,
+            "edges": edges,
+            "boundary": cols["boundary"].astype(np.int64),
+            "density": density,
+            "clustering": cols["clustering"],
+        }
+
+    def node(self, u: int, radius: int = 1) -> Dict[str, Any] | None:
+        s = self.stats([u], radius)
+        if s["node"].size == 0:
+            return None
+        return {key: v[0].item() for key, v in s.items()}
+
+
+_EGO: Dict[int, EgoIndex] = {}
+on_release(lambda store: _EGO.pop(id(store), None))
+
+
+def get_ego_index(store: GraphStore | None = None) -> EgoIndex:
+    store = store or get_store()
+    idx = _EGO.get(id(store))
+    if idx is None or idx.store is not store:
+        idx = EgoIndex(store)
+        _EGO[id(store)] = idx
+    return idx
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Ego-network statistics of every node of the active graph")
+    ap.add_argument("--radius", type=int, default=1)
+    ap.add_argument("--workers", type=int, default=1, help="processes (0 = one per core)")
+    ap.add_argument("--nodes", type=int, nargs="*", help="only these node ids")
+    ap.add_argument("--out", help="write one CSV row per node")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    s = get_ego_index().stats(args.nodes, radius=args.radius, workers=args.workers)
+    secs = time.perf_counter() - t0
+    print(f"{len(s['node'])} egos of radius {args.radius} in {secs:.2f} s")
+    for key in ("size", "edges", "boundary", "density", "clustering"):
+        v = s[key]
+        if v.size:
+            print(f"  {key:<10} mean {v.mean():12.4f}   median {np.median(v):12.4f}   max {v.max():12.4f}")
+    if args.out:
+        header: List[str] = ["node", "size", "edges", "boundary", "density", "clustering"]
+        np.savetxt(
+            args.out, np.column_stack([s[h] for h in header]), delimiter=",",
+            header=",".join(header), comments="", fmt=["%d", "%d", "%d", "%d", "%.6g", "%.6g"],
+        )
+        print(f"written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
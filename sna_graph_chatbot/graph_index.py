@@ -0,0 +1,388 @@
+from __future__ import annotations
+
+from collections import deque
+import threading
+import time
+from typing import Any, Dict, List, Set, Tuple
+
+from .lazy_imports import lazy_module
+from .graph_store import GraphStore, get_store, on_release
+from .kcore import CoreDecomposition
+from .sparse_engine import get_engine
+
+nx = lazy_module("networkx")
+np = lazy_module("numpy")
+csgraph = lazy_module("scipy.sparse.csgraph")
+
+
+Edge = Tuple[int, int]
+
+
+def _norm(u: int, v: int) -> Edge:
+    return (u, v) if u <= v else (v, u)
+
+
+def _smaller_side(G: nx.Graph, u: int, v: int) -> Set[int] | None:
+    """
+    After removing edge (u, v): None if u and v are still connected, otherwise
+    the node set of the smaller of the two pieces. Alternating BFS, so the
+    cost is bounded by the smaller side.
+    """
+    seen = ({u}, {v})
+    queues = (deque([u]), deque([v]))
+    while True:
+        for i in (0, 1):
+            q = queues[i]
+            if not q:
+                return seen[i]
+            x = q.popleft()
+            for y in G[x]:
+                if y in seen[1 - i]:
+                    return None
+                if y not in seen[i]:
+                    seen[i].add(y)
+                    q.append(y)
+
+
+def _is_articulation(G: nx.Graph, x: int) -> bool:
+    nbrs = list(G[x])
+    if len(nbrs) < 2:
+        return False
+    targets = set(nbrs[1:])
+    seen = {x, nbrs[0]}
+    q = deque([nbrs[0]])
+    while q and targets:
+        y = q.popleft()
+        for z in G[y]:
+            if z not in seen:
+                seen.add(z)
+                targets.discard(z)
+                q.append(z)
+    return bool(targets)
+
+
+class GraphIndex:
+    """
+    Derived structures of a GraphStore graph: connected components,
+    articulation points / bridges and core numbers (as a dict kept in sync
+    with edits, and as a CoreDecomposition recomputed per graph version).
+
+    Each structure is stamped with the graph version it describes. Edits made
+    through GraphStore.add_edge / remove_edge are applied incrementally to the
+    structures that are current; a stale structure is recomputed from scratch
+    the next time it is read.
+    """
+
+    def __init__(self, store: GraphStore):
+        self.store = store
+        self._lock = threading.RLock()
+        self._version: Dict[str, int | None] = {
+            "components": None, "bridges": None, "cores": None, "decomposition": None,
+        }
+        self.compute_secs: Dict[str, float] = {
+            "components": 0.0, "bridges": 0.0, "cores": 0.0, "decomposition": 0.0,
+        }
+
+        self._comp: Dict[int, int] = {}
+        self._members: Dict[int, Set[int]] = {}
+        self._next_cid = 0
+        # sizes, largest component and its view; dropped whenever components change
+        self._comp_derived: Dict[str, Any] = {}
+
+        self._art: Set[int] = set()
+        self._bridges: Set[Edge] = set()
+        self._sorted: Dict[str, Any] = {}
+
+        self._core: Dict[int, int] = {}
+        self._decomposition: CoreDecomposition | None = None
+
+        store.subscribe(self._on_change)
+
+    # PUBLIC
+    def is_current(self, name: str) -> bool:
+        return self._version.get(name) == self.store.version
+
+    def component_of(self, u: int) -> int | None:
+        with self._lock:
+            self._ensure_components()
+            return self._comp.get(u)
+
+    def component_size(self, u: int) -> int:
+        with self._lock:
+            self._ensure_components()
+            cid = self._comp.get(u)
+            return len(self._members[cid]) if cid is not None else 0
+
+    def component_sizes(self) -> List[int]:
+        with self._lock:
+            self._ensure_components()
+            if "sizes" not in self._comp_derived:
+                self._comp_derived["sizes"] = sorted((len(m) for m in self._members.values()), reverse=True)
+            return self._comp_derived["sizes"]
+
+    def largest_component(self) -> Set[int]:
+        with self._lock:
+            self._ensure_components()
+            if "lcc" not in self._comp_derived:
+                # first of the largest in node order, like max(nx.connected_components(G), key=len)
+                self._comp_derived["lcc"] = max(self._members.values(), key=len) if self._members else set()
+            return self._comp_derived["lcc"]
+
+    def lcc_view(self) -> nx.Graph:
+        """Largest component as a read-only subgraph view (the graph itself when connected), never copied."""
+        with self._lock:
+            self._ensure_components()
+            if "view" not in self._comp_derived:
+                G = self.store.load()
+                nodes = self.largest_component()
+                self._comp_derived["view"] = G if len(nodes) == G.number_of_nodes() else G.subgraph(nodes)
+            return self._comp_derived["view"]
+
+    def lcc_mask(self) -> np.ndarray:
+        """Boolean mask of the largest component over the store's CSR node indices."""
+        with self._lock:
+            self._ensure_components()
+            if "mask" not in self._comp_derived:
+                csr = self.store.csr()
+                mask = np.zeros(csr.n, dtype=bool)
+                mask[csr.indices_of(list(self.largest_component()))] = True
+                self._comp_derived["mask"] = mask
+            return self._comp_derived["mask"]
+
+    def articulation_points(self) -> List[int]:
+        with self._lock:
+            self._ensure_bridges()
+            if "art" not in self._sorted:
+                self._sorted["art"] = sorted(self._art)
+            return self._sorted["art"]
+
+    def bridges(self) -> List[Edge]:
+        with self._lock:
+            self._ensure_bridges()
+            if "bridges" not in self._sorted:
+                self._sorted["bridges"] = sorted(self._bridges)
+            return self._sorted["bridges"]
+
+    def core_numbers(self) -> Dict[int, int]:
+        with self._lock:
+            self._ensure_cores()
+            return self._core
+
+    def cores(self) -> CoreDecomposition:
+        """Core numbers, k-core / k-shell counts, onion layers and degeneracy order as arrays."""
+        with self._lock:
+            if not self.is_current("decomposition"):
+                t0 = time.time()
+                self._decomposition = CoreDecomposition(self.store.csr())
+                self._version["decomposition"] = self.store.version
+                self.compute_secs["decomposition"] = time.time() - t0
+            return self._decomposition
+
+    # FULL RECOMPUTATION
+    def _new_cid(self) -> int:
+        self._next_cid += 1
+        return self._next_cid - 1
+
+    def _ensure_components(self) -> None:
+        if self.is_current("components"):
+            return
+        t0 = time.time()
+        # one label pass over the sparse adjacency; labels follow node order
+        ids = np.asarray(self.store.csr().node_ids)
+        ncomp, labels = csgraph.connected_components(get_engine(self.store).adjacency(), directed=False)
+        order = np.argsort(labels, kind="stable")
+        bounds = np.searchsorted(labels[order], np.arange(ncomp + 1))
+        self._members = {c: set(ids[order[bounds[c]:bounds[c + 1]]].tolist()) for c in range(ncomp)}
+        self._comp = dict(zip(ids.tolist(), labels.tolist()))
+        self._next_cid = ncomp
+        self._comp_derived.clear()
+        self._version["components"] = self.store.version
+        self.compute_secs["components"] = time.time() - t0
+
+    def _ensure_bridges(self) -> None:
+        self._ensure_components()
+        if self.is_current("bridges"):
+            return
+        t0 = time.time()
+        G = self.store.load()
+        self._art = set(nx.articulation_points(G))
+        self._bridges = {_norm(u, v) for u, v in nx.bridges(G)}
+        self._sorted.clear()
+        self._version["bridges"] = self.store.version
+        self.compute_secs["bridges"] = time.time() - t0
+
+    def _ensure_cores(self) -> None:
+        if self.is_current("cores"):
+            return
+        t0 = time.time()
+        self._core = self.cores().as_dict()
+        self._version["cores"] = self.store.version
+        self.compute_secs["cores"] = time.time() - t0
+
+    # INCREMENTAL UPDATES
+    def _on_change(self, op: str, u: int, v: int, version: int) -> None:
+        with self._lock:
+            G = self.store.load()
+            prev = version - 1
+            comps = self._version["components"] == prev
+            bridges = comps and self._version["bridges"] == prev
+            cores = self._version["cores"] == prev
+
+            t0 = time.time()
+            if op == "add":
+                if bridges:
+                    self._bridges_add(G, u, v)  # needs the pre-merge components
+                if comps:
+                    self._components_add(u, v)
+                if cores:
+                    self._cores_add(G, u, v)
+            else:
+                was_bridge = (_norm(u, v) in self._bridges) if bridges else None
+                if comps:
+                    self._components_remove(G, u, v, was_bridge)
+                if bridges:
+                    self._bridges_remove(G, u, v, bool(was_bridge))
+                if cores:
+                    self._cores_remove(G, u, v)
+            dt = time.time() - t0
+
+            self._sorted.clear()
+            self._comp_derived.clear()
+            for name, ok in (("components", comps), ("bridges", bridges), ("cores", cores)):
+                if ok:
+                    self._version[name] = version
+                    self.compute_secs[name] = dt
+
+    def _components_add(self, u: int, v: int) -> None:
+        for x in (u, v):
+            if x not in self._comp:
+                cid = self._new_cid()
+                self._comp[x] = cid
+                self._members[cid] = {x}
+        cu, cv = self._comp[u], self._comp[v]
+        if cu == cv:
+            return
+        if len(self._members[cu]) < len(self._members[cv]):
+            cu, cv = cv, cu
+        moved = self._members.pop(cv)
+        for x in moved:
+            self._comp[x] = cu
+        self._members[cu] |= moved
+
+    def _components_remove(self, G: nx.Graph, u: int, v: int, was_bridge: bool | None) -> None:
+        if was_bridge is False:
+            return
+        side = _smaller_side(G, u, v)
+        if side is None:
+            return
+        old = self._comp[u]
+        cid = self._new_cid()
+        self._members[old] -= side
+        self._members[cid] = side
+        for x in side:
+            self._comp[x] = cid
+
+    def _recompute_bridges(self, G: nx.Graph, nodes: Set[int]) -> None:
+        # only the component that was touched is re-scanned
+        H = G.subgraph(nodes)
+        self._art.difference_update(nodes)
+        self._bridges = {e for e in self._bridges if e[0] not in nodes}
+        self._art.update(nx.articulation_points(H))
+        self._bridges.update(_norm(a, b) for a, b in nx.bridges(H))
+
+    def _bridges_add(self, G: nx.Graph, u: int, v: int) -> None:
+        cu, cv = self._comp.get(u), self._comp.get(v)
+        if cu is None or cv is None or cu != cv:
+            # joins two components: the new edge is a bridge and its endpoints
+            # become cut vertices if they had other neighbours
+            self._bridges.add(_norm(u, v))
+            for x in (u, v):
+                if G.degree(x) >= 2:
+                    self._art.add(x)
+            return
+        self._recompute_bridges(G, self._members[cu])
+
+    def _bridges_remove(self, G: nx.Graph, u: int, v: int, was_bridge: bool) -> None:
+        if was_bridge:
+            # no cycle used this edge, so only the endpoints can change status
+            self._bridges.discard(_norm(u, v))
+            for x in (u, v):
+                self._art.discard(x)
+                if _is_articulation(G, x):
+                    self._art.add(x)
+            return
+        self._recompute_bridges(G, self._members[self._comp[u]])
+
+    def _cores_add(self, G: nx.Graph, u: int, v: int) -> None:
+        # Sariyuce et al. subcore update: only nodes with core == K reachable
+        # from the lower endpoint through core == K nodes can gain one level.
+        core = self._core
+        for x in (u, v):
+            core.setdefault(x, 0)
+        K = min(core[u], core[v])
+        roots = [x for x in (u, v) if core[x] == K]
+
+        sub = set(roots)
+        stack = list(roots)
+        while stack:
+            w = stack.pop()
+            for x in G[w]:
+                if x not in sub and core[x] == K:
+                    sub.add(x)
+                    stack.append(x)
+
+        cd = {w: sum(1 for x in G[w] if core[x] >= K) for w in sub}
+        evict = [w for w in sub if cd[w] <= K]
+        gone: Set[int] = set()
+        while evict:
+            w = evict.pop()
+            if w in gone:
+                continue
+            gone.add(w)
+            for x in G[w]:
+                if x in sub and x not in gone:
+                    cd[x] -= 1
+                    if cd[x] <= K:
+                        evict.append(x)
+        for w in sub - gone:
+            core[w] = K + 1
+
+    def _cores_remove(self, G: nx.Graph, u: int, v: int) -> None:
+        # a removal lowers core numbers by at most one, starting at the endpoints
+        core = self._core
+        K = min(core[u], core[v])
+        cd: Dict[int, int] = {}
+
+        def cdeg(w: int) -> int:
+            if w not in cd:
+                cd[w] = sum(1 for x in G[w] if core[x] >= K)
+            return cd[w]
+
+        stack = [x for x in (u, v) if core[x] == K and cdeg(x) < K]
+        while stack:
+            w = stack.pop()
+            if core[w] != K:
+                continue
+            core[w] = K - 1
+            for x in G[w]:
+                if core[x] != K:
+                    continue
+                if x in cd:
+                    cd[x] -= 1
+                elif cdeg(x) >= K:
+                    continue
+                if cd[x] < K:
+                    stack.append(x)
+
+
+_INDEXES: Dict[int, GraphIndex] = {}
+on_release(lambda store: _INDEXES.pop(id(store), None))
+
+
+def get_index(store: GraphStore | None = None) -> GraphIndex:
+    store = store or get_store()
+    idx = _INDEXES.get(id(store))
+    if idx is None or idx.store is not store:
+        idx = GraphIndex(store)
+        _INDEXES[id(store)] = idx
+    return idx
@@ -1,45 +1,668 @@
-from __future__ import annotations
-
-from dataclasses import dataclass
-from pathlib import Path
-import networkx as nx
-
-
-@dataclass
-class GraphStore:
-    data_path: Path
-    _G: nx.Graph | None = None
-
-    def load(self) -> nx.Graph:
-        if self._G is not None:
-            return self._G
-
-        if not self.data_path.exists():
-            raise FileNotFoundError(
-                f"Graph file not found at: {self.data_path}. "
-                f"Put facebook_combined.txt under /data."
-            )
-
-        G = nx.Graph()
-        # facebook_combined.txt.gz: κάθε γραμμή "u v"
-        with open(self.data_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                a, b = line.split()
-                G.add_edge(int(a), int(b))
-
-        self._G = G
-        return self._G
-
-
-_STORE: GraphStore | None = None
-
-
-def get_store() -> GraphStore:
-    global _STORE
-    if _STORE is None:
-        root = Path(__file__).resolve().parent.parent  # sna_project2_agentic/
-        _STORE = GraphStore(data_path=root / "data" / "facebook_combined.txt")
-    return _STORE
+from __future__ import annotations
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+import threading
+from typing import Any, Callable, Dict, IO, Iterator, List, Tuple
+
+from .lazy_imports import lazy_module
+
+nx = lazy_module("networkx")
+np = lazy_module("numpy")
+
+
+SNAPSHOT_FORMAT = 1
+# memory budget estimate for an nx.Graph: 500 bytes per node, 220 per edge; on the safe
+# side of facebook_combined under tracemalloc (~200 per node, ~140 per edge), leaving room for attributes
+NX_NODE_BYTES = 500
+NX_EDGE_BYTES = 220
+_SNAPSHOT_ARRAYS = ("indptr", "indices", "node_ids", "edges")
+
+
+@dataclass
+class CSRGraph:
+    """
+    Compact undirected adjacency.
+
+    Nodes are numbered 0..n-1 in first-appearance order of the edge list
+    (the same order nx.Graph would have), `node_ids[i]` is the original id.
+    `edges` keeps the de-duplicated edges in input order, and each row of the
+    CSR lists neighbours in that order too, so the networkx graph built from
+    it iterates exactly like the one built by parsing the file.
+    """
+    indptr: np.ndarray
+    indices: np.ndarray
+    node_ids: np.ndarray
+    edges: np.ndarray
+    _order: np.ndarray | None = field(default=None, repr=False)
+    _sorted_ids: np.ndarray | None = field(default=None, repr=False)
+
+    @property
+    def n(self) -> int:
+        return int(self.node_ids.shape[0])
+
+    @property
+    def m(self) -> int:
+        return int(self.edges.shape[0])
+
+    def degrees(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def neighbors(self, i: int) -> np.ndarray:
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def indices_of(self, nodes: Any) -> np.ndarray:
+        """Map original node ids to CSR indices (-1 for unknown ids)."""
+        ids = np.asarray(nodes, dtype=np.int64)
+        if self.n == 0:
+            return np.full(ids.shape, -1, dtype=np.int64)
+        if self._order is None:
+            self._order = np.argsort(self.node_ids, kind="stable")
+            self._sorted_ids = self.node_ids[self._order]
+        pos = np.clip(np.searchsorted(self._sorted_ids, ids), 0, self.n - 1)
+        return np.where(self._sorted_ids[pos] == ids, self._order[pos], -1)
+
+    def index_of(self, node: Any) -> int:
+        return int(self.indices_of([node])[0])
+
+    def to_networkx(self) -> nx.Graph:
+        G = nx.Graph()
+        G.add_nodes_from(self.node_ids.tolist())
+        G.add_edges_from(self.node_ids[self.edges].tolist())
+        return G
+
+
+# bytes of text parsed per chunk; peak memory of parsing is a few times this
+PARSE_CHUNK_BYTES = 16 * 1024 * 1024
+_COMMENT_PREFIXES = (b"#", b"%")
+
+
+def _open_edge_list(path: Path) -> IO[bytes]:
+    f = open(path, "rb")
+    if f.read(2) == b"\x1f\x8b":  # gzip magic, whatever the file is called
+        f.close()
+        return gzip.open(path, "rb")
+    f.seek(0)
+    return f
+
+
+def _strip_comments(data: bytes) -> bytes:
+    if b"#" not in data and b"%" not in data:
+        return data
+    return b"\n".join(
+        line for line in data.split(b"\n") if not line.lstrip().startswith(_COMMENT_PREFIXES)
+    )
+
+
+def _parse_chunk(data: bytes, cols: int, path: Path) -> np.ndarray:
+    """(k, 2) int64 ids of a block of `cols`-column lines; only the first two columns must be integers."""
+    lines = data.count(b"\n") + (not data.endswith(b"\n"))
+    # weights or timestamps may be floats: then read everything as float64
+    # and check the ids, which are exact below 2**53
+    dtype = np.int64 if cols == 2 else np.float64
+    try:
+        values = np.fromstring(data, dtype=dtype, sep=" ")  # any whitespace, tabs included
+    except ValueError:
+        values = None
+    if values is not None and values.size == lines * cols:
+        ids = values.reshape(lines, cols)[:, :2]
+        if cols == 2:
+            return ids
+        if np.all(np.floor(ids) == ids) and np.all(np.abs(ids) < 2**53):
+            return ids.astype(np.int64)
+    # blank lines or bad rows: slower path that reports what is wrong
+    rows = [line.split() for line in data.split(b"\n") if line.strip()]
+    if any(len(r) != cols for r in rows):
+        raise ValueError(f"Malformed edge list {path}: expected {cols} columns on every line.")
+    try:
+        return np.array([r[:2] for r in rows], dtype=np.int64).reshape(-1, 2)
+    except ValueError:
+        raise ValueError(f"Malformed edge list {path}: node ids must be integers.")
+
+
+def iter_edge_chunks(path: Path, chunk_bytes: int = PARSE_CHUNK_BYTES) -> Iterator[np.ndarray]:
+    """
+    Stream an edge list as (k, 2) int64 arrays of (u, v) rows.
+
+    Plain or gzip text, "u v" / "u\tv" per line, with '#' or '%' comment
+    lines (SNAP and KONECT headers). Extra columns such as weights or
+    timestamps are dropped. Only one chunk of text is held at a time.
+    """
+    cols = 0
+    tail = b""
+    with _open_edge_list(Path(path)) as f:
+        while True:
+            block = f.read(chunk_bytes)
+            data = tail + block
+            if block:
+                cut = data.rfind(b"\n") + 1
+                data, tail = data[:cut], data[cut:]
+            else:
+                tail = b""
+            data = _strip_comments(data)
+            if data.strip():
+                if not cols:
+                    cols = len(data.lstrip().split(b"\n", 1)[0].split())
+                    if cols < 2:
+                        raise ValueError(f"Malformed edge list {path}: a line has a single node id.")
+                yield _parse_chunk(data, cols, path)
+            if not block:
+                return
+
+
+def _parse_edge_list(path: Path, chunk_bytes: int = PARSE_CHUNK_BYTES) -> np.ndarray:
+    """Flat [u0, v0, u1, v1, ...] array of a (possibly gzipped) edge list."""
+    chunks = [c.ravel() for c in iter_edge_chunks(path, chunk_bytes)]
+    return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int64)
+
+
+def _compact_ids(flat: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Number node ids 0..n-1 in first-appearance order.
+    Returns (node_ids, compacted flat array).
+    """
+    if flat.size == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    lo = int(flat.min())
+    span = int(flat.max()) - lo + 1
+    if span <= 4 * flat.size + (1 << 20):
+        # ids are dense enough (SNAP style): direct lookup tables, no sort of the edge list
+        first = np.full(span, flat.size, dtype=np.int64)
+        np.minimum.at(first, flat - lo, np.arange(flat.size, dtype=np.int64))
+        present = np.flatnonzero(first < flat.size)
+        node_ids = present[np.argsort(first[present], kind="stable")]
+        rank = np.empty(span, dtype=np.int64)
+        rank[node_ids] = np.arange(node_ids.shape[0], dtype=np.int64)
+        return node_ids + lo, rank[flat - lo]
+
+    uniq, first, inverse = np.unique(flat, return_index=True, return_inverse=True)
+    order = np.argsort(first, kind="stable")
+    rank = np.empty(uniq.shape[0], dtype=np.int64)
+    rank[order] = np.arange(uniq.shape[0], dtype=np.int64)
+    return uniq[order], rank[inverse.ravel()]
+
+
+def _first_of_each(keys: np.ndarray) -> np.ndarray:
+    """Sorted positions of the first occurrence of every distinct key."""
+    if keys.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    order = np.argsort(keys)
+    sk = keys[order]
+    starts = np.flatnonzero(np.concatenate(([True], sk[1:] != sk[:-1])))
+    # the sort is not stable, so take the smallest position in every run
+    keep = np.minimum.reduceat(order, starts)
+    keep.sort()
+    return keep
+
+
+def build_csr(flat: np.ndarray) -> CSRGraph:
+    """Build a CSRGraph from a flat [u0, v0, u1, v1, ...] array of node ids."""
+    flat = np.asarray(flat, dtype=np.int64).ravel()
+    node_ids, compact = _compact_ids(flat)
+    n = int(node_ids.shape[0])
+    idx_dtype = np.int32 if n < 2**31 else np.int64
+    pairs = compact.reshape(-1, 2)
+
+    # undirected de-duplication, keeping the first occurrence of every edge
+    lo = np.minimum(pairs[:, 0], pairs[:, 1])
+    hi = np.maximum(pairs[:, 0], pairs[:, 1])
+    keep = _first_of_each(lo * max(n, 1) + hi)
+    edges = pairs[keep].astype(idx_dtype)
+
+    a, b = edges[:, 0], edges[:, 1]
+    src = np.column_stack((a, b)).ravel()
+    dst = np.column_stack((b, a)).ravel()
+    mirror = np.zeros(src.shape[0], dtype=bool)
+    mirror[1::2] = a == b  # a self-loop is listed once, like nx.Graph
+    src, dst = src[~mirror], dst[~mirror]
+
+    perm = np.argsort(src, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+
+    return CSRGraph(
+        indptr=indptr,
+        indices=dst[perm].astype(idx_dtype),
+        node_ids=node_ids,
+        edges=edges,
+    )
+
+
+def csr_from_networkx(G: nx.Graph) -> CSRGraph:
+    """CSR view of an in-memory graph; rows follow G's node and adjacency order."""
+    n = G.number_of_nodes()
+    idx_dtype = np.int32 if n < 2**31 else np.int64
+    index = {u: i for i, u in enumerate(G)}
+    node_ids = np.fromiter(G, dtype=np.int64, count=n)
+    deg = np.fromiter((len(G[u]) for u in G), dtype=np.int64, count=n)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(deg, out=indptr[1:])
+    indices = np.fromiter((index[v] for u in G for v in G[u]), dtype=idx_dtype, count=int(indptr[-1]))
+    edges = np.fromiter(
+        (index[x] for e in G.edges() for x in e), dtype=idx_dtype, count=2 * G.number_of_edges()
+    ).reshape(-1, 2)
+    return CSRGraph(indptr=indptr, indices=indices, node_ids=node_ids, edges=edges)
+
+
+def _file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+@dataclass
+class GraphStore:
+    data_path: Path
+    snapshot_dir: Path | None = None
+    use_snapshot: bool = True
+    _G: nx.Graph | None = None
+    _csr: CSRGraph | None = None
+    _source_sha256: str | None = None
+    version: int = 0
+    _mutation_digest: str = ""
+    _listeners: List[Callable[[str, int, int, int], None]] = field(default_factory=list, repr=False)
+    # tools run on worker threads: the first load must happen once
+    _lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+
+    def __post_init__(self) -> None:
+        self.data_path = Path(self.data_path)
+        if self.snapshot_dir is None:
+            self.snapshot_dir = self.data_path.parent / ".cache" / f"{self.data_path.name}.csr"
+        self.snapshot_dir = Path(self.snapshot_dir)
+
+    def load(self) -> nx.Graph:
+        if self._G is not None:
+            return self._G
+
+        with self._lock:
+            if self._G is None:
+                # the dict-of-dicts graph is only materialized for tools that need it
+                self._G = self.csr().to_networkx()
+            return self._G
+
+    def csr(self) -> CSRGraph:
+        if self._csr is not None:
+            return self._csr
+        with self._lock:
+            return self._csr if self._csr is not None else self._build_csr()
+
+    def _build_csr(self) -> CSRGraph:
+        if self.version > 0:
+            # mutated at runtime: the snapshot describes the file, not this graph
+            self._csr = csr_from_networkx(self.load())
+            return self._csr
+
+        if not self.data_path.exists():
+            raise FileNotFoundError(
+                f"Graph file not found at: {self.data_path}. "
+                f"Put facebook_combined.txt under /data."
+            )
+
+        if self.use_snapshot:
+            self._csr = self._load_snapshot()
+        if self._csr is None:
+            self._source_sha256 = _file_sha256(self.data_path)
+            self._csr = build_csr(_parse_edge_list(self.data_path))
+            if self.use_snapshot:
+                self._write_snapshot(self._csr)
+        return self._csr
+
+    @property
+    def source_sha256(self) -> str:
+        if self._source_sha256 is None:
+            self.csr()
+        if self._source_sha256 is None:
+            self._source_sha256 = _file_sha256(self.data_path)
+        return self._source_sha256
+
+    def fingerprint(self) -> str:
+        """Identity of the loaded graph (dataset + applied edits), used to key cached analyses."""
+        if self.version == 0:
+            return f"sha256:{self.source_sha256}"
+        return f"sha256:{self.source_sha256}+{self._mutation_digest}"
+
+    # MEMORY
+    def loaded(self) -> bool:
+        return self._csr is not None or self._G is not None
+
+    def nbytes(self) -> int:
+        """Rough resident size: CSR arrays plus an estimate for the networkx graph."""
+        total = 0
+        if self._csr is not None:
+            total += sum(getattr(self._csr, name).nbytes for name in _SNAPSHOT_ARRAYS)
+        if self._G is not None:
+            total += NX_NODE_BYTES * self._G.number_of_nodes() + NX_EDGE_BYTES * self._G.number_of_edges()
+        return total
+
+    def shape(self) -> Tuple[int, int] | None:
+        """(nodes, edges) of what is loaded, without loading or rebuilding anything."""
+        if self._csr is not None:
+            return self._csr.n, self._csr.m
+        G = self._G
+        if G is not None:
+            return G.number_of_nodes(), G.number_of_edges()
+        return None
+
+    def release(self, keep_graph: bool = False) -> None:
+        """
+        Drop everything derived from the graph (indexes, engines, ...) and,
+        unless `keep_graph`, the loaded graph itself.
+        """
+        for hook in list(_RELEASE_HOOKS):
+            hook(self)
+        if not keep_graph:
+            self._G = None
+            self._csr = None
+
+    # MUTATION
+    def subscribe(self, listener: Callable[[str, int, int, int], None]) -> None:
+        """Register listener(op, u, v, version), called after every edit."""
+        self._listeners.append(listener)
+
+    def add_edge(self, u: int, v: int) -> bool:
+        G = self.load()
+        u, v = int(u), int(v)
+        if u == v:
+            raise ValueError("Self-loops are not supported.")
+        if G.has_edge(u, v):
+            return False
+        G.add_edge(u, v)
+        self._changed("add", u, v)
+        return True
+
+    def remove_edge(self, u: int, v: int) -> bool:
+        G = self.load()
+        u, v = int(u), int(v)
+        if not G.has_edge(u, v):
+            return False
+        G.remove_edge(u, v)
+        self._changed("remove", u, v)
+        return True
+
+    def _changed(self, op: str, u: int, v: int) -> None:
+        a, b = (u, v) if u <= v else (v, u)
+        self.version += 1
+        self._mutation_digest = hashlib.sha1(
+            f"{self._mutation_digest}|{op}:{a}-{b}".encode("utf-8")
+        ).hexdigest()
+        self._csr = None
+        for listener in list(self._listeners):
+            listener(op, u, v, self.version)
+
+    # SNAPSHOT
+    def _source_stat(self) -> Dict[str, Any]:
+        st = self.data_path.stat()
+        return {"size": int(st.st_size), "mtime_ns": int(st.st_mtime_ns)}
+
+    def _read_meta(self) -> Dict[str, Any] | None:
+        try:
+            with open(self.snapshot_dir / "meta.json", "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get("format") != SNAPSHOT_FORMAT:
+            return None
+        if not all((self.snapshot_dir / f"{name}.npy").exists() for name in _SNAPSHOT_ARRAYS):
+            return None
+        return meta
+
+    def _write_meta(self, meta: Dict[str, Any]) -> None:
+        tmp = self.snapshot_dir / "meta.json.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp, self.snapshot_dir / "meta.json")
+
+    def _load_snapshot(self) -> CSRGraph | None:
+        meta = self._read_meta()
+        if meta is None:
+            return None
+
+        stat = self._source_stat()
+        if meta.get("size") != stat["size"] or meta.get("mtime_ns") != stat["mtime_ns"]:
+            # touched or replaced: only a content change forces a rebuild
+            sha = _file_sha256(self.data_path)
+            if sha != meta.get("sha256"):
+                return None
+            meta.update(stat)
+            try:
+                self._write_meta(meta)
+            except OSError:
+                pass
+
+        try:
+            arrays = {
+                name: np.load(self.snapshot_dir / f"{name}.npy", mmap_mode="r")
+                for name in _SNAPSHOT_ARRAYS
+            }
+        except (OSError, ValueError):
+            return None
+
+        self._source_sha256 = meta["sha256"]
+        return CSRGraph(**arrays)
+
+    def _write_snapshot(self, csr: CSRGraph) -> None:
+        try:
+            self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+            # meta.json is written last and acts as the commit marker
+            (self.snapshot_dir / "meta.json").unlink(missing_ok=True)
+            for name in _SNAPSHOT_ARRAYS:
+                tmp = self.snapshot_dir / f"{name}.tmp.npy"
+                np.save(tmp, np.ascontiguousarray(getattr(csr, name)))
+                os.replace(tmp, self.snapshot_dir / f"{name}.npy")
+            self._write_meta({
+                "format": SNAPSHOT_FORMAT,
+                "source": self.data_path.name,
+                "sha256": self._source_sha256,
+                "nodes": csr.n,
+                "edges": csr.m,
+                **self._source_stat(),
+            })
+        except OSError:
+            # read-only data dir: keep working from the in-memory arrays
+            pass
+
+
+# RELEASE
+# Modules that keep per-store state (indexes, engines, oracles) register a hook
+# that forgets it, so evicting a dataset actually frees its memory.
+_RELEASE_HOOKS: List[Callable[[GraphStore], None]] = []
+
+
+def on_release(hook: Callable[[GraphStore], None]) -> None:
+    _RELEASE_HOOKS.append(hook)
+
+
+# DATASETS
+EDGE_LIST_SUFFIXES = (".txt", ".tsv", ".csv", ".edges", ".el")
+
+
+def _dataset_name(path: Path) -> str:
+    name = path.name
+    if name.endswith(".gz"):
+        name = name[:-3]
+    for suffix in EDGE_LIST_SUFFIXES:
+        if name.endswith(suffix):
+            return name[: -len(suffix)]
+    return name
+
+
+class DatasetRegistry:
+    """
+    Named edge-list datasets with at most a `memory_budget` of loaded graphs.
+
+    Stores are created on first use and kept in LRU order; whenever the loaded
+    ones together exceed the budget, the least recently used are released
+    (the active dataset and datasets with runtime edits are never evicted).
+    Reloading an evicted dataset comes from its CSR snapshot, so it is cheap.
+    """
+
+    def __init__(self, memory_budget: int, default: str | None = None):
+        self.memory_budget = memory_budget
+        self.active = default
+        self.evictions = 0
+        self._paths: Dict[str, Path] = {}
+        self._stores: "OrderedDict[str, GraphStore]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def register(self, name: str, path: Path | str) -> None:
+        with self._lock:
+            path = Path(path)
+            if name in self._stores and self._stores[name].data_path != path:
+                self._stores.pop(name).release()
+            self._paths[name] = path
+            if self.active is None:
+                self.active = name
+
+    def discover(self, data_dir: Path | str) -> None:
+        """Register every edge list found in `data_dir` under its file name without extensions."""
+        data_dir = Path(data_dir)
+        if not data_dir.is_dir():
+            return
+        for path in sorted(data_dir.iterdir()):
+            if path.is_file() and _dataset_name(path) != path.name:
+                self._paths.setdefault(_dataset_name(path), path)
+        if self.active is None and self._paths:
+            self.active = next(iter(self._paths))
+
+    def names(self) -> List[str]:
+        return list(self._paths)
+
+    def get(self, name: str | None = None) -> GraphStore:
+        with self._lock:
+            name = name or self.active
+            if name not in self._paths:
+                raise KeyError(f"Unknown dataset {name!r}; known: {', '.join(self._paths) or 'none'}.")
+            store = self._stores.get(name)
+            if store is None:
+                store = GraphStore(data_path=self._paths[name])
+                self._stores[name] = store
+            self._stores.move_to_end(name)
+            self._enforce_budget(keep=name)
+            return store
+
+    def use(self, name: str, activate: bool = True) -> GraphStore:
+        """Load `name`, and make it the active dataset (the default of get_store()) unless not `activate`."""
+        with self._lock:
+            store = self.get(name)
+            if activate:
+                self.active = name
+        store.csr()
+        with self._lock:
+            self._enforce_budget(keep=name)
+        return store
+
+    def memory_bytes(self) -> int:
+        with self._lock:
+            return sum(s.nbytes() for s in self._stores.values())
+
+    def _enforce_budget(self, keep: str) -> None:
+        total = sum(s.nbytes() for s in self._stores.values())
+        for name in list(self._stores):
+            if total <= self.memory_budget:
+                break
+            store = self._stores[name]
+            if name in (keep, self.active) or store.version > 0 or not store.loaded():
+                continue
+            total -= store.nbytes()
+            del self._stores[name]
+            store.release()
+            self.evictions += 1
+
+    def stats(self, active: str | None = None) -> List[Dict[str, Any]]:
+        active = active or self.active
+        with self._lock:
+            return [
+                {
+                    "name": name,
+                    "path": str(path),
+                    "active": name == active,
+                    "loaded": name in self._stores and self._stores[name].loaded(),
+                    "memory_mb": round(self._stores[name].nbytes() / 2**20, 1) if name in self._stores else 0.0,
+                    "edited": name in self._stores and self._stores[name].version > 0,
+                }
+                for name, path in self._paths.items()
+            ]
+
+
+_REGISTRY: DatasetRegistry | None = None
+
+
+def get_registry() -> DatasetRegistry:
+    """
+    Datasets: every edge list under data/, plus SNA_DATASETS entries
+    ("name=path" separated by os.pathsep). SNA_DATASET picks the active one
+    (a name or a file path; facebook_combined by default), and
+    SNA_MEMORY_BUDGET_MB caps the memory of loaded graphs.
+    """
+    global _REGISTRY
+    if _REGISTRY is None:
+        root = Path(__file__).resolve().parent.parent  # sna_project2_agentic/
+        registry = DatasetRegistry(
+            memory_budget=int(float(os.environ.get("SNA_MEMORY_BUDGET_MB", "2048")) * 1024 * 1024),
+        )
+        registry.register("facebook_combined", root / "data" / "facebook_combined.txt")
+        for entry in filter(None, os.environ.get("SNA_DATASETS", "").split(os.pathsep)):
+            name, sep, path = entry.partition("=")
+            if sep:
+                registry.register(name.strip(), path.strip())
+            else:
+                registry.register(_dataset_name(Path(entry)), entry)
+        registry.discover(root / "data")
+        active = os.environ.get("SNA_DATASET")
+        if active and active not in registry.names() and Path(active).is_file():
+            registry.register(_dataset_name(Path(active)), active)
+            active = _dataset_name(Path(active))
+        registry.active = active or registry.active
+        _REGISTRY = registry
+    return _REGISTRY
+
+
+# the store a running tool job was submitted against (see bind_store)
+_BOUND: ContextVar[GraphStore | None] = ContextVar("sna_bound_store", default=None)
+# the dataset of the chat session a tool call belongs to; the registry's active one otherwise
+_SESSION: ContextVar[str | None] = ContextVar("sna_session_dataset", default=None)
+
+
+def set_session_dataset(name: str | None) -> None:
+    """Set by the agent before each tool call, from the session state (None: no session)."""
+    _SESSION.set(name)
+
+
+def session_dataset() -> str | None:
+    return _SESSION.get()
+
+
+def current_dataset() -> str | None:
+    """Name of the dataset get_store() returns here: the session's, or the active one."""
+    return _SESSION.get() or get_registry().active
+
+
+@contextmanager
+def bind_store(store: GraphStore) -> Iterator[GraphStore]:
+    """Within the block, get_store() returns `store`, whatever dataset becomes active meanwhile."""
+    token = _BOUND.set(store)
+    try:
+        yield store
+    finally:
+        _BOUND.reset(token)
+
+
+def get_store(name: str | None = None) -> GraphStore:
+    """
+    The store of dataset `name`; by default the bound one (bind_store), else
+    the one of the current chat session, else of the active dataset.
+    """
+    if name is None:
+        bound = _BOUND.get()
+        if bound is not None:
+            return bound
+    return get_registry().get(name or _SESSION.get())
@@ -0,0 +1,489 @@
+"""
+Per-call instrumentation of the agent's tools.
+
+Every tool registered in agent.py runs through `instrumented`, which
+measures the call and
+  * adds a compact `_perf` block to the result (other results than dicts are
+    wrapped as {"result": ...} first, as ADK would), so it ends up in the
+    tool response and therefore in the saved session log:
+        {"wall": 0.412, "cpu": 0.398, "cache": "miss", "nodes": 4039, "edges": 88234, ...}
+  * folds it into per-tool histograms (`get_perf()`), exportable as JSON or
+    Prometheus text (`SNA_PERF_EXPORT=<path>` writes them at exit).
+
+Environment:
+    SNA_PERF_MEMORY     rss (default): peak RSS during the call above the RSS at its start, sampled
+                               every SAMPLE_INTERVAL (Linux; shorter spikes are missed; process
+                               wide, so overlapping calls see each other's memory)
+                        trace: peak Python/NumPy allocation via tracemalloc (slows Python-heavy tools;
+                               process wide, so overlapping calls see each other's allocations)
+                        off
+    SNA_PROFILE         sample: calls still running after SNA_PROFILE_SLOW_SECS get their stack
+                                sampled, written as collapsed stacks (flamegraph.pl / speedscope)
+                        cprofile: every call runs under cProfile; the stats of slow ones are kept
+    SNA_PROFILE_SLOW_SECS   threshold for keeping a profile (default 1.0)
+    SNA_PROFILE_DIR     where profiles go (default saved_sessions/profiles)
+
+    python -m sna_graph_chatbot.instrumentation saved_sessions/*.jsonl.gz [--prometheus] [--out FILE]
+
+rebuilds the histograms from the `_perf` blocks of logged sessions, i.e. from real traffic.
+"""
+from __future__ import annotations
+
+import argparse
+import atexit
+import bisect
+import cProfile
+from dataclasses import dataclass, field
+import functools
+import json
+import os
+from pathlib import Path
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from .graph_store import get_store
+
+# wall/CPU seconds; the last bucket is +Inf
+BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0,
+)
+SAMPLE_INTERVAL = 0.005
+
+MEMORY_MODE = os.environ.get("SNA_PERF_MEMORY", "rss").lower()
+PROFILE_MODE = os.environ.get("SNA_PROFILE", "").lower()
+PROFILE_SLOW_SECS = float(os.environ.get("SNA_PROFILE_SLOW_SECS", "1.0"))
+PROFILE_DIR = Path(os.environ.get("SNA_PROFILE_DIR", os.path.join("saved_sessions", "profiles")))
+
+
+@dataclass
+class Histogram:
+    """Fixed-bucket histogram (Prometheus style: `counts[i]` is the number of values <= BUCKETS[i])."""
+    counts: List[int] = field(default_factory=lambda: [0] * (len(BUCKETS) + 1))
+    total: float = 0.0
+    count: int = 0
+    max: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (the max for the +Inf bucket)."""
+        if self.count == 0:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank and c:
+                return min(BUCKETS[i], self.max) if i < len(BUCKETS) else self.max
+        return self.max
+
+    def cumulative(self) -> List[int]:
+        out, seen = [], 0
+        for c in self.counts:
+            seen += c
+            out.append(seen)
+        return out
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "max": round(self.max, 6),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": {_le(i): c for i, c in enumerate(self.cumulative())},
+        }
+
+
+def _le(i: int) -> str:
+    return f"{BUCKETS[i]:g}" if i < len(BUCKETS) else "+Inf"
+
+
+@dataclass
+class ToolStats:
+    wall: Histogram = field(default_factory=Histogram)
+    cpu: Histogram = field(default_factory=Histogram)
+    errors: int = 0
+    cache: Dict[str, int] = field(default_factory=dict)
+    peak_mb_max: float = 0.0
+    graph: Tuple[int, int] | None = None
+
+
+class PerfStats:
+    """Per-tool aggregates of the `_perf` blocks of every instrumented call."""
+
+    def __init__(self) -> None:
+        self.tools: Dict[str, ToolStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, tool: str, perf: Dict[str, Any]) -> None:
+        with self._lock:
+            st = self.tools.setdefault(tool, ToolStats())
+            st.wall.observe(float(perf.get("wall", 0.0)))
+            st.cpu.observe(float(perf.get("cpu", 0.0)))
+            if perf.get("error"):
+                st.errors += 1
+            if perf.get("cache"):
+                st.cache[perf["cache"]] = st.cache.get(perf["cache"], 0) + 1
+            mem = perf.get("peak_mb", perf.get("rss_mb"))
+            if mem is not None:
+                st.peak_mb_max = max(st.peak_mb_max, float(mem))
+            if "nodes" in perf:
+                st.graph = (int(perf["nodes"]), int(perf["edges"]))
+
+    def reset(self) -> None:
+        with self._lock:
+            self.tools.clear()
+
+    def to_json(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                tool: {
+                    "calls": st.wall.count,
+                    "errors": st.errors,
+                    "wall_secs": st.wall.to_json(),
+                    "cpu_secs": st.cpu.to_json(),
+                    "cache": dict(st.cache),
+                    "peak_mb_max": round(st.peak_mb_max, 2),
+                    "graph": list(st.graph) if st.graph else None,
+                }
+                for tool, st in sorted(self.tools.items())
+            }
+
+    def to_prometheus(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            tools = sorted(self.tools.items())
+            for metric, attr, what in (
+                ("sna_tool_duration_seconds", "wall", "Wall time"),
+                ("sna_tool_cpu_seconds", "cpu", "CPU time of the worker thread"),
+            ):
+                lines += [f"# HELP {metric} {what} of chatbot tool calls.", f"# TYPE {metric} histogram"]
+                for tool, st in tools:
+                    h: Histogram = getattr(st, attr)
+                    for i, c in enumerate(h.cumulative()):
+                        lines.append(f'{metric}_bucket{{tool="{tool}",le="{_le(i)}"}} {c}')
+                    lines.append(f'{metric}_sum{{tool="{tool}"}} {h.total:.6f}')
+                    lines.append(f'{metric}_count{{tool="{tool}"}} {h.count}')
+
+            lines += ["# HELP sna_tool_errors_total Tool calls that raised or returned an error.",
+                      "# TYPE sna_tool_errors_total counter"]
+            lines += [f'sna_tool_errors_total{{tool="{tool}"}} {st.errors}' for tool, st in tools]
+            lines += ["# HELP sna_tool_cache_lookups_total Result cache lookups by tier (memory, disk, miss).",
+                      "# TYPE sna_tool_cache_lookups_total counter"]
+            lines += [
+                f'sna_tool_cache_lookups_total{{tool="{tool}",result="{k}"}} {v}'
+                for tool, st in tools
+                for k, v in sorted(st.cache.items())
+            ]
+            lines += ["# HELP sna_tool_peak_memory_bytes Largest peak memory of a single call.",
+                      "# TYPE sna_tool_peak_memory_bytes gauge"]
+            lines += [f'sna_tool_peak_memory_bytes{{tool="{tool}"}} {int(st.peak_mb_max * 2**20)}' for tool, st in tools]
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: Path | str) -> None:
+        """Prometheus text for *.prom / *.txt, JSON otherwise."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        text = self.to_prometheus() if path.suffix in (".prom", ".txt") else json.dumps(self.to_json(), indent=2)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+_PERF: PerfStats | None = None
+
+
+def get_perf() -> PerfStats:
+    global _PERF
+    if _PERF is None:
+        _PERF = PerfStats()
+        export = os.environ.get("SNA_PERF_EXPORT")
+        if export:
+            atexit.register(_PERF.export, export)
+    return _PERF
+
+
+# PER-CALL CONTEXT
+@dataclass
+class _Call:
+    tool: str
+    thread_id: int
+    started: float
+    cache: str | None = None
+    rss0: float | None = None
+    rss_peak: float = 0.0
+    samples: Dict[str, int] = field(default_factory=dict)
+
+
+_local = threading.local()
+
+
+def note_cache(tier: str) -> None:
+    """Called by the result cache: "memory", "disk" or "miss". The outermost lookup of a call wins."""
+    call = getattr(_local, "call", None)
+    if call is not None and call.cache is None:
+        call.cache = tier
+
+
+# MEMORY
+_trace_lock = threading.Lock()
+_tracing = 0
+
+
+def _trace_start() -> None:
+    global _tracing
+    with _trace_lock:
+        if _tracing == 0:
+            tracemalloc.start()
+        else:
+            tracemalloc.reset_peak()
+        _tracing += 1
+
+
+def _trace_stop() -> float:
+    global _tracing
+    with _trace_lock:
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        _tracing -= 1
+        if _tracing == 0:
+            tracemalloc.stop()
+    return peak
+
+
+_PAGE_MB = (os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096) / 2**20
+
+
+def _rss_mb() -> float | None:
+    """Current resident set size, None where /proc is not available."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_MB
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _rss_note(call: _Call) -> None:
+    rss = _rss_mb()
+    if rss is not None:
+        call.rss_peak = max(call.rss_peak, rss)
+
+
+# SAMPLING
+class _Sampler:
+    """
+    One daemon thread that, every SAMPLE_INTERVAL, updates the peak RSS of
+    the running calls that measure it and records the stack of each call
+    that has been running for PROFILE_SLOW_SECS or more (SNA_PROFILE=sample).
+    Fast calls are never profiled, so that costs nothing until a call is slow.
+    """
+
+    def __init__(self) -> None:
+        self.active: Dict[int, _Call] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def add(self, call: _Call) -> None:
+        with self._lock:
+            self.active[id(call)] = call
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="sna-profiler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def remove(self, call: _Call) -> None:
+        with self._lock:
+            self.active.pop(id(call), None)
+
+    def _loop(self) -> None:
+        while True:
+            if not self.active:
+                self._wake.wait()  # idle until the next call starts
+                self._wake.clear()
+                continue
+            time.sleep(SAMPLE_INTERVAL)
+            now = time.perf_counter()
+            with self._lock:
+                calls = list(self.active.values())
+            measured = [c for c in calls if c.rss0 is not None]
+            rss = _rss_mb() if measured else None
+            if rss is not None:
+                for call in measured:
+                    call.rss_peak = max(call.rss_peak, rss)
+            if PROFILE_MODE != "sample":
+                continue
+            slow = [c for c in calls if now - c.started >= PROFILE_SLOW_SECS]
+            if not slow:
+                continue
+            frames = sys._current_frames()
+            for call in slow:
+                frame = frames.get(call.thread_id)
+                if frame is not None:
+                    stack = _collapse(frame)
+                    call.samples[stack] = call.samples.get(stack, 0) + 1
+
+
+def _collapse(frame: Any) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{Path(code.co_filename).stem}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+_SAMPLER = _Sampler()
+
+
+def _profile_path(tool: str, suffix: str) -> Path:
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return PROFILE_DIR / f"{tool}_{stamp}_{threading.get_ident()}{suffix}"
+
+
+def _write_samples(call: _Call) -> str:
+    path = _profile_path(call.tool, ".folded")
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, n in sorted(call.samples.items(), key=lambda kv: -kv[1]):
+            f.write(f"{stack} {n}\n")
+    return str(path)
+
+
+# WRAPPER
+def _graph_shape() -> Tuple[int, int] | None:
+    try:
+        return get_store().shape()
+    except Exception:
+        return None
+
+
+def instrumented(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Measure every call of `fn` (wall and thread CPU time, memory, result
+    cache tier, graph size), record it in `get_perf()` and attach it as
+    `_perf` to the result, wrapping anything but a dict as {"result": ...}.
+    The signature is unchanged.
+    """
+    tool = fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        call = _Call(tool, threading.get_ident(), time.perf_counter())
+        outer, _local.call = getattr(_local, "call", None), call
+        memory = MEMORY_MODE
+        if memory == "trace":
+            _trace_start()
+        elif memory == "rss":
+            call.rss0 = _rss_mb()
+            if call.rss0 is None:
+                memory = "off"
+            else:
+                call.rss_peak = call.rss0
+        profiler = cProfile.Profile() if PROFILE_MODE == "cprofile" else None
+        sampled = PROFILE_MODE == "sample" or memory == "rss"
+        if sampled:
+            _SAMPLER.add(call)
+        cpu0 = time.thread_time()
+
+        result: Any = None
+        error: BaseException | None = None
+        try:
+            if profiler is not None:
+                result = profiler.runcall(fn, *args, **kwargs)
+            else:
+                result = fn(*args, **kwargs)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            cpu = time.thread_time() - cpu0
+            wall = time.perf_counter() - call.started
+            _local.call = outer
+            perf: Dict[str, Any] = {"wall": round(wall, 4), "cpu": round(cpu, 4)}
+            if memory == "trace":
+                perf["peak_mb"] = round(_trace_stop(), 2)
+            elif memory == "rss":
+                _rss_note(call)
+                perf["rss_mb"] = round(call.rss_peak - call.rss0, 2)
+            if call.cache is not None:
+                perf["cache"] = call.cache
+            shape = _graph_shape()
+            if shape is not None:
+                perf["nodes"], perf["edges"] = shape
+            if error is not None or (isinstance(result, dict) and "error" in result):
+                perf["error"] = True
+
+            if sampled:
+                _SAMPLER.remove(call)
+            try:
+                if call.samples:
+                    perf["profile"] = _write_samples(call)
+                elif profiler is not None and wall >= PROFILE_SLOW_SECS:
+                    path = _profile_path(tool, ".prof")
+                    profiler.dump_stats(path)
+                    perf["profile"] = str(path)
+            except OSError:
+                pass  # a profile that cannot be written must not cost the user the answer
+
+            get_perf().record(tool, perf)
+            if error is None:
+                if not isinstance(result, dict):
+                    result = {"result": result}
+                result["_perf"] = perf
+        return result
+
+    return wrapper
+
+
+# LOGGED SESSIONS
+def iter_logged_perf(session: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """(tool, _perf) of every tool response in a session as read_session returns it."""
+    for event in session.get("events", []):
+        for part in (event.get("content") or {}).get("parts") or []:
+            response = part.get("function_response")
+            if not response:
+                continue
+            body = response.get("response")
+            if isinstance(body, dict) and "_perf" not in body:
+                body = body.get("result")  # logs from before non-dict results carried _perf
+            perf = body.get("_perf") if isinstance(body, dict) else None
+            if isinstance(perf, dict):
+                yield response.get("name", "?"), perf
+
+
+def main() -> None:
+    from .session_log import read_session
+
+    ap = argparse.ArgumentParser(description="Per-tool timing histograms from logged sessions")
+    ap.add_argument("paths", nargs="+", type=Path, help="session logs (*.jsonl.gz)")
+    ap.add_argument("--prometheus", action="store_true", help="print Prometheus text instead of a table")
+    ap.add_argument("--out", type=Path, help="also export to this file (.prom/.txt: Prometheus, else JSON)")
+    args = ap.parse_args()
+
+    stats = PerfStats()
+    for path in args.paths:
+        for tool, perf in iter_logged_perf(read_session(path)):
+            stats.record(tool, perf)
+
+    if args.prometheus:
+        print(stats.to_prometheus(), end="")
+    else:
+        rows = sorted(stats.to_json().items(), key=lambda kv: -kv[1]["wall_secs"]["sum"])
+        print(f"{'tool':<26} {'calls':>6} {'errors':>6} {'total s':>9} {'p50 s':>8} {'p95 s':>8} {'max s':>8}  cache")
+        for tool, st in rows:
+            w = st["wall_secs"]
+            cache = ", ".join(f"{k}={v}" for k, v in sorted(st["cache"].items()))
+            print(f"{tool:<26} {st['calls']:>6} {st['errors']:>6} {w['sum']:9.3f} {w['p50']:8.3f} "
+                  f"{w['p95']:8.3f} {w['max']:8.3f}  {cache}")
+    if args.out is not None:
+        stats.export(args.out)
+
+
+if __name__ == "__main__":
+    main()
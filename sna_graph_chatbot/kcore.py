@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple
+
+from .lazy_imports import lazy_module
+from .distance_oracle import expand
+from .graph_store import CSRGraph
+
+np = lazy_module("numpy")
+
+
+def peel(indptr: np.ndarray, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Core decomposition by bucket peeling (Batagelj & Zaversnik), one bucket
+    level at a time: at level k, every remaining node of degree <= k is
+    removed in one vectorized round, its neighbours' degrees drop, and those
+    that fall to <= k form the next round. The rounds touch each node and
+    each adjacency entry once, O(n + m); starting a level also rescans the
+    nodes still left, so the worst case is O(m + n * degeneracy). On social
+    graphs most nodes go at the low levels and those scans stay about n + m
+    in total (Facebook: 105k scanned for n + m = 92k).
+
+    Returns (core, order, layer) over CSR indices:
+        core    core number of every node
+        order   degeneracy (smallest-last) ordering: each node has at most
+                `degeneracy` neighbours later in it
+        layer   onion layer (Hebert-Dufresne et al. 2016): the peeling round,
+                numbered from 1 across all levels
+    """
+    n = len(indptr) - 1
+    deg = np.diff(indptr).astype(np.int64)
+    alive = np.ones(n, dtype=bool)
+    core = np.zeros(n, dtype=np.int32)
+    layer = np.zeros(n, dtype=np.int32)
+    order = np.empty(n, dtype=np.int64)
+
+    rest = np.arange(n, dtype=np.int64)  # compacted once per level, not per round
+    frontier = rest[:0]
+    pos, rounds, k = 0, 0, 0
+    while pos < n:
+        if frontier.size == 0:
+            rest = rest[alive[rest]]
+            k = max(k, int(deg[rest].min()))
+            frontier = rest[deg[rest] <= k]
+
+        rounds += 1
+        core[frontier] = k
+        layer[frontier] = rounds
+        alive[frontier] = False
+        order[pos:pos + frontier.size] = frontier
+        pos += frontier.size
+
+        nb, _ = expand(indptr, indices, frontier)
+        nb, hits = np.unique(nb[alive[nb]], return_counts=True)
+        deg[nb] -= hits
+        frontier = nb[deg[nb] <= k].astype(np.int64)
+    return core, order, layer
+
+
+class CoreDecomposition:
+    """
+    Core numbers of a CSR graph as an int array, plus per-level node and edge
+    counts, so k-core / k-shell sizes and the core-size distribution are
+    answered by lookups instead of building subgraphs.
+
+        k-core   nodes with core >= k; its edges are those whose endpoints both are
+        k-shell  nodes with core == k; its edges join two such nodes
+    """
+
+    def __init__(self, csr: CSRGraph):
+        self.csr = csr
+        indptr, indices = np.asarray(csr.indptr), np.asarray(csr.indices)
+        self.core, self.order, self.layer = peel(indptr, indices)
+        self.degeneracy = int(self.core.max()) if csr.n else 0
+        self.layers = int(self.layer.max()) if csr.n else 0
+
+        levels = self.degeneracy + 2
+        edges = np.asarray(csr.edges)
+        cu, cv = self.core[edges[:, 0]], self.core[edges[:, 1]]
+        # counts per level; the k-core ones are suffix sums (index degeneracy + 1 is the empty core)
+        self.shell_nodes = np.bincount(self.core, minlength=levels)
+        self.shell_edges = np.bincount(cu[cu == cv], minlength=levels)
+        self.core_nodes = np.cumsum(self.shell_nodes[::-1])[::-1]
+        self.core_edges = np.cumsum(np.bincount(np.minimum(cu, cv), minlength=levels)[::-1])[::-1]
+
+    @property
+    def n(self) -> int:
+        return self.csr.n
+
+    def _level(self, k: int) -> int:
+        return min(max(int(k), 0), self.degeneracy + 1)
+
+    # QUERIES
+    def k_core(self, k: int) -> Dict[str, int]:
+        i = self._level(k)
+        return {"nodes": int(self.core_nodes[i]), "edges": int(self.core_edges[i])}
+
+    def k_shell(self, k: int) -> Dict[str, int]:
+        if k < 0 or k > self.degeneracy:
+            return {"nodes": 0, "edges": 0}
+        return {"nodes": int(self.shell_nodes[k]), "edges": int(self.shell_edges[k])}
+
+    def k_core_nodes(self, k: int) -> np.ndarray:
+        return np.asarray(self.csr.node_ids)[self.core >= k]
+
+    def core_number(self, u: Any) -> int | None:
+        i = self.csr.index_of(u)
+        return int(self.core[i]) if i >= 0 else None
+
+    def onion_layer(self, u: Any) -> int | None:
+        i = self.csr.index_of(u)
+        return int(self.layer[i]) if i >= 0 else None
+
+    def distribution(self) -> List[Dict[str, int]]:
+        """One row per level that has nodes: shell size, and size and edges of the k-core."""
+        return [
+            {
+                "k": k,
+                "shell_nodes": int(self.shell_nodes[k]),
+                "shell_edges": int(self.shell_edges[k]),
+                "core_nodes": int(self.core_nodes[k]),
+                "core_edges": int(self.core_edges[k]),
+            }
+            for k in np.flatnonzero(self.shell_nodes[:self.degeneracy + 1]).tolist()
+        ]
+
+    def degeneracy_order(self) -> np.ndarray:
+        """Original node ids, smallest-last: each has at most `degeneracy` neighbours after it."""
+        return np.asarray(self.csr.node_ids)[self.order]
+
+    def as_dict(self) -> Dict[int, int]:
+        """{node id: core number}, as nx.core_number returns it."""
+        return dict(zip(np.asarray(self.csr.node_ids).tolist(), self.core.tolist()))
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import importlib
+import os
+import threading
+import types
+from typing import Any, List
+
+
+# SNA_EAGER_IMPORTS=1 imports everything up front, as before
+EAGER = os.environ.get("SNA_EAGER_IMPORTS", "0") not in ("", "0", "false", "no")
+
+_lock = threading.Lock()
+
+
+class LazyModule(types.ModuleType):
+    """Stands in for a module and imports it on first attribute access."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_target"] = None
+
+    def _load(self) -> types.ModuleType:
+        target = self.__dict__["_lazy_target"]
+        if target is None:
+            with _lock:
+                target = self.__dict__["_lazy_target"]
+                if target is None:
+                    target = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_target"] = target
+        return target
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __dir__(self) -> List[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_target"] is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_module(name: str) -> types.ModuleType:
+    """`np = lazy_module("numpy")` instead of `import numpy as np`; the import happens on first use."""
+    if EAGER:
+        return importlib.import_module(name)
+    return LazyModule(name)
+
+
+def import_heavy(names: List[str] | None = None) -> None:
+    """Import the heavy dependencies now (e.g. from a warm-up thread)."""
+    for name in names or HEAVY_MODULES:
+        importlib.import_module(name)
+
+
+HEAVY_MODULES = ["numpy", "scipy.sparse", "scipy.sparse.csgraph", "networkx", "community"]
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import math
+import multiprocessing
+import os
+import random
+from typing import Any, Dict, List, Sequence
+
+from .lazy_imports import lazy_module
+from .graph_store import csr_from_networkx
+
+nx = lazy_module("networkx")
+np = lazy_module("numpy")
+
+
+# Worker-side adjacency, set once per process by _init_worker.
+_ADJ: List[List[int]] | None = None
+
+
+def resolve_workers(workers: int | None) -> int:
+    """workers <= 0 (or None) means one worker per available core."""
+    if workers is None or int(workers) <= 0:
+        try:
+            return max(1, len(os.sched_getaffinity(0)))
+        except AttributeError:
+            return max(1, os.cpu_count() or 1)
+    return int(workers)
+
+
+def pool_context() -> multiprocessing.context.BaseContext:
+    """
+    Start method for the process pools. Never fork: the pools are opened from
+    the tool runner's threads, and a forked child would inherit whatever locks
+    those threads held. forkserver where the platform has it, spawn otherwise.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _init_worker(indptr: np.ndarray, indices: np.ndarray) -> None:
+    global _ADJ
+    ptr = indptr.tolist()
+    idx = indices.tolist()
+    _ADJ = [idx[ptr[i]:ptr[i + 1]] for i in range(len(ptr) - 1)]
+
+
+def _betweenness_chunk(sources: Sequence[int]) -> np.ndarray:
+    # Brandes accumulation (unnormalized, endpoints excluded) for a batch of sources
+    adj = _ADJ
+    n = len(adj)
+    bc = [0.0] * n
+    for s in sources:
+        S = []
+        P: List[List[int]] = [[] for _ in range(n)]
+        sigma = [0.0] * n
+        dist = [-1] * n
+        sigma[s] = 1.0
+        dist[s] = 0
+        q = deque([s])
+        while q:
+            v = q.popleft()
+            S.append(v)
+            dv = dist[v] + 1
+            sv = sigma[v]
+            for w in adj[v]:
+                if dist[w] < 0:
+                    dist[w] = dv
+                    q.append(w)
+                if dist[w] == dv:
+                    sigma[w] += sv
+                    P[w].append(v)
+        delta = [0.0] * n
+        while S:
+            w = S.pop()
+            coeff = (1.0 + delta[w]) / sigma[w]
+            for v in P[w]:
+                delta[v] += sigma[v] * coeff
+            if w != s:
+                bc[w] += delta[w]
+    return np.asarray(bc, dtype=float)
+
+
+def _closeness_chunk(sources: Sequence[int]) -> List[tuple]:
+    # (source, reachable nodes, total distance) per source
+    adj = _ADJ
+    n = len(adj)
+    out = []
+    for s in sources:
+        dist = [-1] * n
+        dist[s] = 0
+        q = deque([s])
+        total = 0
+        reached = 1
+        while q:
+            v = q.popleft()
+            dv = dist[v] + 1
+            for w in adj[v]:
+                if dist[w] < 0:
+                    dist[w] = dv
+                    total += dv
+                    reached += 1
+                    q.append(w)
+        out.append((s, reached, total))
+    return out
+
+
+def _chunks(items: Sequence[int], parts: int) -> List[Sequence[int]]:
+    size = max(1, -(-len(items) // parts))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _pool(H: nx.Graph, workers: int) -> tuple:
+    csr = csr_from_networkx(H)
+    ex = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=pool_context(),
+        initializer=_init_worker,
+        initargs=(np.asarray(csr.indptr), np.asarray(csr.indices)),
+    )
+    return ex, csr
+
+
+def _sampled_sources(H: nx.Graph, k: int | None, seed: int | None) -> List[Any] | None:
+    # same draw as nx.betweenness_centrality(H, k=k, seed=seed)
+    if k is None or k == len(H):
+        return None
+    return random.Random(seed).sample(list(H.nodes()), k)
+
+
+def betweenness_centrality(
+    H: nx.Graph, k: int | None = None, seed: int | None = None, workers: int = 1
+) -> Dict[Any, float]:
+    """
+    Normalized betweenness of an undirected graph, matching
+    nx.betweenness_centrality(H) (with k, the same sampled sources for an
+    integer seed; see parallel_betweenness for the scaling).
+    workers == 1 is the plain networkx call.
+    """
+    workers = resolve_workers(workers)
+    if workers <= 1 or len(H) < 3:
+        return nx.betweenness_centrality(H, k=k, seed=seed)
+    return parallel_betweenness(H, k=k, seed=seed, workers=workers)
+
+
+def parallel_betweenness(
+    H: nx.Graph, k: int | None = None, seed: int | None = None, workers: int = 2
+) -> Dict[Any, float]:
+    """
+    Betweenness with the BFS sources split across a process pool of `workers`;
+    partial dependency sums are added up, then normalized the way networkx
+    (>= 3.5) normalizes them, so the result matches the serial path.
+    """
+    workers = resolve_workers(workers)
+    sampled = _sampled_sources(H, k, seed)
+    ex, csr = _pool(H, workers)
+    with ex:
+        nodes = sampled if sampled is not None else list(H)
+        src = csr.indices_of(nodes).tolist()
+        total = np.zeros(csr.n, dtype=float)
+        for part in ex.map(_betweenness_chunk, _chunks(src, workers * 4)):
+            total += part
+
+    return _rescale(dict(zip(csr.node_ids.tolist(), total.tolist())), len(H), sampled)
+
+
+def _rescale(bc: Dict[Any, float], n: int, sampled: List[Any] | None) -> Dict[Any, float]:
+    # Brandes sums over ordered (s, t) pairs, endpoints excluded: divide by the
+    # number of pairs that could pass through v. With k sampled sources that is
+    # k(n-2), except for a sampled v itself, which is never its own source:
+    # (k-1)(n-2). Same as networkx's _rescale since 3.5.
+    if n <= 2:
+        return bc
+    if sampled is None:
+        scale = 1.0 / ((n - 1) * (n - 2))
+        return {v: b * scale for v, b in bc.items()}
+    k = len(sampled)
+    scale_source = 1.0 / ((k - 1) * (n - 2)) if k > 1 else math.nan
+    scale_other = 1.0 / (k * (n - 2))
+    sources = set(sampled)
+    return {v: b * (scale_source if v in sources else scale_other) for v, b in bc.items()}
+
+
+def closeness_centrality(H: nx.Graph, workers: int = 1) -> Dict[Any, float]:
+    """
+    Closeness (Wasserman-Faust improved, as networkx computes it) of every
+    node of H. workers == 1 is the plain networkx call.
+    """
+    workers = resolve_workers(workers)
+    if workers <= 1 or len(H) < 2:
+        return nx.closeness_centrality(H)
+    return parallel_closeness(H, workers=workers)
+
+
+def parallel_closeness(H: nx.Graph, workers: int = 2) -> Dict[Any, float]:
+    """Closeness with the per-node BFS runs spread across a process pool."""
+    workers = resolve_workers(workers)
+    ex, csr = _pool(H, workers)
+    n = csr.n
+    clos = np.zeros(n, dtype=float)
+    with ex:
+        for part in ex.map(_closeness_chunk, _chunks(list(range(n)), workers * 4)):
+            for s, reached, total in part:
+                if total > 0:
+                    clos[s] = ((reached - 1) / total) * ((reached - 1) / (n - 1))
+    return dict(zip(csr.node_ids.tolist(), clos.tolist()))
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import copy
+import functools
+import hashlib
+import inspect
+import json
+import os
+from pathlib import Path
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+from .graph_store import get_store
+from .instrumentation import note_cache
+
+
+CACHE_FORMAT = 1
+_MISSING = object()
+
+
+@dataclass
+class ResultCache:
+    """
+    Two-tier cache for tool results.
+
+    Memory tier: LRU over the last `max_entries` results.
+    Disk tier: one JSON file per result under `cache_dir`, evicted oldest-first
+    once the directory grows past `max_disk_bytes`. Set `cache_dir=None` to
+    keep everything in memory only.
+    """
+    cache_dir: Path | None = None
+    max_entries: int = 256
+    max_disk_bytes: int = 256 * 1024 * 1024
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    _mem: "OrderedDict[str, Any]" = field(default_factory=OrderedDict, repr=False)
+    _disk_bytes: int | None = field(default=None, repr=False)
+    _lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.cache_dir is not None:
+            self.cache_dir = Path(self.cache_dir)
+
+    @staticmethod
+    def make_key(fingerprint: str, func_name: str, args: Dict[str, Any], code: str = "") -> str:
+        payload = json.dumps(
+            {"format": CACHE_FORMAT, "graph": fingerprint, "fn": func_name, "code": code, "args": args},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        tier, value = self.lookup(key)
+        return tier is not None, value
+
+    def lookup(self, key: str) -> Tuple[str | None, Any]:
+        """Like get, but says where the value came from: "memory", "disk" or None (miss)."""
+        with self._lock:
+            value = self._mem.get(key, _MISSING)
+            if value is not _MISSING:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                return "memory", copy.deepcopy(value)
+
+        value = self._disk_get(key)
+        with self._lock:
+            if value is _MISSING:
+                self.misses += 1
+                return None, None
+            self.disk_hits += 1
+            self._mem_put(key, value)
+        return "disk", copy.deepcopy(value)
+
+    def put(self, key: str, value: Any, meta: Dict[str, Any] | None = None) -> None:
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._mem_put(key, value)
+        self._disk_put(key, value, meta or {})
+
+    def clear(self, disk: bool = False) -> None:
+        with self._lock:
+            self._mem.clear()
+            if disk and self.cache_dir is not None and self.cache_dir.exists():
+                for p in self.cache_dir.glob("*/*.json"):
+                    p.unlink(missing_ok=True)
+                self._disk_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": ((self.hits + self.disk_hits) / lookups) if lookups else 0.0,
+                "memory_entries": len(self._mem),
+                "max_entries": self.max_entries,
+                "disk_bytes": self._disk_bytes,
+                "max_disk_bytes": self.max_disk_bytes if self.cache_dir is not None else 0,
+                "evictions": self.evictions,
+            }
+
+    # MEMORY TIER
+    def _mem_put(self, key: str, value: Any) -> None:
+        self._mem[key] = value
+        self._mem.move_to_end(key)
+        while len(self._mem) > max(0, self.max_entries):
+            self._mem.popitem(last=False)
+            self.evictions += 1
+
+    # DISK TIER
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _disk_get(self, key: str) -> Any:
+        if self.cache_dir is None:
+            return _MISSING
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+            os.utime(path)  # recency for eviction
+        except (OSError, ValueError):
+            return _MISSING
+        if record.get("format") != CACHE_FORMAT:
+            return _MISSING
+        return record.get("value", _MISSING)
+
+    def _disk_put(self, key: str, value: Any, meta: Dict[str, Any]) -> None:
+        if self.cache_dir is None or self.max_disk_bytes <= 0:
+            return
+        try:
+            data = json.dumps({"format": CACHE_FORMAT, **meta, "value": value})
+        except (TypeError, ValueError):
+            return  # not JSON-serializable, keep it in memory only
+
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(p.stat().st_size for p in self.cache_dir.glob("*/*.json"))
+            else:
+                self._disk_bytes += len(data)
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        files = []
+        for p in self.cache_dir.glob("*/*.json"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, p))
+        files.sort()
+
+        total = sum(sz for _, sz, _ in files)
+        # drop down to 90% so we do not rescan on every write
+        target = int(self.max_disk_bytes * 0.9)
+        for _, sz, p in files:
+            if total <= target:
+                break
+            p.unlink(missing_ok=True)
+            total -= sz
+            self.evictions += 1
+        self._disk_bytes = total
+
+
+_CACHE: ResultCache | None = None
+
+
+def get_cache() -> ResultCache:
+    global _CACHE
+    if _CACHE is None:
+        default_dir = Path(__file__).resolve().parent.parent / "data" / ".cache" / "results"
+        cache_dir = os.environ.get("SNA_CACHE_DIR", str(default_dir))
+        _CACHE = ResultCache(
+            cache_dir=Path(cache_dir) if cache_dir else None,
+            max_entries=int(os.environ.get("SNA_CACHE_MAX_ENTRIES", "256")),
+            max_disk_bytes=int(float(os.environ.get("SNA_CACHE_MAX_DISK_MB", "256")) * 1024 * 1024),
+        )
+    return _CACHE
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    return str(value)
+
+
+def normalized_args(
+    sig: inspect.Signature, args: tuple, kwargs: Dict[str, Any], ignore: Tuple[str, ...] = ()
+) -> Dict[str, Any]:
+    """Bound arguments with defaults applied; extra **kwargs are ignored by the tools, so not part of the key."""
+    bound = sig.bind_partial(*args, **kwargs)
+    bound.apply_defaults()
+    out: Dict[str, Any] = {}
+    for name, value in bound.arguments.items():
+        if name in ignore or sig.parameters[name].kind is inspect.Parameter.VAR_KEYWORD:
+            continue
+        out[name] = _normalize(value)
+    return out
+
+
+def code_version(fn: Callable[..., Any], version: int = 0) -> str:
+    """Hash of fn's source and an explicit version, so results of older code never match."""
+    try:
+        src = inspect.getsource(fn)
+    except (OSError, TypeError):
+        src = fn.__qualname__
+    return hashlib.sha256(f"{version}:{src}".encode("utf-8")).hexdigest()[:16]
+
+
+def cached_analysis(
+    fn: Callable[..., Any] | None = None, *, ignore: Tuple[str, ...] = (), version: int = 0
+) -> Callable[..., Any]:
+    """
+    Cache a tools_graph analysis by (graph fingerprint, function, code, arguments).
+    Arguments listed in `ignore` (e.g. worker counts) do not change the result
+    and are left out of the key. The code part hashes the function's source,
+    so editing a tool retires its disk entries; bump `version` when its output
+    changes through code outside the function (e.g. a kernel module). Error
+    results ({"error": ...}) are never cached.
+    """
+    if fn is None:
+        return functools.partial(cached_analysis, ignore=ignore, version=version)
+
+    sig = inspect.signature(fn)
+    code: list = []  # hashed on first call, keeping imports fast
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        cache = get_cache()
+        key_args = normalized_args(sig, args, kwargs, ignore)
+        fingerprint = get_store().fingerprint()
+        if not code:
+            code.append(code_version(fn, version))
+        key = cache.make_key(fingerprint, fn.__name__, key_args, code[0])
+
+        tier, value = cache.lookup(key)
+        note_cache(tier or "miss")
+        if tier is not None:
+            return value
+
+        value = fn(*args, **kwargs)
+        if not (isinstance(value, dict) and "error" in value):
+            cache.put(key, value, meta={"fn": fn.__name__, "args": key_args, "graph": fingerprint, "code": code[0]})
+        return value
+
+    return wrapper
@@ -0,0 +1,212 @@
+"""
+Append-only session log: one gzip-compressed JSONL file per chat session.
+
+Every agent turn appends only the events added since the previous save;
+a background thread batches the writes, each batch becoming one gzip
+member of the file (gzip readers see the concatenation as one stream).
+Records, one JSON object per line:
+
+    {"type": "session", "id": ..., "app_name": ..., "user_id": ...}
+    {"type": "event", "event": {...}}          # Event.model_dump, exclude_none
+    {"type": "state", "state": {...}}          # only when the state changed
+
+    python -m sna_graph_chatbot.session_log saved_sessions/*.jsonl.gz [--compact] [--export DIR]
+"""
+from __future__ import annotations
+
+import argparse
+import atexit
+import gzip
+import json
+import os
+from pathlib import Path
+import queue
+import re
+import threading
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+def _safe(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", str(name))
+
+
+def session_path(directory: Path, session_id: str) -> Path:
+    return Path(directory) / f"session_{_safe(session_id)}.jsonl.gz"
+
+
+def iter_records(path: Path) -> Iterator[Dict[str, Any]]:
+    """Records of a session log; a torn last line (crash mid-write) is skipped."""
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+    except EOFError:
+        return  # truncated final gzip member
+
+
+def read_session(path: Path) -> Dict[str, Any]:
+    """Rebuild the full session (as Session.model_dump would give it) from its log."""
+    session: Dict[str, Any] = {"events": [], "state": {}}
+    seen = set()
+    for rec in iter_records(path):
+        kind = rec.get("type")
+        if kind == "session":
+            session.update({k: v for k, v in rec.items() if k != "type"})
+        elif kind == "event":
+            event = rec.get("event", {})
+            eid = event.get("id")
+            if eid is not None and eid in seen:
+                continue
+            seen.add(eid)
+            session["events"].append(event)
+        elif kind == "state":
+            session["state"] = rec.get("state", {})
+    return session
+
+
+def compact(path: Path) -> Tuple[int, int]:
+    """
+    Rewrite a log as a single gzip member with duplicate events and stale
+    state records dropped. Returns (bytes before, bytes after). Meant for
+    sessions that are over; a live session keeps appending to the old file.
+    """
+    path = Path(path)
+    before = path.stat().st_size
+    session = read_session(path)
+    header = {"type": "session", **{k: v for k, v in session.items() if k not in ("events", "state")}}
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with gzip.open(tmp, "wt", encoding="utf-8") as f:
+        f.write(json.dumps(header) + "\n")
+        for event in session["events"]:
+            f.write(json.dumps({"type": "event", "event": event}) + "\n")
+        if session["state"]:
+            f.write(json.dumps({"type": "state", "state": session["state"]}, default=str) + "\n")
+    os.replace(tmp, path)
+    return before, path.stat().st_size
+
+
+class SessionLog:
+    """
+    Tracks how many events of each session are already on disk and hands
+    the new ones to a background writer, so a save costs O(new events) and
+    never blocks the caller on file I/O.
+    """
+
+    def __init__(self, directory: Path | str, max_batch: int = 512):
+        self.directory = Path(directory)
+        self.max_batch = max_batch
+        self._saved: Dict[str, int] = {}
+        self._state: Dict[str, str] = {}
+        self._queue: "queue.Queue[Tuple[Path, str]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self.errors = 0
+
+    def _start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._writer, name="sna-session-log", daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def _known_events(self, path: Path) -> int:
+        # first save of this session in this process: continue an existing log
+        if not path.exists():
+            return -1
+        return sum(1 for rec in iter_records(path) if rec.get("type") == "event")
+
+    def append(self, session: Any) -> int:
+        """Queue the events (and state) of `session` not saved yet; returns how many events."""
+        path = session_path(self.directory, session.id)
+        events = list(session.events)
+        with self._lock:
+            saved = self._saved.get(session.id)
+            lines: List[str] = []
+            if saved is None:
+                saved = self._known_events(path)
+                if saved < 0:
+                    lines.append(json.dumps({
+                        "type": "session",
+                        "id": session.id,
+                        "app_name": getattr(session, "app_name", None),
+                        "user_id": getattr(session, "user_id", None),
+                    }))
+                    saved = 0
+            new = events[saved:]
+            # Event.model_dump_json is already a JSON object: splice it in, no re-parse
+            lines.extend('{"type": "event", "event": ' + e.model_dump_json(exclude_none=True) + "}" for e in new)
+            state = json.dumps(dict(getattr(session, "state", {}) or {}), sort_keys=True, default=str)
+            if state != self._state.get(session.id, "{}"):
+                lines.append('{"type": "state", "state": ' + state + "}")
+                self._state[session.id] = state
+            self._saved[session.id] = len(events)
+
+        if lines:
+            self._start()
+            self._queue.put((path, "\n".join(lines) + "\n"))
+        return len(new)
+
+    def _writer(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            # drain whatever queued up meanwhile: one gzip member per file per batch
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            by_path: Dict[Path, List[str]] = {}
+            for path, text in batch:
+                by_path.setdefault(path, []).append(text)
+            for path, chunks in by_path.items():
+                try:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    with open(path, "ab") as f:
+                        f.write(gzip.compress("".join(chunks).encode("utf-8")))
+                except OSError:
+                    self.errors += 1
+            for _ in batch:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """Block until everything queued so far is on disk."""
+        if self._thread is not None:
+            self._queue.join()
+
+
+_LOG: SessionLog | None = None
+
+
+def get_session_log() -> SessionLog:
+    global _LOG
+    if _LOG is None:
+        _LOG = SessionLog(os.environ.get("SNA_SESSION_DIR", "saved_sessions"))
+    return _LOG
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Read, export or compact session logs")
+    ap.add_argument("paths", nargs="+", type=Path)
+    ap.add_argument("--compact", action="store_true", help="rewrite each log as one gzip member")
+    ap.add_argument("--export", type=Path, help="write each rebuilt session as <DIR>/<name>.json")
+    args = ap.parse_args()
+
+    for path in args.paths:
+        session = read_session(path)
+        line = f"{path}: {len(session['events'])} events"
+        if args.export is not None:
+            args.export.mkdir(parents=True, exist_ok=True)
+            out = args.export / (path.name.replace(".jsonl.gz", "") + ".json")
+            with open(out, "w", encoding="utf-8") as f:
+                json.dump(session, f, indent=2, default=str)
+            line += f", exported to {out}"
+        if args.compact:
+            before, after = compact(path)
+            line += f", compacted {before} -> {after} bytes"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Sequence
+
+from .lazy_imports import lazy_module
+from .graph_store import GraphStore, get_store
+from .sparse_engine import get_engine
+
+np = lazy_module("numpy")
+sim_engine = lazy_module("Simulation.engine")
+
+
+def opinions_for(store: GraphStore, seed: int = 0) -> np.ndarray:
+    """Random 0/1 opinions per CSR node; the graph itself carries none."""
+    return np.random.default_rng(seed).integers(0, 2, store.csr().n).astype(np.int8)
+
+
+def engine_for(
+    store: GraphStore | None = None,
+    sources: Sequence[Any] = (),
+    p_base: float = 0.2,
+    seed: int = 42,
+    opinions: np.ndarray | None = None,
+) -> sim_engine.DiffusionEngine:
+    """
+    A DiffusionEngine over a GraphStore graph. The cached sparse adjacency is
+    used as is (its index arrays are the store's CSR arrays), and the
+    opinion / informed state lives in arrays over CSR indices, so nothing is
+    copied into per-node attributes. Raises KeyError for unknown sources.
+    """
+    store = store or get_store()
+    csr = store.csr()
+    idx = csr.indices_of(list(sources))
+    if (idx < 0).any():
+        raise KeyError(int(np.asarray(list(sources))[idx < 0][0]))
+
+    informed = np.zeros(csr.n, dtype=bool)
+    informed[idx] = True
+    eng = sim_engine.DiffusionEngine(
+        get_engine(store).adjacency(),
+        opinions if opinions is not None else opinions_for(store, seed),
+        informed,
+        p_base=p_base,
+        rng=seed,
+    )
+    eng.nodes = csr.node_ids
+    return eng
+
+
+def simulate(
+    sources: Sequence[Any],
+    steps: int = 20,
+    p_base: float = 0.2,
+    seed: int = 42,
+    store: GraphStore | None = None,
+) -> Dict[str, Any]:
+    """One frontier-based diffusion run from `sources`; stops early once nobody new can adopt."""
+    eng = engine_for(store, sources, p_base=p_base, seed=seed)
+    curve = eng.run(steps)
+    return {
+        "reach_curve": curve,
+        "informed": eng.n_informed,
+        "nodes": eng.n,
+        "steps_run": eng.steps_run,
+        "stopped_early": eng.steps_run < steps,
+        "homophily": eng.homophily(),
+        "informed_homophily": eng.informed_homophily(),
+    }
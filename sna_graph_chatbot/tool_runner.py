@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+import contextvars
+from dataclasses import dataclass, field
+import functools
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+from .graph_store import GraphStore, bind_store, get_store
+from .instrumentation import instrumented
+from .result_cache import normalized_args
+
+
+# seconds a tool may take before the caller gets a "still computing" reply
+DEFAULT_TIMEOUT = float(os.environ.get("SNA_TOOL_TIMEOUT", "10"))
+# finished results nobody picked up yet are kept this long
+RESULT_TTL = 600.0
+
+
+class JobCancelled(Exception):
+    pass
+
+
+@dataclass
+class Job:
+    """One running tool computation, shared by every caller that asked for it."""
+    id: str
+    tool: str
+    args: Dict[str, Any]
+    future: Future
+    started: float = field(default_factory=time.time)
+    finished: float | None = None
+    cancelled: bool = False
+    partial: Any = None
+    waiters: int = 0
+
+
+_local = threading.local()
+
+
+def report_partial(value: Any) -> None:
+    """Called from inside a tool: what a caller that times out should get meanwhile."""
+    job = getattr(_local, "job", None)
+    if job is not None:
+        job.partial = value
+
+
+def raise_if_cancelled() -> None:
+    """Called from inside a tool between expensive phases; stops a cancelled job there."""
+    job = getattr(_local, "job", None)
+    if job is not None and job.cancelled:
+        raise JobCancelled(job.id)
+
+
+def cancellable(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Marks a tool that reaches raise_if_cancelled() regularly, so it can be stopped while running."""
+    fn.cancellable = True
+    return fn
+
+
+class ToolRunner:
+    """
+    Runs blocking tools on a thread pool so the agent's event loop stays free.
+
+    Calls with the same tool, arguments and graph version share one job, so
+    many users asking for the same analysis trigger one computation. A call
+    that outlives its timeout returns a "still computing" reply (with any
+    partial result the tool reported) while the job keeps running; asking
+    again attaches to the same job, or picks up its result once done.
+    Threads, not processes: the tools share the in-process graph, indexes
+    and caches, and their heavy kernels already fan out to process pools.
+    """
+
+    def __init__(
+        self, workers: int | None = None, timeouts: Dict[str, float] | None = None, name: str = "sna-tool"
+    ):
+        self.workers = workers or int(os.environ.get("SNA_TOOL_WORKERS", "4"))
+        self.name = name
+        self.timeouts = dict(timeouts or {})
+        self.coalesced = 0
+        self.cancellable: set = set()
+        self._pool: ThreadPoolExecutor | None = None
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.name)
+        return self._pool
+
+    def background(self, workers: int = 1, name: str = "sna-background") -> "ToolRunner":
+        """
+        A runner with its own `workers` threads that shares this runner's job
+        table: its jobs never take a thread from this pool, yet a call made
+        here with the same key still attaches to them.
+        """
+        bg = ToolRunner(workers=workers, timeouts=self.timeouts, name=name)
+        bg.cancellable, bg._jobs, bg._lock = self.cancellable, self._jobs, self._lock
+        return bg
+
+    def timeout_for(self, tool: str) -> float:
+        return self.timeouts.get(tool, DEFAULT_TIMEOUT)
+
+    @staticmethod
+    def job_key(tool: str, args: Dict[str, Any], store: GraphStore) -> str:
+        payload = json.dumps(
+            {"graph": str(store.data_path), "version": store.version, "fn": tool, "args": args},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+    def submit(
+        self, fn: Callable[..., Any], args: tuple, kwargs: Dict[str, Any], key_args: Dict[str, Any]
+    ) -> Job:
+        tool = fn.__name__
+        # resolved once, here: the job runs on this graph even if the active dataset changes meanwhile
+        store = get_store()
+        job_id = self.job_key(tool, key_args, store)
+        with self._lock:
+            self._expire()
+            job = self._jobs.get(job_id)
+            if job is not None and not job.cancelled:
+                self.coalesced += 1
+                return job
+
+            future: Future = Future()
+            job = Job(job_id, tool, key_args, future)
+            self._jobs[job_id] = job
+            # in the caller's context, which carries its chat session's dataset
+            ctx = contextvars.copy_context()
+            self._executor().submit(ctx.run, self._run, job, store, fn, args, kwargs)
+            return job
+
+    def _run(
+        self, job: Job, store: GraphStore, fn: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]
+    ) -> None:
+        if job.cancelled or not job.future.set_running_or_notify_cancel():
+            return
+        _local.job = job
+        try:
+            with bind_store(store):
+                job.future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            job.future.set_exception(e)
+        finally:
+            _local.job = None
+            job.finished = time.time()
+
+    def cancel(self, job_id: str) -> str:
+        """
+        "cancelled", "unknown" (no unfinished job with that id), or "running":
+        the job already started and its tool has no cancellation checkpoints,
+        so it runs to the end (its result is still served to callers).
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.future.done():
+                return "unknown"
+            if job.future.running() and job.tool not in self.cancellable:
+                return "running"
+            del self._jobs[job_id]
+        job.cancelled = True
+        # a queued job never starts; a running one stops at its next raise_if_cancelled()
+        job.future.cancel()
+        return "cancelled"
+
+    def _expire(self) -> None:
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job.finished is not None and now - job.finished > RESULT_TTL:
+                del self._jobs[job_id]
+
+    def _forget(self, job: Job) -> None:
+        with self._lock:
+            if self._jobs.get(job.id) is job and job.waiters == 0:
+                del self._jobs[job.id]
+
+    async def call(
+        self, fn: Callable[..., Any], args: tuple, kwargs: Dict[str, Any], key_args: Dict[str, Any]
+    ) -> Any:
+        job = self.submit(fn, args, kwargs, key_args)
+        job.waiters += 1
+        waiting = asyncio.wrap_future(job.future)
+        try:
+            # shielded: a caller that gives up does not stop the job for the others
+            result = await asyncio.wait_for(asyncio.shield(waiting), timeout=self.timeout_for(job.tool))
+        except asyncio.TimeoutError:
+            job.waiters -= 1
+            # nobody awaits this copy any more: consume its outcome (e.g. a later cancellation)
+            waiting.add_done_callback(lambda f: f.cancelled() or f.exception())
+            reply: Dict[str, Any] = {
+                "status": "computing",
+                "tool": job.tool,
+                "job_id": job.id,
+                "elapsed_secs": round(time.time() - job.started, 1),
+                "message": "Still computing. Ask the same question again shortly to get the result.",
+            }
+            if job.partial is not None:
+                reply["partial"] = job.partial
+            return reply
+        except BaseException as e:
+            job.waiters -= 1
+            self._forget(job)
+            if job.cancelled and isinstance(e, (JobCancelled, asyncio.CancelledError)):
+                return {"error": "Computation was cancelled.", "tool": job.tool, "job_id": job.id}
+            raise
+
+        job.waiters -= 1
+        self._forget(job)
+        return result
+
+    def status(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    "job_id": job.id,
+                    "tool": job.tool,
+                    "args": job.args,
+                    "state": "done" if job.future.done() else ("running" if job.future.running() else "queued"),
+                    "elapsed_secs": round((job.finished or time.time()) - job.started, 1),
+                    "has_partial": job.partial is not None,
+                    "cancellable": job.tool in self.cancellable or not job.future.running(),
+                }
+                for job in self._jobs.values()
+            ]
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+_RUNNER: ToolRunner | None = None
+_BACKGROUND: ToolRunner | None = None
+
+
+def get_runner() -> ToolRunner:
+    global _RUNNER
+    if _RUNNER is None:
+        _RUNNER = ToolRunner()
+    return _RUNNER
+
+
+def get_background_runner() -> ToolRunner:
+    """Single-thread runner for precompute work, sharing get_runner()'s jobs."""
+    global _BACKGROUND
+    if _BACKGROUND is None:
+        _BACKGROUND = get_runner().background()
+    return _BACKGROUND
+
+
+def async_tool(fn: Callable[..., Any], timeout: float | None = None) -> Callable[..., Any]:
+    """
+    Async, instrumented version of a tools_graph function for the agent.
+    The signature (and so the tool declaration the LLM sees) is unchanged.
+    """
+    sig = inspect.signature(fn)
+    if timeout is not None:
+        get_runner().timeouts[fn.__name__] = timeout
+    if getattr(fn, "cancellable", False):
+        get_runner().cancellable.add(fn.__name__)
+    # measured on the worker thread, so CPU time is the tool's own
+    run = instrumented(fn)
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return await get_runner().call(run, args, kwargs, normalized_args(sig, args, kwargs))
+
+    return wrapper
@@ -1,376 +1,566 @@
-from __future__ import annotations
-from typing import Any, Dict, List, Tuple
-import random
-import networkx as nx
-import numpy as np
-from .graph_store import get_store
-import community as community_louvain
-
-
-def _G() -> nx.Graph:
-    return get_store().load()
-
-
-# CENTRALITIES
-def centralities_top_k(
-    k: int = 10,
-    betweenness_k: int = 2000,
-    seed: int = 42,
-    **kwargs,
-) -> Dict[str, List[Dict[str, Any]]]:
-    G = _G()
-    n = G.number_of_nodes()
-    if n == 0:
-        return {"degree": [], "closeness": [], "betweenness": [], "pagerank": []}
-
-    deg_cent = nx.degree_centrality(G)
-    top_deg = sorted(deg_cent.items(), key=lambda x: x[1], reverse=True)[:k]
-
-    lcc_nodes = max(nx.connected_components(G), key=len)
-    H = G.subgraph(lcc_nodes).copy()
-
-    clos = nx.closeness_centrality(H)
-    top_clos = sorted(clos.items(), key=lambda x: x[1], reverse=True)[:k]
-
-    btw = nx.betweenness_centrality(H, k=min(betweenness_k, H.number_of_nodes()), seed=seed)
-    top_btw = sorted(btw.items(), key=lambda x: x[1], reverse=True)[:k]
-
-    pr = nx.pagerank(G, alpha=0.85)
-    top_pr = sorted(pr.items(), key=lambda x: x[1], reverse=True)[:k]
-
-    return {
-        "degree": [{"node": int(u), "score": float(s)} for u, s in top_deg],
-        "closeness(lcc)": [{"node": int(u), "score": float(s)} for u, s in top_clos],
-        "betweenness(lcc_approx)": [{"node": int(u), "score": float(s)} for u, s in top_btw],
-        "pagerank": [{"node": int(u), "score": float(s)} for u, s in top_pr],
-    }
-
-
-# CLUSTERING
-def clustering_stats(samples: int = 5000, seed: int = 42, **kwargs) -> Dict[str, Any]:
-    G = _G()
-    n = G.number_of_nodes()
-    if n == 0:
-        return {"avg_clustering_est": 0.0, "transitivity": 0.0, "samples": 0}
-
-    rng = random.Random(seed)
-    sample_n = min(samples, n)
-    nodes = rng.sample(list(G.nodes()), k=sample_n)
-    local = nx.clustering(G, nodes=nodes)
-    vals = np.array(list(local.values()), dtype=float)
-
-    return {
-        "avg_clustering_est": float(vals.mean()) if len(vals) else 0.0,
-        "avg_clustering_std": float(vals.std()) if len(vals) else 0.0,
-        "transitivity": float(nx.transitivity(G)),
-        "samples": sample_n,
-    }
-
-
-# K-CORE
-def k_core_summary(k: int = 10, **kwargs) -> Dict[str, Any]:
-    G = _G()
-    if G.number_of_nodes() == 0:
-        return {"k": k, "k_core_size": 0, "max_core_number": 0}
-
-    core_num = nx.core_number(G)
-    max_core = max(core_num.values()) if core_num else 0
-    H = nx.k_core(G, k=k) if k <= max_core else nx.Graph()
-
-    return {
-        "k": k,
-        "k_core_size": H.number_of_nodes(),
-        "k_core_edges": H.number_of_edges(),
-        "max_core_number": int(max_core),
-    }
-
-
-# COMMUNITIES
-def louvain_communities(**kwargs) -> Dict[str, Any]:
-    G = _G()
-    if G.number_of_nodes() == 0:
-        return {"communities": 0, "modularity": 0.0, "top_sizes": []}
-
-    partition = community_louvain.best_partition(G)
-    mod = community_louvain.modularity(partition, G)
-
-    sizes: Dict[int, int] = {}
-    for _, cid in partition.items():
-        sizes[cid] = sizes.get(cid, 0) + 1
-
-    top_sizes = sorted(sizes.items(), key=lambda x: x[1], reverse=True)[:15]
-
-    return {
-        "communities": len(sizes),
-        "modularity": float(mod),
-        "top_sizes": [{"community": int(c), "size": int(sz)} for c, sz in top_sizes],
-    }
-
-
-# ASSORTATIVITY
-def degree_assortativity(**kwargs) -> Dict[str, Any]:
-    G = _G()
-    if G.number_of_nodes() == 0:
-        return {"assortativity": 0.0}
-    return {"assortativity": float(nx.degree_assortativity_coefficient(G))}
-
-
-# ARTICULATION POINTS & BRIDGES
-import time
-
-_BRIDGE_CACHE: Dict[str, Any] = {
-    "art_points": None,
-    "bridges": None,
-    "n": None,
-    "m": None,
-    "computed_secs": None,
-}
-
-
-def _ensure_bridge_cache(G: nx.Graph) -> None:
-    n = G.number_of_nodes()
-    m = G.number_of_edges()
-
-    if (
-        _BRIDGE_CACHE["art_points"] is not None
-        and _BRIDGE_CACHE["bridges"] is not None
-        and _BRIDGE_CACHE["n"] == n
-        and _BRIDGE_CACHE["m"] == m
-    ):
-        return
-
-    t0 = time.time()
-
-    # articulation points
-    art = sorted(int(x) for x in nx.articulation_points(G))
-
-    # bridges (normalize order u < v)
-    br = []
-    for u, v in nx.bridges(G):
-        u_i, v_i = int(u), int(v)
-        br.append((u_i, v_i) if u_i < v_i else (v_i, u_i))
-    br.sort()
-
-    _BRIDGE_CACHE["art_points"] = art
-    _BRIDGE_CACHE["bridges"] = br
-    _BRIDGE_CACHE["n"] = n
-    _BRIDGE_CACHE["m"] = m
-    _BRIDGE_CACHE["computed_secs"] = time.time() - t0
-
-
-def articulation_points_top_k(k: int = 10, **kwargs) -> Dict[str, Any]:
-    G = _G()
-    if G.number_of_nodes() == 0:
-        return {"count": 0, "k": max(1, int(k)), "top": [], "cached_compute_secs": 0.0}
-
-    k = max(1, int(k))
-    _ensure_bridge_cache(G)
-
-    art: List[int] = _BRIDGE_CACHE["art_points"] or []
-    top = art[:k]
-
-    return {
-        "count": len(art),
-        "k": k,
-        "returned": len(top),
-        "top": [{"node": int(u)} for u in top],
-        "graph": {"nodes": int(_BRIDGE_CACHE["n"]), "edges": int(_BRIDGE_CACHE["m"])},
-        "cached_compute_secs": float(_BRIDGE_CACHE["computed_secs"] or 0.0),
-        "note": "Articulation points are nodes whose removal increases the number of connected components.",
-    }
-
-
-def bridges_top_k(k: int = 10, **kwargs) -> Dict[str, Any]:
-    G = _G()
-    if G.number_of_nodes() == 0:
-        return {"count": 0, "k": max(1, int(k)), "top": [], "cached_compute_secs": 0.0}
-
-    k = max(1, int(k))
-    _ensure_bridge_cache(G)
-
-    br: List[Tuple[int, int]] = _BRIDGE_CACHE["bridges"] or []
-    top = br[:k]
-
-    return {
-        "count": len(br),
-        "k": k,
-        "returned": len(top),
-        "top": [{"u": int(u), "v": int(v)} for u, v in top],
-        "graph": {"nodes": int(_BRIDGE_CACHE["n"]), "edges": int(_BRIDGE_CACHE["m"])},
-        "cached_compute_secs": float(_BRIDGE_CACHE["computed_secs"] or 0.0),
-        "note": "Bridges are edges whose removal increases the number of connected components.",
-    }
-
-
-def bridge_summary(**kwargs) -> Dict[str, Any]:
-    G = _G()
-    if G.number_of_nodes() == 0:
-        return {
-            "graph": {"nodes": 0, "edges": 0},
-            "articulation_points": 0,
-            "bridges": 0,
-            "cached_compute_secs": 0.0,
-        }
-
-    _ensure_bridge_cache(G)
-
-    return {
-        "graph": {"nodes": int(_BRIDGE_CACHE["n"]), "edges": int(_BRIDGE_CACHE["m"])},
-        "articulation_points": int(len(_BRIDGE_CACHE["art_points"] or [])),
-        "bridges": int(len(_BRIDGE_CACHE["bridges"] or [])),
-        "cached_compute_secs": float(_BRIDGE_CACHE["computed_secs"] or 0.0),
-        "note": "First call computes and caches results; subsequent calls reuse cache (unless the graph changes).",
-    }
-
-
-# GRAPH OVERVIEW
-def graph_overview(**kwargs) -> Dict[str, Any]:
-    G = _G()
-    n = G.number_of_nodes()
-    m = G.number_of_edges()
-    comps = list(nx.connected_components(G))
-    comps_sizes = sorted([len(c) for c in comps], reverse=True)
-
-    return {
-        "nodes": n,
-        "edges": m,
-        "density": nx.density(G),
-        "connected_components": len(comps_sizes),
-        "largest_component_size": comps_sizes[0] if comps_sizes else 0,
-        "largest_component_fraction": (comps_sizes[0] / n) if n else 0.0,
-        "avg_degree": (2 * m / n) if n else 0.0,
-        "is_connected": nx.is_connected(G) if n > 0 else False,
-    }
-
-
-# EGO NETWORK
-def ego_network(u: int, radius: int = 1, **kwargs) -> Dict[str, Any]:
-    G = _G()
-    if u not in G:
-        return {"error": "Node not in graph.", "node": u}
-
-    H = nx.ego_graph(G, u, radius=radius)
-    return {
-        "node": u,
-        "radius": radius,
-        "ego_nodes": H.number_of_nodes(),
-        "ego_edges": H.number_of_edges(),
-        "avg_clustering_in_ego": nx.average_clustering(H) if H.number_of_nodes() > 1 else 0.0,
-    }
-
-
-# NEIGHBORS
-def get_node_neighbors(u: Any, limit: int = 20, show_all: bool = False, **kwargs) -> Dict[str, Any]:
-    G = _G()
-
-    try:
-        node_id = int(u)
-    except (ValueError, TypeError):
-        return {"error": f"Invalid node ID format: {u}", "node": u}
-
-    if node_id not in G:
-        return {"error": f"Node {node_id} not found in the graph.", "node": node_id}
-
-    neighbors_list = list(G.neighbors(node_id))
-    total_neighbors = len(neighbors_list)
-
-    if show_all:
-        returned_neighbors = neighbors_list
-    else:
-        returned_neighbors = neighbors_list[:limit]
-
-    return {
-        "node": node_id,
-        "total_neighbors": total_neighbors,
-        "returned_count": len(returned_neighbors),
-        "neighbors": [int(n) for n in returned_neighbors],
-        "has_more": total_neighbors > len(returned_neighbors)
-    }
-
-
-# FRIEND RECOMMENDATION
-def recommend_friends(u: int, k: int = 5, **kwargs) -> Dict[str, Any]:
-    G = _G()
-    node_id = int(u)
-
-    if node_id not in G:
-        return {"error": f"Node {node_id} not found.", "node": node_id}
-
-    neighbors = set(G.neighbors(node_id))
-    candidates = [v for v in G.nodes() if v != node_id and v not in neighbors]
-
-    preds = nx.adamic_adar_index(G, [(node_id, v) for v in candidates])
-
-    scored = []
-    for u_idx, v_idx, score in preds:
-        if score > 0:
-            scored.append({"node": int(v_idx), "score": float(score)})
-
-    scored.sort(key=lambda x: x["score"], reverse=True)
-    top_recommendations = scored[:k]
-
-    for rec in top_recommendations:
-        common = list(nx.common_neighbors(G, node_id, rec["node"]))
-        rec["common_neighbors_count"] = len(common)
-        rec["common_neighbors_sample"] = common[:5]
-
-    return {
-        "target_node": node_id,
-        "recommendations": top_recommendations,
-        "total_candidates_found": len(scored)
-    }
-
-
-# DIAMETER
-def diameter_estimate(samples: int = 50, seed: int = 42, **kwargs) -> Dict[str, Any]:
-    G = _G()
-    if G.number_of_nodes() == 0:
-        return {"diameter_est": 0, "lcc_nodes": 0}
-
-    lcc_nodes = max(nx.connected_components(G), key=len)
-    H = G.subgraph(lcc_nodes).copy()
-    nodes = list(H.nodes())
-    rng = random.Random(seed)
-
-    def bfs_ecc(start: int) -> int:
-        lengths = nx.single_source_shortest_path_length(H, start)
-        return max(lengths.values())
-
-    diam = 0
-    for _ in range(min(samples, len(nodes))):
-        s = rng.choice(nodes)
-        diam = max(diam, bfs_ecc(s))
-
-    return {
-        "diameter_est": int(diam),
-        "lcc_nodes": H.number_of_nodes(),
-        "samples": min(samples, len(nodes)),
-    }
-
-
-# CONNECTED COMPONENTS
-def component_summary(top: int = 10, **kwargs) -> Dict[str, Any]:
-    G = _G()
-    comps = sorted([len(c) for c in nx.connected_components(G)], reverse=True)
-    return {"components": len(comps), "top_sizes": comps[:top]}
-
-
-# DEGREE
-def top_k_by_degree(k: int = 3, **kwargs) -> List[Dict[str, Any]]:
-    G = _G()
-    deg = sorted(G.degree(), key=lambda x: x[1], reverse=True)[: max(1, k)]
-    return [{"node": int(u), "degree": int(d)} for u, d in deg]
-
-
-# SHORTEST PATH
-def shortest_path(u: int, v: int, **kwargs) -> Dict[str, Any]:
-    G = _G()
-    if u not in G or v not in G:
-        return {"error": "One or both nodes not in graph.", "u": u, "v": v}
-
-    try:
-        path = nx.shortest_path(G, u, v)
-        return {"u": u, "v": v, "length": len(path) - 1, "path": path}
-    except nx.NetworkXNoPath:
-        return {"u": u, "v": v, "length": None, "path": None}
-
+from __future__ import annotations
+from typing import Any, Dict, List, Tuple
+import random
+from .lazy_imports import lazy_module
+from .graph_store import current_dataset, get_registry, get_store, session_dataset, set_session_dataset
+from .graph_index import get_index
+from .result_cache import cached_analysis
+from . import parallel_centrality as pc
+from .sparse_engine import get_engine
+from .recommend import recommend
+from .distance_oracle import get_oracle
+from .eccentricity import get_eccentricity_index
+from .ego import get_ego_index
+from .communities import get_communities
+from .closeness import get_closeness_index
+from .simulation import simulate
+from .tool_runner import cancellable, get_runner, raise_if_cancelled, report_partial
+
+nx = lazy_module("networkx")
+np = lazy_module("numpy")
+
+
+def _G() -> nx.Graph:
+    return get_store().load()
+
+
+def _top_k(scores: np.ndarray, ids: np.ndarray, k: int) -> List[Dict[str, Any]]:
+    # stable, so ties keep node order like sorted(..., reverse=True) on a dict
+    order = np.argsort(-scores, kind="stable")[:k]
+    return [{"node": int(ids[i]), "score": float(scores[i])} for i in order]
+
+
+# DATASETS
+def list_datasets(**kwargs) -> Dict[str, Any]:
+    reg = get_registry()
+    active = current_dataset()
+    return {
+        "active": active,
+        "datasets": reg.stats(active),
+        "memory_mb": round(reg.memory_bytes() / 2**20, 1),
+        "memory_budget_mb": round(reg.memory_budget / 2**20, 1),
+    }
+
+
+def use_dataset(name: str, **kwargs) -> Dict[str, Any]:
+    reg = get_registry()
+    # within a chat session only that session switches; the agent keeps the name in its state
+    in_session = session_dataset() is not None
+    try:
+        store = reg.use(name, activate=not in_session)
+    except KeyError:
+        return {"error": f"Unknown dataset {name!r}.", "available": reg.names()}
+    except (OSError, ValueError) as e:
+        return {"error": f"Could not load dataset {name!r}: {e}"}
+
+    if in_session:
+        set_session_dataset(name)
+    csr = store.csr()
+    # other loaded datasets stay in memory (within budget), so switching back is instant
+    return {"active": name, "nodes": csr.n, "edges": csr.m, "path": str(store.data_path)}
+
+
+# CENTRALITIES
+@cancellable
+@cached_analysis
+def centralities_top_k(
+    k: int = 10,
+    betweenness_k: int = 2000,
+    seed: int = 42,
+    workers: int = 1,
+    **kwargs,
+) -> Dict[str, List[Dict[str, Any]]]:
+    eng = get_engine()
+    ids = eng.node_ids()
+    n = len(ids)
+    if n == 0:
+        return {"degree": [], "closeness": [], "betweenness": [], "pagerank": []}
+
+    # the cheap measures first, so a caller that times out still gets them
+    top_deg = _top_k(eng.degree_centrality(), ids, k)
+    top_pr = _top_k(eng.pagerank(alpha=0.85), ids, k)
+    report_partial({"degree": top_deg, "pagerank": top_pr})
+    raise_if_cancelled()
+
+    # exact top-k from pruned BFS runs, not one full BFS per node
+    top = get_closeness_index().top_k(k)["top"]
+    top_clos = [(ids[v], s) for v, s in top]
+    report_partial({
+        "degree": top_deg,
+        "closeness(lcc)": [{"node": int(u), "score": float(s)} for u, s in top_clos],
+        "pagerank": top_pr,
+    })
+    raise_if_cancelled()
+
+    # shared view of the largest component, not a copy
+    H = get_index().lcc_view()
+
+    btw = pc.betweenness_centrality(
+        H, k=min(betweenness_k, H.number_of_nodes()), seed=seed, workers=workers
+    )
+    top_btw = sorted(btw.items(), key=lambda x: x[1], reverse=True)[:k]
+
+    return {
+        "degree": top_deg,
+        "closeness(lcc)": [{"node": int(u), "score": float(s)} for u, s in top_clos],
+        "betweenness(lcc_approx)": [{"node": int(u), "score": float(s)} for u, s in top_btw],
+        "pagerank": top_pr,
+    }
+
+
+@cancellable
+@cached_analysis
+def closeness_top_k(
+    k: int = 10,
+    measure: str = "closeness",
+    samples: int = 0,
+    epsilon: float = 0.0,
+    delta: float = 0.05,
+    **kwargs,
+) -> Dict[str, Any]:
+    if measure not in ("closeness", "harmonic"):
+        return {"error": "measure must be 'closeness' or 'harmonic'.", "measure": measure}
+    idx = get_closeness_index()
+    ids = get_engine().node_ids()
+    if len(ids) == 0:
+        return {"measure": measure, "top": []}
+
+    if samples <= 0 and epsilon <= 0:
+        # exact ranking, with far fewer BFS runs than nodes
+        r = idx.top_k(k, measure)
+        return {
+            "measure": measure,
+            "mode": "exact",
+            "top": [{"node": int(ids[v]), "score": float(s)} for v, s in r["top"]],
+            "component_nodes": r["nodes"],
+            "bfs_runs": r["bfs_runs"],
+            "bfs_cut_short": r["bfs_cut_short"],
+        }
+
+    # sampled pivots: every score within its interval with probability 1 - delta
+    e = idx.estimate(samples=samples or None, epsilon=epsilon or None, delta=delta)
+    if measure == "closeness":
+        score, lo, hi = idx.closeness(e["farness"]), idx.closeness(e["farness_hi"]), idx.closeness(e["farness_lo"])
+    else:
+        score, lo, hi = e["harmonic"], e["harmonic_lo"], e["harmonic_hi"]
+    rows = idx.nodes
+    order = rows[np.argsort(-score[rows], kind="stable")[:k]]
+    return {
+        "measure": measure,
+        "mode": "approx",
+        "top": [
+            {"node": int(ids[i]), "score": float(score[i]), "lower": float(lo[i]), "upper": float(hi[i])}
+            for i in order
+        ],
+        "component_nodes": idx.n,
+        "samples": e["samples"],
+        "epsilon": e["epsilon"],
+        "confidence": e["confidence"],
+    }
+
+
+# CLUSTERING
+@cached_analysis
+def clustering_stats(**kwargs) -> Dict[str, Any]:
+    eng = get_engine()
+    n = len(eng.node_ids())
+    if n == 0:
+        return {"avg_clustering": 0.0, "avg_clustering_std": 0.0, "transitivity": 0.0, "nodes": 0}
+
+    # exact over all nodes, from sparse triangle counts
+    local = eng.clustering()
+    return {
+        "avg_clustering": float(local.mean()),
+        "avg_clustering_std": float(local.std()),
+        "transitivity": eng.transitivity(),
+        "nodes": n,
+    }
+
+
+# K-CORE
+@cached_analysis
+def k_core_summary(k: int = 10, **kwargs) -> Dict[str, Any]:
+    cores = get_index().cores()
+    if cores.n == 0:
+        return {"k": k, "k_core_size": 0, "max_core_number": 0}
+
+    # counts per level come with the decomposition, no subgraph is built
+    core, shell = cores.k_core(k), cores.k_shell(k)
+    return {
+        "k": k,
+        "k_core_size": core["nodes"],
+        "k_core_edges": core["edges"],
+        "k_shell_size": shell["nodes"],
+        "k_shell_edges": shell["edges"],
+        "max_core_number": cores.degeneracy,
+        "onion_layers": cores.layers,
+    }
+
+
+@cached_analysis
+def core_distribution(**kwargs) -> Dict[str, Any]:
+    cores = get_index().cores()
+    return {
+        "max_core_number": cores.degeneracy,
+        "onion_layers": cores.layers,
+        "levels": cores.distribution(),
+    }
+
+
+def node_core(u: int, **kwargs) -> Dict[str, Any]:
+    node_id = int(u)
+    cores = get_index().cores()
+    k = cores.core_number(node_id)
+    if k is None:
+        return {"error": f"Node {node_id} not found.", "node": node_id}
+    core = cores.k_core(k)
+    return {
+        "node": node_id,
+        "core_number": k,
+        "onion_layer": cores.onion_layer(node_id),
+        "max_core_number": cores.degeneracy,
+        "k_core_size": core["nodes"],
+        "k_core_edges": core["edges"],
+    }
+
+
+# COMMUNITIES
+@cached_analysis(version=1)
+def louvain_communities(seed: int = 42, resolution: float = 1.0, top: int = 15, **kwargs) -> Dict[str, Any]:
+    G = _G()
+    if G.number_of_nodes() == 0:
+        return {"communities": 0, "modularity": 0.0, "top_sizes": []}
+
+    # cached per graph version and (resolution, seed); warm-started after edits
+    part = get_communities().partition(resolution=resolution, seed=seed)
+
+    return {
+        "communities": part.count,
+        "modularity": part.modularity,
+        "top_sizes": [{"community": c, "size": sz} for c, sz in part.top(top)],
+        "intra_community_edges": int(part.intra.sum()),
+        "inter_community_edges": part.inter_total,
+        "seed": seed,
+        "resolution": resolution,
+    }
+
+
+def node_community(u: int, seed: int = 42, resolution: float = 1.0, limit: int = 20, **kwargs) -> Dict[str, Any]:
+    node_id = int(u)
+    part = get_communities().partition(resolution=resolution, seed=seed)
+    c = part.community_of(node_id)
+    if c is None:
+        return {"error": f"Node {node_id} not found.", "node": node_id}
+
+    members = part.members(c)
+    return {
+        "node": node_id,
+        "community": c,
+        "size": int(members.shape[0]),
+        "members_sample": [int(x) for x in members[:limit]],
+        "intra_edges": int(part.intra[c]),
+        "boundary_edges": int(part.boundary[c]),
+        "seed": seed,
+        "resolution": resolution,
+    }
+
+
+# ASSORTATIVITY
+@cached_analysis
+def degree_assortativity(**kwargs) -> Dict[str, Any]:
+    eng = get_engine()
+    if len(eng.node_ids()) == 0:
+        return {"assortativity": 0.0}
+    return {"assortativity": eng.degree_assortativity()}
+
+
+# ARTICULATION POINTS & BRIDGES
+def articulation_points_top_k(k: int = 10, **kwargs) -> Dict[str, Any]:
+    G = _G()
+    if G.number_of_nodes() == 0:
+        return {"count": 0, "k": max(1, int(k)), "top": [], "cached_compute_secs": 0.0}
+
+    k = max(1, int(k))
+    idx = get_index()
+    art: List[int] = idx.articulation_points()
+    top = art[:k]
+
+    return {
+        "count": len(art),
+        "k": k,
+        "returned": len(top),
+        "top": [{"node": int(u)} for u in top],
+        "graph": {"nodes": G.number_of_nodes(), "edges": G.number_of_edges()},
+        "cached_compute_secs": float(idx.compute_secs["bridges"]),
+        "note": "Articulation points are nodes whose removal increases the number of connected components.",
+    }
+
+
+def bridges_top_k(k: int = 10, **kwargs) -> Dict[str, Any]:
+    G = _G()
+    if G.number_of_nodes() == 0:
+        return {"count": 0, "k": max(1, int(k)), "top": [], "cached_compute_secs": 0.0}
+
+    k = max(1, int(k))
+    idx = get_index()
+    br: List[Tuple[int, int]] = idx.bridges()
+    top = br[:k]
+
+    return {
+        "count": len(br),
+        "k": k,
+        "returned": len(top),
+        "top": [{"u": int(u), "v": int(v)} for u, v in top],
+        "graph": {"nodes": G.number_of_nodes(), "edges": G.number_of_edges()},
+        "cached_compute_secs": float(idx.compute_secs["bridges"]),
+        "note": "Bridges are edges whose removal increases the number of connected components.",
+    }
+
+
+def bridge_summary(**kwargs) -> Dict[str, Any]:
+    G = _G()
+    if G.number_of_nodes() == 0:
+        return {
+            "graph": {"nodes": 0, "edges": 0},
+            "articulation_points": 0,
+            "bridges": 0,
+            "cached_compute_secs": 0.0,
+        }
+
+    idx = get_index()
+
+    return {
+        "graph": {"nodes": G.number_of_nodes(), "edges": G.number_of_edges()},
+        "articulation_points": len(idx.articulation_points()),
+        "bridges": len(idx.bridges()),
+        "cached_compute_secs": float(idx.compute_secs["bridges"]),
+        "note": "First call computes and caches results; subsequent calls reuse cache (unless the graph changes).",
+    }
+
+
+# GRAPH OVERVIEW
+@cached_analysis
+def graph_overview(**kwargs) -> Dict[str, Any]:
+    G = _G()
+    n = G.number_of_nodes()
+    m = G.number_of_edges()
+    comps_sizes = get_index().component_sizes()
+
+    return {
+        "nodes": n,
+        "edges": m,
+        "density": nx.density(G),
+        "connected_components": len(comps_sizes),
+        "largest_component_size": comps_sizes[0] if comps_sizes else 0,
+        "largest_component_fraction": (comps_sizes[0] / n) if n else 0.0,
+        "avg_degree": (2 * m / n) if n else 0.0,
+        "is_connected": len(comps_sizes) == 1,
+    }
+
+
+# EGO NETWORK
+def ego_network(u: int, radius: int = 1, **kwargs) -> Dict[str, Any]:
+    # from the adjacency arrays, no ego subgraph is built; radius 1 and 2 are cached per node
+    s = get_ego_index().node(u, radius=radius)
+    if s is None:
+        return {"error": "Node not in graph.", "node": u}
+
+    return {
+        "node": u,
+        "radius": radius,
+        "ego_nodes": s["size"],
+        "ego_edges": s["edges"],
+        "ego_density": s["density"],
+        "boundary_edges": s["boundary"],
+        "avg_clustering_in_ego": s["clustering"],
+    }
+
+
+@cancellable
+@cached_analysis(ignore=("workers",))
+def ego_network_summary(radius: int = 1, top: int = 10, workers: int = 1, **kwargs) -> Dict[str, Any]:
+    s = get_ego_index().stats(radius=radius, workers=workers)
+    if s["node"].size == 0:
+        return {"radius": radius, "egos": 0}
+
+    def top_by(key: str) -> List[Dict[str, Any]]:
+        order = np.argsort(-s[key], kind="stable")[:top]
+        return [{"node": int(s["node"][i]), key: s[key][i].item()} for i in order]
+
+    return {
+        "radius": radius,
+        "egos": int(s["node"].size),
+        "mean": {key: float(s[key].mean()) for key in ("size", "edges", "density", "clustering", "boundary")},
+        "median": {key: float(np.median(s[key])) for key in ("size", "edges", "density", "clustering", "boundary")},
+        "largest": top_by("size"),
+        "most_boundary_edges": top_by("boundary"),
+    }
+
+
+# NEIGHBORS
+def get_node_neighbors(u: Any, limit: int = 20, show_all: bool = False, **kwargs) -> Dict[str, Any]:
+    G = _G()
+
+    try:
+        node_id = int(u)
+    except (ValueError, TypeError):
+        return {"error": f"Invalid node ID format: {u}", "node": u}
+
+    if node_id not in G:
+        return {"error": f"Node {node_id} not found in the graph.", "node": node_id}
+
+    neighbors_list = list(G.neighbors(node_id))
+    total_neighbors = len(neighbors_list)
+
+    if show_all:
+        returned_neighbors = neighbors_list
+    else:
+        returned_neighbors = neighbors_list[:limit]
+
+    return {
+        "node": node_id,
+        "total_neighbors": total_neighbors,
+        "returned_count": len(returned_neighbors),
+        "neighbors": [int(n) for n in returned_neighbors],
+        "has_more": total_neighbors > len(returned_neighbors)
+    }
+
+
+# FRIEND RECOMMENDATION
+def recommend_friends(u: int, k: int = 5, **kwargs) -> Dict[str, Any]:
+    node_id = int(u)
+
+    # two-hop candidates only, scored in one sparse row product
+    res = recommend(node_id, k=k)
+    if res is None:
+        return {"error": f"Node {node_id} not found.", "node": node_id}
+
+    return {
+        "target_node": node_id,
+        "recommendations": res["recommendations"],
+        "total_candidates_found": res["total_candidates_found"],
+    }
+
+
+# DIAMETER
+@cancellable
+@cached_analysis
+def diameter_estimate(
+    samples: int = 50, seed: int = 42, exact: bool = True, center_periphery: bool = False, **kwargs
+) -> Dict[str, Any]:
+    G = _G()
+    if G.number_of_nodes() == 0:
+        return {"diameter_est": 0, "lcc_nodes": 0}
+
+    # exact: eccentricity bounding on the LCC; otherwise `samples` random BFS runs
+    if exact:
+        # the diameter alone settles in a handful of BFS runs; radius, center and
+        # periphery need every node's bounds closed around both extremes
+        res = get_eccentricity_index().summary("extrema" if center_periphery else "diameter")
+        out = {
+            "diameter_est": res["diameter"],
+            "diameter": res["diameter"],
+            "lcc_nodes": res["lcc_nodes"],
+            "bfs_runs": res["bfs_runs"],
+            "exact": True,
+        }
+        if center_periphery:
+            center, periphery = res["center"], res["periphery"]
+            out.update({
+                "radius": res["radius"],
+                "center": center[:20],
+                "center_size": len(center),
+                "periphery": periphery[:20],
+                "periphery_size": len(periphery),
+            })
+        return out
+
+    H = get_index().lcc_view()
+    nodes = list(H.nodes())
+    rng = random.Random(seed)
+
+    def bfs_ecc(start: int) -> int:
+        lengths = nx.single_source_shortest_path_length(H, start)
+        return max(lengths.values())
+
+    diam = 0
+    for _ in range(min(samples, len(nodes))):
+        raise_if_cancelled()
+        s = rng.choice(nodes)
+        diam = max(diam, bfs_ecc(s))
+
+    return {
+        "diameter_est": int(diam),
+        "lcc_nodes": H.number_of_nodes(),
+        "samples": min(samples, len(nodes)),
+        "exact": False,
+    }
+
+
+# CONNECTED COMPONENTS
+@cached_analysis
+def component_summary(top: int = 10, **kwargs) -> Dict[str, Any]:
+    comps = get_index().component_sizes()
+    return {"components": len(comps), "top_sizes": comps[:top]}
+
+
+# DEGREE
+def top_k_by_degree(k: int = 3, **kwargs) -> List[Dict[str, Any]]:
+    G = _G()
+    deg = sorted(G.degree(), key=lambda x: x[1], reverse=True)[: max(1, k)]
+    return [{"node": int(u), "degree": int(d)} for u, d in deg]
+
+
+# SHORTEST PATH
+def shortest_path(u: int, v: int, **kwargs) -> Dict[str, Any]:
+    try:
+        # landmark-bounded bidirectional BFS over the CSR arrays
+        path = get_oracle().shortest_path(u, v)
+    except (KeyError, ValueError, TypeError):
+        return {"error": "One or both nodes not in graph.", "u": u, "v": v}
+
+    if path is None:
+        return {"u": u, "v": v, "length": None, "path": None}
+    return {"u": u, "v": v, "length": len(path) - 1, "path": path}
+
+
+# DIFFUSION SIMULATION
+def simulate_spread(u: int, steps: int = 20, p_base: float = 0.2, seed: int = 42, **kwargs) -> Dict[str, Any]:
+    node_id = int(u)
+
+    # homophily adoption rule of the Simulation package, on the loaded graph with seeded random opinions
+    try:
+        res = simulate([node_id], steps=steps, p_base=p_base, seed=seed)
+    except KeyError:
+        return {"error": f"Node {node_id} not found.", "node": node_id}
+
+    return {
+        "source": node_id,
+        "steps": steps,
+        "p_base": p_base,
+        "reach_curve": [round(x, 4) for x in res["reach_curve"]],
+        "final_reach": res["informed"] / res["nodes"],
+        "informed": res["informed"],
+        "nodes": res["nodes"],
+        "stopped_early": res["stopped_early"],
+        "steps_run": res["steps_run"],
+    }
+
+
+# BACKGROUND COMPUTATIONS
+def computation_status(**kwargs) -> Dict[str, Any]:
+    runner = get_runner()
+    return {"jobs": runner.status(), "coalesced_requests": runner.coalesced}
+
+
+def cancel_computation(job_id: str, **kwargs) -> Dict[str, Any]:
+    status = get_runner().cancel(job_id)
+    if status == "unknown":
+        return {"error": "No running computation with that id.", "job_id": job_id}
+    if status == "running":
+        return {
+            "job_id": job_id,
+            "cancelled": False,
+            "message": "This analysis cannot be interrupted once started; it will finish and its result stays available.",
+        }
+    return {"job_id": job_id, "cancelled": True}
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import inspect
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+from .graph_store import get_store
+from .lazy_imports import import_heavy
+from .result_cache import normalized_args
+from .tool_runner import get_background_runner
+
+
+DEFAULT_PRECOMPUTE = "overview,components,core,pagerank"
+
+
+def _tool(name: str) -> Callable[[], Any]:
+    def run() -> Any:
+        from . import tools_graph as tg
+
+        # on the single background thread, so it never holds a worker a question
+        # needs, but under the same job key (and job table) as a user call, so a
+        # question that arrives mid-warm-up attaches to this computation
+        fn = getattr(tg, name)
+        return get_background_runner().submit(fn, (), {}, normalized_args(inspect.signature(fn), (), {})).future.result()
+    return run
+
+
+def _core_numbers() -> Any:
+    from .graph_index import get_index
+    return get_index().core_numbers()
+
+
+def _pagerank() -> Any:
+    from .sparse_engine import get_engine
+    return get_engine().pagerank(alpha=0.85)
+
+
+PRECOMPUTE: Dict[str, Callable[[], Any]] = {
+    "overview": _tool("graph_overview"),
+    "components": _tool("component_summary"),
+    "core": _core_numbers,
+    "pagerank": _pagerank,
+}
+
+
+class Warmup:
+    """
+    Background start-up work: import the heavy libraries, load the active
+    graph (CSR, then the networkx graph), then run the `precompute` steps
+    in order. Each step's time is kept in `timings`.
+    """
+
+    def __init__(self, precompute: List[str]):
+        unknown = [p for p in precompute if p not in PRECOMPUTE]
+        if unknown:
+            raise ValueError(f"Unknown precompute step(s) {unknown}; choose from {sorted(PRECOMPUTE)}.")
+        self.precompute = precompute
+        self.timings: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self.done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sna-warmup", daemon=True)
+
+    def _step(self, name: str, fn: Callable[[], Any]) -> bool:
+        t0 = time.perf_counter()
+        try:
+            fn()
+        except Exception as e:  # a failed warm-up only means the first question pays for it
+            self.errors[name] = f"{type(e).__name__}: {e}"
+            return False
+        finally:
+            self.timings[name] = round(time.perf_counter() - t0, 4)
+        return True
+
+    def _run(self) -> None:
+        try:
+            self._step("imports", import_heavy)
+            if self._step("csr", lambda: get_store().csr()) and self._step("graph", lambda: get_store().load()):
+                for name in self.precompute:
+                    self._step(name, PRECOMPUTE[name])
+        finally:
+            self.done.set()
+
+    def start(self) -> "Warmup":
+        self._thread.start()
+        return self
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self.done.wait(timeout)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "done": self.done.is_set(),
+            "precompute": self.precompute,
+            "timings": dict(self.timings),
+            "errors": dict(self.errors),
+        }
+
+
+_WARMUP: Warmup | None = None
+
+
+def start_warmup(precompute: List[str] | None = None) -> Warmup | None:
+    """
+    Start the warm-up thread once per process; called by the app entry point
+    (python -m sna_graph_chatbot), never on import. SNA_WARMUP=0 disables it;
+    SNA_PRECOMPUTE lists the analyses to precompute (comma separated, empty
+    for none; default overview, components, core numbers and PageRank).
+    """
+    global _WARMUP
+    if _WARMUP is not None:
+        return _WARMUP
+    if os.environ.get("SNA_WARMUP", "1") in ("", "0", "false", "no"):
+        return None
+    if precompute is None:
+        spec = os.environ.get("SNA_PRECOMPUTE", DEFAULT_PRECOMPUTE)
+        precompute = [p.strip() for p in spec.split(",") if p.strip()]
+    _WARMUP = Warmup(precompute).start()
+    return _WARMUP
+
+
+def warmup_status() -> Dict[str, Any] | None:
+    return _WARMUP.status() if _WARMUP is not None else None
@@ -0,0 +1,23 @@
+import networkx as nx
+
+from sna_graph_chatbot.closeness import ClosenessIndex
+from sna_graph_chatbot.graph_store import GraphStore
+
+
+def test_tighten_counts_past_int8(tmp_path):
+    # two hubs sharing 256 neighbours: 256 paths of length 2 between them
+    path = tmp_path / "hubs.txt"
+    path.write_text("".join(f"{h} {v}\n" for h in (0, 1) for v in range(2, 258)))
+    store = GraphStore(data_path=path)
+    index = ClosenessIndex(store)
+    index._check()
+    rows = store.csr().indices_of([0, 1])
+    index._tighten(rows)
+
+    G = nx.read_edgelist(path, nodetype=int)
+    for row, u in zip(rows, (0, 1)):
+        assert index.far_lo[row] <= sum(nx.single_source_shortest_path_length(G, u).values())
+
+    top = index.top_k(2)["top"]
+    ids = store.csr().node_ids
+    assert sorted(int(ids[v]) for v, _ in top) == [0, 1]
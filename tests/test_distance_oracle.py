@@ -0,0 +1,33 @@
+import networkx as nx
+import numpy as np
+
+from sna_graph_chatbot.distance_oracle import DistanceOracle
+from sna_graph_chatbot.graph_store import GraphStore
+
+
+def _oracle(tmp_path, G, name):
+    path = tmp_path / f"{name}.txt"
+    path.write_text("".join(f"{u} {v}\n" for u, v in G.edges()))
+    return DistanceOracle(GraphStore(data_path=path), num_landmarks=4)
+
+
+def test_same_node_distance_is_zero(tmp_path):
+    G = nx.path_graph(10)
+    oracle = _oracle(tmp_path, G, "path")
+    nodes = list(G)
+    assert oracle.distances(nodes, nodes, exact=True).tolist() == [0] * len(nodes)
+    assert oracle.distances(nodes, nodes).tolist() == [0] * len(nodes)
+    assert oracle.shortest_path(5, 5) == [5]
+
+
+def test_exact_distances_match_networkx(tmp_path):
+    rng = np.random.default_rng(0)
+    for i in range(20):
+        G = nx.gnm_random_graph(40, int(rng.integers(30, 80)), seed=i)
+        G.remove_nodes_from(list(nx.isolates(G)))
+        oracle = _oracle(tmp_path, G, f"g{i}")
+        nodes = list(G)
+        us = [nodes[j] for j in rng.integers(0, len(nodes), 60)] + nodes
+        vs = [nodes[j] for j in rng.integers(0, len(nodes), 60)] + nodes
+        expected = [nx.shortest_path_length(G, u, v) if nx.has_path(G, u, v) else -1 for u, v in zip(us, vs)]
+        assert oracle.distances(us, vs, exact=True).tolist() == expected
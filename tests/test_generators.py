@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+from Simulation.generators import sbm_opinion_blocks, watts_strogatz
+
+
+@pytest.mark.parametrize("n,k,p", [(7, 4, 0.9), (10, 6, 0.9), (12, 8, 0.95)])
+def test_watts_strogatz_dense_high_p_terminates(n, k, p):
+    # nodes joined to every other node have no free target and keep their edge
+    for seed in range(300):
+        A, opinion = watts_strogatz(n, k, p, rng=seed)
+        assert A.shape == (n, n) and opinion.shape == (n,)
+        assert A.diagonal().sum() == 0
+        assert (A != A.T).nnz == 0
+        assert A.nnz // 2 <= n * k // 2
+
+
+def test_sbm_edge_count_matches_expectation():
+    # 2 * C(20, 2) * 0.5 + 20 * 20 * 0.02 = 198 expected edges
+    counts = [sbm_opinion_blocks([20, 20], 0.5, 0.02, rng=seed)[0].nnz // 2 for seed in range(400)]
+    assert abs(np.mean(counts) - 198) < 2